@@ -48,6 +48,37 @@ def get_session_factory():
     return _SessionFactory
 
 
+def _add_delete_cascades(conn, table):
+    """Recreate a table whose foreign keys lack the model's ON DELETE CASCADE.
+
+    SQLite cannot alter constraints, so the table is renamed, created again from
+    the model (with its indexes) and the rows are copied over.
+    """
+    expected = {fk.parent.name for fk in table.foreign_keys if fk.ondelete == 'CASCADE'}
+    fk_rows = conn.execute(text(f"PRAGMA foreign_key_list({table.name})")).fetchall()
+    current = {row[3] for row in fk_rows if row[6] == 'CASCADE'}
+    if expected <= current:
+        return
+
+    existing_cols = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})")).fetchall()}
+    columns = ', '.join(col.name for col in table.columns if col.name in existing_cols)
+    old_name = f"{table.name}_old"
+
+    # Must be set outside a transaction; the copy would otherwise be checked row by row
+    conn.execute(text("PRAGMA foreign_keys=OFF"))
+    try:
+        conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {old_name}"))
+        for row in conn.execute(text(f"PRAGMA index_list({old_name})")).fetchall():
+            if row[3] == 'c':  # Explicitly created index (names would clash with the new table's)
+                conn.execute(text(f"DROP INDEX {row[1]}"))
+        table.create(conn)
+        conn.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}"))
+        conn.execute(text(f"DROP TABLE {old_name}"))
+        conn.commit()
+    finally:
+        conn.execute(text("PRAGMA foreign_keys=ON"))
+
+
 def upgrade_schema():
     """Upgrade database schema with new columns and migrations.
 
@@ -65,6 +96,7 @@ def upgrade_schema():
             ('surface_finish_estimated', 'BOOLEAN DEFAULT 0'),
             ('projected_area_source', "VARCHAR(20) DEFAULT 'data'"),
             ('wall_thickness_needs_improvement', 'BOOLEAN DEFAULT 0'),
+            ('image_thumbnail', 'BLOB'),
         ],
         'assembly_components': [
             ('component_type', "VARCHAR(20)"),
@@ -88,6 +120,7 @@ def upgrade_schema():
         ]
     }
 
+    added_columns = set()
     with engine.connect() as conn:
         # Check if column exists before adding
         for table_name, columns in schema_upgrades.items():
@@ -101,10 +134,28 @@ def upgrade_schema():
                         # Column doesn't exist, add it
                         conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}"))
                         conn.commit()
+                        added_columns.add((table_name, col_name))
                 except Exception as e:
                     # Column might already exist or other error - log and continue
                     print(f"Migration note for {table_name}.{col_name}: {str(e)}")
 
+        # Add ON DELETE CASCADE to child tables created before it was declared
+        for table_name in ('assembly_components', 'assembly_process_steps', 'tool_part_configurations'):
+            try:
+                _add_delete_cascades(conn, Base.metadata.tables[table_name])
+            except Exception as e:
+                conn.rollback()
+                print(f"Migration note for {table_name} delete cascades: {str(e)}")
+
+        # Create indexes that were added to models after their tables existed
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(conn, checkfirst=True)
+                    conn.commit()
+                except Exception as e:
+                    print(f"Migration note for index {index.name}: {str(e)}")
+
         # Migrate existing wall_thickness_source="given" to "data"
         try:
             conn.execute(text("UPDATE parts SET wall_thickness_source = 'data' WHERE wall_thickness_source = 'given'"))
@@ -119,6 +170,16 @@ def upgrade_schema():
         except Exception as e:
             print(f"Migration note for assembly to part_type migration: {str(e)}")
 
+    # Thumbnails for images stored before the column existed; later saves create their own
+    if ('parts', 'image_thumbnail') in added_columns:
+        try:
+            from ui.widgets.image_preview import backfill_part_thumbnails  # Qt-based, only needed here
+            thumbnails_added = backfill_part_thumbnails()
+            if thumbnails_added > 0:
+                print(f"Created {thumbnails_added} part image thumbnails")
+        except Exception as e:
+            print(f"Migration note for part image thumbnails: {str(e)}")
+
 
 def init_db():
     """Initialize the database, creating all tables."""
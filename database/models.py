@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Table, Enum
+    Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Table, Enum, Index
 )
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
 import enum
@@ -139,8 +139,8 @@ class ToolPartConfiguration(Base):
     __tablename__ = 'tool_part_configurations'
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    tool_id: Mapped[int] = mapped_column(ForeignKey('tools.id'), nullable=False)
-    part_id: Mapped[int] = mapped_column(ForeignKey('parts.id'), nullable=False)
+    tool_id: Mapped[int] = mapped_column(ForeignKey('tools.id', ondelete='CASCADE'), nullable=False)
+    part_id: Mapped[int] = mapped_column(ForeignKey('parts.id', ondelete='CASCADE'), nullable=False)
 
     # Cavities for THIS part within the tool
     cavities: Mapped[int] = mapped_column(Integer, default=1)
@@ -216,6 +216,9 @@ class AnnualDemand(Base):
 class Part(Base):
     """Part within an RFQ."""
     __tablename__ = 'parts'
+    __table_args__ = (
+        Index('ix_part_rfq_type', 'rfq_id', 'part_type'),  # Parts of an RFQ by type
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     rfq_id: Mapped[int] = mapped_column(ForeignKey('rfqs.id'), nullable=False)
@@ -223,7 +226,8 @@ class Part(Base):
     part_number: Mapped[Optional[str]] = mapped_column(String(100))
 
     # Image (binary data stored in DB)
-    image_binary: Mapped[Optional[bytes]] = mapped_column(None)  # Binary image data
+    image_binary: Mapped[Optional[bytes]] = mapped_column(None, deferred=True)  # Binary image data (loaded on access)
+    image_thumbnail: Mapped[Optional[bytes]] = mapped_column(None, deferred=True)  # Pre-scaled PNG for tree/list icons
     image_filename: Mapped[Optional[str]] = mapped_column(String(255))  # Original filename
     image_updated_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
@@ -280,15 +284,17 @@ class Part(Base):
     material: Mapped[Optional["Material"]] = relationship("Material")
     tools: Mapped[List["Tool"]] = relationship("Tool", secondary=tool_parts, back_populates="parts")
     tool_configurations: Mapped[List["ToolPartConfiguration"]] = relationship(
-        "ToolPartConfiguration", back_populates="part", cascade="all, delete-orphan"
+        "ToolPartConfiguration", back_populates="part", cascade="all, delete-orphan", passive_deletes=True
     )
     revisions: Mapped[List["PartRevision"]] = relationship("PartRevision", back_populates="part", cascade="all, delete-orphan")
     sub_boms: Mapped[List["SubBOM"]] = relationship("SubBOM", back_populates="part", cascade="all, delete-orphan")
     assembly_components: Mapped[List["AssemblyComponent"]] = relationship(
-        "AssemblyComponent", foreign_keys="AssemblyComponent.assembly_id", cascade="all, delete-orphan"
+        "AssemblyComponent", foreign_keys="AssemblyComponent.assembly_id", cascade="all, delete-orphan",
+        passive_deletes=True  # Deleted by ON DELETE CASCADE
     )
     process_steps: Mapped[List["AssemblyProcessStep"]] = relationship(
-        "AssemblyProcessStep", foreign_keys="AssemblyProcessStep.assembly_id", cascade="all, delete-orphan"
+        "AssemblyProcessStep", foreign_keys="AssemblyProcessStep.assembly_id", cascade="all, delete-orphan",
+        passive_deletes=True  # Deleted by ON DELETE CASCADE
     )
 
     def __repr__(self):
@@ -415,7 +421,7 @@ class Tool(Base):
     machine: Mapped[Optional["Machine"]] = relationship("Machine")
     parts: Mapped[List["Part"]] = relationship("Part", secondary=tool_parts, back_populates="tools")
     part_configurations: Mapped[List["ToolPartConfiguration"]] = relationship(
-        "ToolPartConfiguration", back_populates="tool", cascade="all, delete-orphan"
+        "ToolPartConfiguration", back_populates="tool", cascade="all, delete-orphan", passive_deletes=True
     )
 
     def __repr__(self):
@@ -609,9 +615,13 @@ class ExistingTool(Base):
 class AssemblyComponent(Base):
     """Component within an assembly."""
     __tablename__ = 'assembly_components'
+    __table_args__ = (
+        Index('ix_asmcomp_assembly_pos', 'assembly_id', 'position'),  # Ordering/max position per assembly
+        Index('ix_asmcomp_asm_type_pos', 'assembly_id', 'component_type', 'position'),  # Max position per type
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    assembly_id: Mapped[int] = mapped_column(ForeignKey('parts.id'))
+    assembly_id: Mapped[int] = mapped_column(ForeignKey('parts.id', ondelete='CASCADE'))
     component_type: Mapped[str] = mapped_column(String(20))  # injection_molded, purchased, takeover
     quantity: Mapped[int] = mapped_column(default=1)
     position: Mapped[Optional[float]] = mapped_column(Float)  # For ordering/hierarchy
@@ -638,9 +648,12 @@ class AssemblyComponent(Base):
 class AssemblyProcessStep(Base):
     """Manufacturing process step for assembly."""
     __tablename__ = 'assembly_process_steps'
+    __table_args__ = (
+        Index('ix_aps_assembly_step', 'assembly_id', 'step_number'),  # Ordered steps per assembly
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    assembly_id: Mapped[int] = mapped_column(ForeignKey('parts.id'))
+    assembly_id: Mapped[int] = mapped_column(ForeignKey('parts.id', ondelete='CASCADE'))
     step_number: Mapped[int] = mapped_column()
     description: Mapped[Optional[str]] = mapped_column(String(500))
     process_type: Mapped[str] = mapped_column(String(20))
@@ -657,9 +670,16 @@ class AssemblyProcessStep(Base):
             return {}
         try:
             return json.loads(self.components_json)
-        except:
+        except (TypeError, ValueError):
             return {}
 
+    def get_component_quantities(self) -> list:
+        """Return components as (component_id, quantity) pairs; empty if any ID is malformed."""
+        try:
+            return [(int(comp_id), qty) for comp_id, qty in self.get_components().items()]
+        except (TypeError, ValueError):
+            return []
+
     def set_components(self, components_dict: dict):
         """Store components dict as JSON."""
         import json
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Test the FileManager copy, lookup and delete paths."""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils import file_manager
+from utils.file_manager import FileManager, SMALL_COPY_SIZE
+
+
+def _write(path: Path, size: int) -> bytes:
+    """Write a file of the given size with non-repeating content."""
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return data
+
+
+def test_copy_small_and_large_files():
+    """Test that both copy paths keep the content and the modification time."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        for name, size in (("small.png", 1000), ("large.step", SMALL_COPY_SIZE * 3 + 17)):
+            source = tmp / name
+            data = _write(source, size)
+            os.utime(source, (1_600_000_000, 1_600_000_000))
+
+            relative_path = manager.copy_file_to_project(source, 1, 2, manager.get_file_type(source))
+
+            copied = manager.get_absolute_path(relative_path)
+            assert copied.read_bytes() == data
+            assert copied.stat().st_mtime == 1_600_000_000
+        assert relative_path.startswith(os.path.join("rfq_00001", "part_00002", "cad", ""))
+
+
+def test_copy_falls_back_when_kernel_copy_fails():
+    """Test that a failing copy_file_range falls back to shutil.copy2."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "large.step"
+        data = _write(source, SMALL_COPY_SIZE * 2)
+
+        with mock.patch.object(file_manager, "fcntl", None), \
+                mock.patch.object(os, "copy_file_range", side_effect=OSError, create=True):
+            relative_path = manager.copy_file_to_project(source, 1, 1, 'cad')
+
+        assert manager.get_absolute_path(relative_path).read_bytes() == data
+
+
+def test_copy_missing_source():
+    """Test that copying a missing file reports failure."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = FileManager(Path(tmp) / "projects")
+        assert manager.copy_file_to_project(Path(tmp) / "missing.png", 1, 1) is None
+
+
+def test_copy_recreates_removed_folder():
+    """Test that a copy recreates a cached folder that was removed behind the manager's back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "drawing.png"
+        data = _write(source, 100)
+        manager.copy_file_to_project(source, 1, 1)
+        shutil.rmtree(manager.get_rfq_folder(1))
+
+        relative_path = manager.copy_file_to_project(source, 1, 1)
+
+        assert manager.get_absolute_path(relative_path).read_bytes() == data
+        shutil.rmtree(manager.get_rfq_folder(1))
+        assert manager.copy_file_to_project(tmp / "missing.png", 1, 1) is None
+
+
+def test_copy_with_relative_base_path():
+    """Test that relative paths are right for a relative, non-normalized base path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / "drawing.png"
+        data = _write(source, 100)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for base_path in (Path("."), Path("projects/../projects/.")):
+                manager = FileManager(base_path)
+                relative_path = manager.copy_file_to_project(source, 1, 1)
+
+                assert relative_path.startswith(os.path.join("rfq_00001", "part_00001", "images", ""))
+                assert manager.get_absolute_path(relative_path).read_bytes() == data
+        finally:
+            os.chdir(cwd)
+
+
+def test_copy_names_do_not_collide():
+    """Test that copies of one file within the same second get distinct names."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "drawing.png"
+        _write(source, 100)
+
+        with mock.patch.object(file_manager.time, "strftime", return_value="20240101_120000"):
+            copies = [manager._prepare_copy(source, 1, 1, 'image') for _ in range(3)]
+
+        destinations = [dest for _, dest in copies]
+        assert len(set(destinations)) == 3
+        assert all(dest.name.endswith("_drawing.png") for dest in destinations)
+        assert all(dest.parent.is_dir() for dest in destinations)
+
+
+def test_copy_files_to_project():
+    """Test that a batch copy returns paths in order, with None for failures."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        sources = [tmp / f"file_{index}.png" for index in range(5)]
+        contents = [_write(source, 500 * (index + 1)) for index, source in enumerate(sources)]
+        items = [(source, 1, index, 'image') for index, source in enumerate(sources)]
+        items.insert(2, (tmp / "missing.png", 1, 9, 'image'))
+
+        results = manager.copy_files_to_project(items)
+
+        assert results[2] is None
+        del results[2]
+        for relative_path, data in zip(results, contents):
+            assert manager.get_absolute_path(relative_path).read_bytes() == data
+
+
+def test_submit_copy_to_project():
+    """Test that a background copy resolves to the copied file's path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "part.stp"
+        data = _write(source, SMALL_COPY_SIZE + 1)
+
+        relative_path = manager.submit_copy_to_project(source, 3, 4, 'cad').result(timeout=10)
+
+        assert manager.get_absolute_path(relative_path).read_bytes() == data
+        assert manager.submit_copy_to_project(tmp / "missing.stp", 3, 4, 'cad').result(timeout=10) is None
+
+
+def test_file_exists_cache_invalidation():
+    """Test that a cached miss is dropped once the file is copied, and set again on delete."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "photo.jpg"
+        _write(source, 100)
+
+        copy = manager._prepare_copy(source, 1, 1, 'image')
+        relative_path = str(copy[1].relative_to(manager.base_path))
+        assert not manager.file_exists(relative_path)  # Cached as missing
+
+        assert manager._copy_to(copy) == relative_path
+        assert manager.file_exists(relative_path)
+
+        assert manager.delete_file(relative_path)
+        assert not manager.file_exists(relative_path)
+        assert not manager.delete_file(relative_path)
+
+        # Deleting an RFQ folder forgets all cached misses
+        relative_path = manager.copy_file_to_project(source, 1, 1)
+        missing = os.path.join(os.path.dirname(relative_path), "later.jpg")
+        assert not manager.file_exists(missing)
+        assert manager.delete_rfq_folder(1)
+        manager.get_absolute_path(missing).parent.mkdir(parents=True)
+        manager.get_absolute_path(missing).write_bytes(b"x")
+        assert manager.file_exists(missing)
+
+
+def test_existing_files():
+    """Test the folder-listing existence check."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        manager = FileManager(tmp / "projects")
+        source = tmp / "photo.jpg"
+        _write(source, 100)
+        first = manager.copy_file_to_project(source, 1, 1)
+        second = manager.copy_file_to_project(source, 1, 2, 'cad')
+        folder = os.path.join("rfq_00001", "part_00001", "images")
+
+        # A missing file, a missing folder and a folder instead of a file
+        paths = [first, second, os.path.join(folder, "gone.jpg"), os.path.join("rfq_00099", "x.jpg"), folder]
+
+        assert manager.existing_files(paths) == {first, second}
+
+
+def test_delete_rfq_folder():
+    """Test deleting an RFQ folder, through both tree removal paths."""
+    for platform in ("linux", "win32"):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            manager = FileManager(tmp / "projects")
+            manager.PARALLEL_DELETE_MIN_FILES = 10
+            for part_id in range(4):
+                for file_type in ('image', 'cad'):
+                    folder = manager._subfolder(manager.get_part_folder(7, part_id), file_type)
+                    for index in range(5):
+                        (folder / f"file_{index}.bin").write_bytes(b"data")
+            rfq_folder = manager.get_rfq_folder(7)
+
+            with mock.patch.object(file_manager.sys, "platform", platform), \
+                    mock.patch.object(file_manager.shutil, "rmtree", wraps=file_manager.shutil.rmtree) as rmtree:
+                assert manager.delete_rfq_folder(7)
+
+            assert not rfq_folder.exists()
+            assert rmtree.called == (platform != "win32")
+            assert not manager.delete_rfq_folder(7)
+
+            # Folders are created again after the delete
+            source = tmp / "again.png"
+            _write(source, 10)
+            assert manager.file_exists(manager.copy_file_to_project(source, 7, 0))
+
+
+if __name__ == "__main__":
+    test_copy_small_and_large_files()
+    test_copy_falls_back_when_kernel_copy_fails()
+    test_copy_missing_source()
+    test_copy_recreates_removed_folder()
+    test_copy_with_relative_base_path()
+    test_copy_names_do_not_collide()
+    test_copy_files_to_project()
+    test_submit_copy_to_project()
+    test_file_exists_cache_invalidation()
+    test_existing_files()
+    test_delete_rfq_folder()
+    print("✓ File manager tests passed")
@@ -162,7 +162,7 @@ def test_part_update_creates_update_revision():
 
         # Now update the part (simulate edit)
         with session_scope() as session:
-            part = session.query(Part).get(part_id)
+            part = session.get(Part, part_id)
             old_name = part.name
             old_volume = part.volume_cm3
 
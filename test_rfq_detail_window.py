@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Test the RFQ detail window builds its views from the database."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PyQt6.QtWidgets import QApplication, QLabel, QMessageBox, QWidget
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice, QThreadPool
+from PyQt6.QtGui import QImage, QColor, QPixmapCache, QGuiApplication
+from PyQt6.QtTest import QTest
+
+from database import init_db, seed_database
+from database.connection import session_scope, get_engine
+from database.models import (
+    RFQ, RFQStatus, Part, Tool, ToolPartConfiguration, AssemblyComponent, AssemblyProcessStep
+)
+from ui import rfq_detail_window
+from ui.rfq_detail_window import RFQDetailWindow, next_sub_position
+from ui.widgets.image_preview import (
+    get_thumbnail_decoder, is_part_thumbnail_cached, backfill_part_thumbnails, show_image_preview,
+    THUMBNAIL_HEIGHT
+)
+
+
+def _png_bytes(width: int = 64, height: int = 64) -> bytes:
+    """Create a PNG image in memory."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor("#4472C4"))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def _create_rfq_with_assembly() -> int:
+    """Create an RFQ with one assembly, two IM parts, a purchased part, steps and a tool."""
+    image = _png_bytes()
+    with session_scope() as session:
+        rfq = RFQ(name="Window Test", customer="Test Co", status=RFQStatus.DRAFT.value)
+        session.add(rfq)
+        session.flush()
+
+        assembly = Part(rfq_id=rfq.id, name="Housing Assy", part_type="assembly",
+                        demand_peak=100, image_binary=image)
+        im_a = Part(rfq_id=rfq.id, name="Upper Shell", part_type="injection_molded",
+                    demand_peak=100, parts_over_runtime=1000, image_binary=image)
+        im_b = Part(rfq_id=rfq.id, name="Lower Shell", part_type="injection_molded",
+                    demand_peak=100, parts_over_runtime=2000)
+        standalone = Part(rfq_id=rfq.id, name="Knob", part_type="injection_molded",
+                          demand_peak=50, image_binary=image)
+        session.add_all([assembly, im_a, im_b, standalone])
+        session.flush()
+
+        comp_a = AssemblyComponent(assembly_id=assembly.id, component_type="injection_molded",
+                                   component_part_id=im_a.id, quantity=1, position=1.0)
+        comp_b = AssemblyComponent(assembly_id=assembly.id, component_type="injection_molded",
+                                   component_part_id=im_b.id, quantity=2, position=2.0)
+        screw = AssemblyComponent(assembly_id=assembly.id, component_type="purchased",
+                                  component_name="Screw M3", quantity=4, position=2.1)
+        session.add_all([comp_a, comp_b, screw])
+        session.flush()
+
+        step = AssemblyProcessStep(assembly_id=assembly.id, step_number=1, process_type="screw")
+        step.set_components({str(screw.id): 4, str(comp_b.id): 2})
+        session.add(step)
+
+        tool = Tool(name="Family Tool")
+        session.add(tool)
+        session.flush()
+        session.add_all([
+            ToolPartConfiguration(tool_id=tool.id, part_id=im_a.id, cavities=2),
+            ToolPartConfiguration(tool_id=tool.id, part_id=im_b.id, cavities=2),
+        ])
+        return rfq.id
+
+
+def _find_top_level(tree, item_type: str, text: str):
+    """Find a top-level tree item by type and display text."""
+    for i in range(tree.topLevelItemCount()):
+        item = tree.topLevelItem(i)
+        if item.data(0, Qt.ItemDataRole.UserRole + 1) == item_type and text in item.text(0):
+            return item
+    return None
+
+
+def test_rfq_detail_window_views():
+    """Test that the BOM, assembly, summary and tools views are populated."""
+    app = QApplication.instance() or QApplication([])
+    init_db()
+    seed_database()
+
+    rfq_id = _create_rfq_with_assembly()
+    window = RFQDetailWindow(rfq_id)
+
+    # Master BOM: assembly with IM children, purchased part grouped under second IM part
+    asm_item = _find_top_level(window.parts_tree, "assembly", "Housing Assy")
+    assert asm_item is not None
+    assert asm_item.isExpanded()  # Auto-expand mode is on by default
+    assert not asm_item.icon(1).isNull()
+    child_types = [asm_item.child(i).data(0, Qt.ItemDataRole.UserRole + 1) for i in range(asm_item.childCount())]
+    assert child_types.count("component_im") == 2
+    assert child_types.count("process_step") == 1
+    lower = [asm_item.child(i) for i in range(asm_item.childCount()) if "Lower Shell" in asm_item.child(i).text(0)][0]
+    assert lower.childCount() == 1
+    assert lower.data(0, Qt.ItemDataRole.UserRole + 2) is not None  # Component's part id
+    assert "Screw M3" in lower.child(0).text(0)
+    step_item = [asm_item.child(i) for i in range(asm_item.childCount())
+                 if asm_item.child(i).data(0, Qt.ItemDataRole.UserRole + 1) == "process_step"][0]
+    assert "Screw M3 x4" in step_item.text(0)
+    assert "Lower Shell x2" in step_item.text(0)
+
+    # Context menus by item type; the process step menu is built once and reused
+    menu, handlers = window._parts_menu_builders["component_im"](lower)
+    assert [action.text() for action in handlers] == ["Edit Component Details", "Edit Part", "Cut", "Copy", "Delete"]
+    assert window._parts_menu_builders["process_step"](step_item) is window._parts_menu_builders["process_step"](step_item)
+
+    # Highlighting a part selects its item in the Master BOM
+    window._switch_to_master_bom_and_highlight(lower.data(0, Qt.ItemDataRole.UserRole + 2))
+    assert window.parts_tree.currentItem() is lower
+
+    # Only parts not used in an assembly appear as standalone
+    assert _find_top_level(window.parts_tree, "im_part", "Knob") is not None
+    assert _find_top_level(window.parts_tree, "im_part", "Upper Shell") is None
+
+    # Assembly Lines tree mirrors the assembly
+    line_item = _find_top_level(window.assembly_tree, "assembly", "Housing Assy")
+    assert line_item is not None
+    window._on_assembly_tree_clicked(window.assembly_tree.indexFromItem(line_item, 0))
+    line_lower = [line_item.child(i) for i in range(line_item.childCount())
+                  if "Lower Shell" in line_item.child(i).text(0)][0]
+    menu, handlers = window._assembly_menu_builders["component_im"](line_lower)
+    assert [action.text() for action in handlers] == [
+        "Edit Component Details", "Edit Part", "Copy Component", "Remove from Assembly"
+    ]
+
+    # IM parts table: usage = assembly demand x component quantity
+    usage = {}
+    for row in range(window.im_parts_table.rowCount()):
+        usage[window.im_parts_table.item(row, 0).text()] = window.im_parts_table.item(row, 8).text()
+    assert usage == {"Upper Shell": "100", "Lower Shell": "200", "Knob": "50"}
+
+    # Parts summary includes purchased parts
+    summary = {}
+    for row in range(window.parts_summary_table.rowCount()):
+        summary[window.parts_summary_table.item(row, 0).text()] = window.parts_summary_table.item(row, 3).text()
+    assert summary["Lower Shell"] == "200"
+    assert "Screw M3" in summary
+
+    # Tools tree: tool with two part children, imbalance flagged
+    model = window.tools_model
+    tool_rows = [model.index(row, 0) for row in range(model.rowCount())]
+    tool_index = [index for index in tool_rows if "Family Tool" in model.data(index)][0]
+    assert model.rowCount(tool_index) == 2
+    assert model.data(model.index(tool_index.row(), 1)).startswith("2/2")
+    assert "IMBALANCE" in model.data(tool_index, Qt.ItemDataRole.ToolTipRole)
+    part_index = model.index(0, 0, tool_index)
+    assert model.data(part_index, Qt.ItemDataRole.UserRole + 1) == "part_config"
+    assert model.parent(part_index) == tool_index
+    QThreadPool.globalInstance().waitForDone()  # Icons of uncached images are decoded in the background
+    app.processEvents()
+    part_icons = {model.data(model.index(row, 0, tool_index)): model.data(model.index(row, 0, tool_index),
+                                                                          Qt.ItemDataRole.DecorationRole)
+                  for row in range(model.rowCount(tool_index))}
+    assert part_icons["├─ Upper Shell"] is not None
+    assert part_icons["├─ Lower Shell"] is None  # No image
+
+    # Refreshing updates the tools tree in place, keeping expanded rows
+    tool_node = model.node(tool_index)
+    window.tools_tree.expand(tool_index)
+    window._refresh_data_now()
+    tool_index = model.index(tool_node.row, 0)
+    assert model.node(tool_index) is tool_node
+    assert window.tools_tree.isExpanded(tool_index)
+    assert model.rowCount(tool_index) == 2
+
+    # Pasting a cut component rebuilds only its assembly's rows
+    asm_item = _find_top_level(window.parts_tree, "assembly", "Housing Assy")
+    children = {asm_item.child(i).text(0).strip(): asm_item.child(i) for i in range(asm_item.childCount())}
+    upper, lower = children["└─ Upper Shell"], children["└─ Lower Shell"]
+    window._on_cut_component(lower.child(0).data(0, Qt.ItemDataRole.UserRole))
+    window._on_paste_component_in_assembly(upper.data(0, Qt.ItemDataRole.UserRole))
+    assert not window._refresh_timer.isActive()
+    assert _find_top_level(window.parts_tree, "assembly", "Housing Assy") is asm_item
+    upper = [asm_item.child(i) for i in range(asm_item.childCount()) if "Upper Shell" in asm_item.child(i).text(0)][0]
+    assert [upper.child(i).text(0).strip() for i in range(upper.childCount())] == ["└─ Screw M3"]
+    line_item = _find_top_level(window.assembly_tree, "assembly", "Housing Assy")
+    assert any("Screw M3" in line_item.child(i).child(j).text(0)
+               for i in range(line_item.childCount()) for j in range(line_item.child(i).childCount()))
+
+    # Ctrl+C on the Master BOM copies the selected component
+    window.parts_tree.setCurrentItem(upper.child(0))
+    QTest.keyClick(window.parts_tree, Qt.Key.Key_C, Qt.KeyboardModifier.ControlModifier)
+    assert window.copied_component["component_name"] == "Screw M3"
+
+    # Refresh requests are coalesced into one rebuild
+    refreshes = []
+    window._refresh_timer.timeout.connect(lambda: refreshes.append(True))
+    window._refresh_data()
+    window._refresh_data()
+    assert window._refresh_timer.isActive()
+    QTest.qWait(100)
+    assert refreshes == [True]
+
+    window.close()
+
+
+def test_delete_process_step_renumbers_after_move():
+    """Test that deleting a step renumbers 1..N even when step order differs from ID order."""
+    app = QApplication.instance() or QApplication([])
+    init_db()
+    rfq_id = _create_rfq_with_assembly()
+    with session_scope() as session:
+        assembly_id = session.query(Part.id).filter(Part.rfq_id == rfq_id, Part.part_type == "assembly").scalar()
+        for number in (2, 3, 4):
+            session.add(AssemblyProcessStep(assembly_id=assembly_id, step_number=number,
+                                            process_type="screw", description=f"Step {number}"))
+    with session_scope() as session:
+        step_ids = [step_id for (step_id,) in session.query(AssemblyProcessStep.id).filter(
+            AssemblyProcessStep.assembly_id == assembly_id).order_by(AssemblyProcessStep.step_number)]
+
+    window = RFQDetailWindow(rfq_id)
+    for _ in range(3):
+        window._on_move_process_step(step_ids[0], "down")  # First step to the end: 4, 1, 2, 3
+
+    question = rfq_detail_window.QMessageBox.question
+    rfq_detail_window.QMessageBox.question = staticmethod(lambda *args: QMessageBox.StandardButton.Yes)
+    try:
+        window._on_delete_process_step(step_ids[2])
+    finally:
+        rfq_detail_window.QMessageBox.question = question
+
+    with session_scope() as session:
+        numbers = dict(session.query(AssemblyProcessStep.id, AssemblyProcessStep.step_number).filter(
+            AssemblyProcessStep.assembly_id == assembly_id))
+    assert numbers == {step_ids[0]: 3, step_ids[1]: 1, step_ids[3]: 2}
+    window.close()
+
+
+def test_confirmations_hold_no_connection():
+    """Test that moves and deletes ask before opening their write session."""
+    app = QApplication.instance() or QApplication([])
+    init_db()
+    rfq_id = _create_rfq_with_assembly()
+    with session_scope() as session:
+        session.add(Part(rfq_id=rfq_id, name="Frame Assy", part_type="assembly", demand_peak=10))
+    with session_scope() as session:
+        part_ids = dict(session.query(Part.name, Part.id).filter(Part.rfq_id == rfq_id))
+        screw_id = session.query(AssemblyComponent.id).filter(
+            AssemblyComponent.assembly_id == part_ids["Housing Assy"],
+            AssemblyComponent.component_name == "Screw M3").scalar()
+        tool_id = session.query(ToolPartConfiguration.tool_id).filter(
+            ToolPartConfiguration.part_id == part_ids["Upper Shell"]).scalar()
+
+    window = RFQDetailWindow(rfq_id)
+    model = window.tools_model
+    tool_index = [model.index(row, 0) for row in range(model.rowCount())
+                  if model.node(model.index(row, 0)).item_id == tool_id][0]
+    window.tools_tree.setCurrentIndex(tool_index)
+    prompts = []
+
+    def confirm(parent, title, text, buttons):
+        prompts.append((text, get_engine().pool.checkedout()))
+        return QMessageBox.StandardButton.Yes
+
+    question = rfq_detail_window.QMessageBox.question
+    rfq_detail_window.QMessageBox.question = staticmethod(confirm)
+    try:
+        window._on_delete_tool()
+        window._on_move_component_to_assembly(screw_id, part_ids["Frame Assy"])
+        with session_scope() as session:
+            assert session.get(AssemblyComponent, screw_id).assembly_id == part_ids["Frame Assy"]
+        window._on_remove_component(screw_id)
+        window._on_delete_part(part_ids["Knob"])
+        window._on_delete_assembly(part_ids["Housing Assy"])
+    finally:
+        rfq_detail_window.QMessageBox.question = question
+
+    assert [text for text, _ in prompts] == [
+        "Delete tool 'Family Tool'? This will also delete all part configurations.",
+        "Move 'Screw M3' from 'Housing Assy' to 'Frame Assy'?",
+        "Remove 'Screw M3' from assembly?",
+        "Delete part 'Knob'?",
+        "Delete assembly 'Housing Assy' and all its components?",
+    ]
+    assert all(checked_out == 0 for _, checked_out in prompts)
+    with session_scope() as session:
+        names = {name for (name,) in session.query(Part.name).filter(Part.rfq_id == rfq_id)}
+        assert session.get(AssemblyComponent, screw_id) is None
+        assert session.get(Tool, tool_id) is None
+    assert names == {"Upper Shell", "Lower Shell", "Frame Assy"}
+    QTest.qWait(100)  # Let the deferred refresh and its thumbnail decodes finish
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    window.close()
+
+
+def test_next_sub_position():
+    """Test that positions under an IM part step in exact hundredths and stay below the next IM part."""
+    assert next_sub_position(2) == 2.1
+    assert next_sub_position(2, 2.0) == 2.1
+    position = None
+    for _ in range(30):
+        position = next_sub_position(3, position)
+    assert position == 3.39
+    assert 3.99 < next_sub_position(3, 3.99) < 4
+
+
+def test_thumbnail_decoder():
+    """Test that thumbnails decoded in the background end up in the pixmap cache."""
+    app = QApplication.instance() or QApplication([])
+    QPixmapCache.clear()
+    part = Part(id=424242, name="Decoded", image_binary=_png_bytes())
+
+    ready = []
+    decoder = get_thumbnail_decoder()
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()  # Deliver decodes queued by earlier tests
+    on_ready = lambda part_id, height, pixmap: ready.append((part_id, height, pixmap))
+    decoder.thumbnail_ready.connect(on_ready)
+    decoder.request(part, 30)
+    decoder.request(part, 30)  # Already queued: not decoded twice
+
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+    assert len(ready) == 1
+    part_id, height, pixmap = ready[0]
+    assert (part_id, height, pixmap.height()) == (424242, 30, 30)
+    assert is_part_thumbnail_cached(424242, None, 30)
+    decoder.thumbnail_ready.disconnect(on_ready)
+
+
+def test_image_preview_loads_in_background():
+    """Test that the preview window shows the image once it is decoded."""
+    app = QApplication.instance() or QApplication([])
+    parent = QWidget()
+    show_image_preview(parent, "Preview", _png_bytes())
+    label = [label for label in parent.findChildren(QLabel) if label.text() == "Loading…"][0]
+
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert label.pixmap().width() == 64
+
+    # Images far larger than the screen are decoded bounded to twice its size
+    bound = QGuiApplication.primaryScreen().size().width() * 2
+    show_image_preview(parent, "Preview", _png_bytes(bound * 3, 16))
+    label = [label for label in parent.findChildren(QLabel) if label.text() == "Loading…"][0]
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert label.pixmap().width() == bound
+
+
+def test_backfill_part_thumbnails():
+    """Test that parts with an image get a stored thumbnail."""
+    app = QApplication.instance() or QApplication([])
+    init_db()
+    rfq_id = _create_rfq_with_assembly()
+
+    backfill_part_thumbnails()
+
+    with session_scope() as session:
+        parts = session.query(Part).filter(Part.rfq_id == rfq_id).all()
+        thumbnails = {part.name: part.image_thumbnail for part in parts}
+    assert thumbnails["Lower Shell"] is None  # No image
+    thumbnail = QImage.fromData(thumbnails["Upper Shell"])
+    assert thumbnail.height() == THUMBNAIL_HEIGHT
+    assert backfill_part_thumbnails() == 0  # Nothing left to do
+
+
+if __name__ == "__main__":
+    test_rfq_detail_window_views()
+    test_delete_process_step_renumbers_after_move()
+    test_confirmations_hold_no_connection()
+    test_next_sub_position()
+    test_thumbnail_decoder()
+    test_image_preview_loads_in_background()
+    test_backfill_part_thumbnails()
+    print("✓ RFQ detail window test passed")
@@ -19,7 +19,7 @@ from calculations import (
     GeometryFactory, BoxEstimateMode,
     WeightVolumeHelper, auto_calculate_volume, auto_calculate_weight
 )
-from ui.widgets.image_preview import show_image_preview
+from ui.widgets.image_preview import show_image_preview, make_thumbnail
 from ui.color_coding import get_missing_fields, is_part_complete
 
 
@@ -106,6 +106,7 @@ class PartDialog(QDialog):
         self.image_data = None  # Store binary image data
         self.image_filename = None
         self._saved_part_id = None  # Track saved part ID to avoid detached object access
+        self.created_part_id = None  # ID of the part created by this dialog (None when editing)
         self._wall_thickness_source = "data"  # Track if wall thickness was "data", "bom", or "estimated"
         self._projected_area_source = "data"  # Track if projected area was "data", "bom", or "estimated"
         # Track HOW values were created: "manual" | "from_weight" | "from_volume" | "from_box"
@@ -126,7 +127,7 @@ class PartDialog(QDialog):
         """Load existing part if editing."""
         if self.part_id:
             with session_scope() as session:
-                self.part = session.query(Part).get(self.part_id)
+                self.part = session.get(Part, self.part_id)
                 if self.part:
                     if self.part.image_binary:
                         self.image_data = self.part.image_binary
@@ -1509,7 +1510,7 @@ class PartDialog(QDialog):
             return None
 
         with session_scope() as session:
-            material = session.query(Material).get(material_id)
+            material = session.get(Material, material_id)
             if not material or not material.density_g_cm3:
                 QMessageBox.warning(self, "No Density", "Material has no density data")
                 return None
@@ -1618,7 +1619,7 @@ class PartDialog(QDialog):
         """Load existing sub-BOM items from part."""
         if self.part:
             with session_scope() as session:
-                part = session.query(Part).get(self.part.id)
+                part = session.get(Part, self.part.id)
                 if part and part.sub_boms:
                     for sub_bom in part.sub_boms:
                         if sub_bom.item_type == "assembly":
@@ -1701,7 +1702,7 @@ class PartDialog(QDialog):
             with session_scope() as session:
                 if self.part:
                     # Update existing - get fresh instance from DB
-                    part = session.query(Part).get(self.part.id)
+                    part = session.get(Part, self.part.id)
 
                     # Track changes for audit log
                     changes = []
@@ -1762,6 +1763,7 @@ class PartDialog(QDialog):
                     # Update image if new one uploaded
                     if self.image_data:
                         part.image_binary = self.image_data
+                        part.image_thumbnail = make_thumbnail(self.image_data)
                         part.image_filename = self.image_filename
                         part.image_updated_date = datetime.now()
 
@@ -1812,12 +1814,14 @@ class PartDialog(QDialog):
                         box_width_mm=(float(self.box_width_input.text().strip()) if self.box_width_input.text().strip() else None) if geometry_mode == "box" else None,
                         box_effective_percent=(float(self.box_effective_input.text().strip()) if self.box_effective_input.text().strip() else 100.0) if geometry_mode == "box" else 100.0,
                         image_binary=self.image_data,
+                        image_thumbnail=make_thumbnail(self.image_data) if self.image_data else None,
                         image_filename=self.image_filename,
                         image_updated_date=datetime.now() if self.image_data else None,
                     )
                     session.add(part)
                     session.flush()
                     self._saved_part_id = part.id
+                    self.created_part_id = part.id
 
                     # Log initial creation as revision
                     fields_created = []
@@ -1869,7 +1873,7 @@ class PartDialog(QDialog):
         if self._saved_part_id:
             # Refetch from DB since the object became detached after save
             with session_scope() as session:
-                part = session.query(Part).get(self._saved_part_id)
+                part = session.get(Part, self._saved_part_id)
                 session.expunge(part)
                 return part
         return self.part
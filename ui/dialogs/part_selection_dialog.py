@@ -1,6 +1,6 @@
 """Part Selection Dialog for visual part selection from RFQ BOM."""
 
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
     QTableWidgetItem, QLabel, QHeaderView, QAbstractItemView
@@ -8,6 +8,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QColor
 
+from sqlalchemy.orm import load_only, undefer
+
 from database.connection import session_scope
 from database.models import Part
 
@@ -25,15 +27,17 @@ class PartSelectionDialog(QDialog):
     def __init__(
         self,
         rfq_id: int,
-        already_assigned_part_ids: List[int],
-        parent=None
+        already_assigned_part_ids: Iterable[int],
+        parent=None,
+        parts: Optional[List[dict]] = None
     ):
         """Initialize Part Selection Dialog.
 
         Args:
             rfq_id: RFQ ID to load parts from
-            already_assigned_part_ids: List of part IDs that are already assigned (shown greyed)
+            already_assigned_part_ids: Part IDs that are already assigned (shown greyed)
             parent: Parent widget
+            parts: Part rows from load_parts(); loaded from the database if omitted
         """
         super().__init__(parent)
         self.setWindowTitle("Select Part from BOM")
@@ -44,39 +48,52 @@ class PartSelectionDialog(QDialog):
         self.rfq_id = rfq_id
         self.already_assigned_part_ids = set(already_assigned_part_ids)
         self.selected_part_id: Optional[int] = None
+        self.selected_part_name: Optional[str] = None
 
-        # Load parts data
+        # Split parts into available and assigned
+        if parts is None:
+            parts = self.load_parts(rfq_id)
         self.available_parts: List[dict] = []
         self.assigned_parts: List[dict] = []
-        self._load_parts()
+        for part in parts:
+            if part['id'] in self.already_assigned_part_ids:
+                self.assigned_parts.append(part)
+            else:
+                self.available_parts.append(part)
 
         # Build UI
         self._setup_ui()
 
-    def _load_parts(self) -> None:
-        """Load parts from database, separated into available and assigned."""
+    @staticmethod
+    def load_parts(rfq_id: int) -> List[dict]:
+        """Load the RFQ's parts as row dicts ordered by name.
+
+        Callers that open the dialog repeatedly can keep the result and pass it back in.
+        """
         with session_scope() as session:
             all_parts = (
                 session.query(Part)
-                .filter(Part.rfq_id == self.rfq_id)
+                .options(
+                    load_only(Part.id, Part.name, Part.part_number, Part.volume_cm3, Part.weight_g),
+                    undefer(Part.image_thumbnail),  # Every row shows its image
+                )
+                .filter(Part.rfq_id == rfq_id)
                 .order_by(Part.name)
                 .all()
             )
 
-            for part in all_parts:
-                part_dict = {
+            return [
+                {
                     'id': part.id,
                     'name': part.name,
                     'part_number': part.part_number or '',
                     'volume_cm3': part.volume_cm3 or 0.0,
                     'weight_g': part.weight_g or 0.0,
-                    'image_binary': part.image_binary,  # Binary data
+                    # 60px thumbnail; full image only for parts without a stored thumbnail
+                    'image_data': part.image_thumbnail or part.image_binary,
                 }
-
-                if part.id in self.already_assigned_part_ids:
-                    self.assigned_parts.append(part_dict)
-                else:
-                    self.available_parts.append(part_dict)
+                for part in all_parts
+            ]
 
     def _setup_ui(self) -> None:
         """Build the dialog UI."""
@@ -150,14 +167,14 @@ class PartSelectionDialog(QDialog):
 
         Args:
             row: Row index
-            part: Part dictionary with id, name, part_number, volume_cm3, weight_g, image_binary
+            part: Part dictionary with id, name, part_number, volume_cm3, weight_g, image_data
             is_assigned: Whether part is already assigned (greyed out)
         """
         # Image column
         img_label = QLabel()
-        if part['image_binary']:
+        if part['image_data']:
             pixmap = QPixmap()
-            pixmap.loadFromData(part['image_binary'])
+            pixmap.loadFromData(part['image_data'])
             scaled = pixmap.scaledToHeight(60, Qt.TransformationMode.SmoothTransformation)
             img_label.setPixmap(scaled)
         img_label.setFixedHeight(60)
@@ -214,9 +231,16 @@ class PartSelectionDialog(QDialog):
         name_item = self.table.item(current_row, 1)
         if name_item:
             self.selected_part_id = name_item.data(Qt.ItemDataRole.UserRole)
+            self.selected_part_name = name_item.text()
             if self.selected_part_id is not None:
                 self.accept()
 
     def get_selected_part_id(self) -> Optional[int]:
         """Return the selected part ID or None if cancelled."""
         return self.selected_part_id
+
+    def get_selected_part(self) -> Optional[Tuple[int, str]]:
+        """Return (part_id, part_name) of the selected part or None if cancelled."""
+        if self.selected_part_id is None:
+            return None
+        return self.selected_part_id, self.selected_part_name
@@ -46,7 +46,7 @@ class RFQDialog(QDialog):
         """Load existing RFQ if editing."""
         if self.rfq_id:
             with session_scope() as session:
-                self.rfq = session.query(RFQ).get(self.rfq_id)
+                self.rfq = session.get(RFQ, self.rfq_id)
                 # Detach from session and load relationships
                 if self.rfq:
                     session.expunge(self.rfq)
@@ -217,7 +217,7 @@ class RFQDialog(QDialog):
             with session_scope() as session:
                 if self.rfq:
                     # Update existing - need to get fresh instance from DB
-                    rfq = session.query(RFQ).get(self.rfq.id)
+                    rfq = session.get(RFQ, self.rfq.id)
                     rfq.name = name
                     rfq.customer = customer
                     rfq.status = status
@@ -278,7 +278,7 @@ class RFQDialog(QDialog):
         load_rfq_id = self._saved_rfq_id or self.rfq_id
         if load_rfq_id:
             with session_scope() as session:
-                rfq = session.query(RFQ).get(load_rfq_id)
+                rfq = session.get(RFQ, load_rfq_id)
                 if rfq:
                     for ad in rfq.annual_demands:
                         existing_demands[ad.year] = ad.volume or 0
@@ -447,7 +447,7 @@ class ToolDialog(QDialog):
                 # Load part from DB
                 with session_scope() as session:
                     from database.models import Part
-                    part = session.query(Part).get(config_dict.get('part_id'))
+                    part = session.get(Part, config_dict.get('part_id'))
                     if part:
                         self.part = type('Part', (), {
                             'name': part.name,
@@ -465,7 +465,7 @@ class ToolDialog(QDialog):
         machine_id = self.machine_combo.currentData()
         if machine_id:
             with session_scope() as session:
-                machine = session.query(Machine).get(machine_id)
+                machine = session.get(Machine, machine_id)
                 if machine and machine.barrel_volume_cm3:
                     barrel_result = calculate_barrel_usage(
                         shot_result.total_cm3,
@@ -509,7 +509,7 @@ class ToolDialog(QDialog):
             with session_scope() as session:
                 if self.tool:
                     # Update existing
-                    tool = session.query(Tool).get(self.tool.id)
+                    tool = session.get(Tool, self.tool.id)
 
                     tool.name = name
                     tool.tool_type = tool_type
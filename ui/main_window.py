@@ -425,7 +425,7 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             with session_scope() as session:
-                rfq = session.query(RFQ).get(rfq_id)
+                rfq = session.get(RFQ, rfq_id)
                 if rfq:
                     session.delete(rfq)
             self._load_rfqs()
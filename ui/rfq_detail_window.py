@@ -1,20 +1,74 @@
 """Dedicated window for RFQ detail editing (parts, tools, calculations)."""
 
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QPushButton, QMessageBox, QLabel, QTableWidget, QTableWidgetItem,
     QHeaderView, QAbstractItemView, QScrollArea, QFrame, QSpinBox,
-    QTreeWidget, QTreeWidgetItem, QCheckBox, QPlainTextEdit
+    QTreeWidget, QTreeWidgetItem, QTreeView, QCheckBox, QPlainTextEdit, QMenu, QInputDialog
 )
-from PyQt6.QtCore import Qt, QMimeData, QByteArray, QPoint, QSize
-from PyQt6.QtGui import QPixmap, QIcon, QColor, QDrag
+from PyQt6.QtCore import Qt, QMimeData, QByteArray, QPoint, QSize, QAbstractItemModel, QModelIndex, QTimer
+from PyQt6.QtGui import QPixmap, QIcon, QColor, QBrush, QDrag, QFont
+from sqlalchemy import func, select, update, delete, bindparam
+from sqlalchemy.orm import selectinload, joinedload, undefer, load_only
 
 from database.connection import session_scope
 from database.models import RFQ, Part, Tool, Material, Machine, ToolPartConfiguration, AssemblyComponent, AssemblyProcessStep
 from database import JoinMethod, ProcessStepType
+from .color_coding import get_missing_fields, apply_source_color_to_table_item
 from .dialogs.part_dialog import PartDialog
 from .dialogs.tool_dialog import ToolDialog
-from .widgets.image_preview import show_image_preview
+from .widgets.image_preview import (
+    show_image_preview, get_part_thumbnail, is_part_thumbnail_cached, get_thumbnail_decoder
+)
+
+# Row prefixes and colors shared by every tree row (built once, not per row)
+TOOL_PART_PREFIX = "├─ "
+IM_COMPONENT_PREFIX = "    └─ "
+SUB_COMPONENT_PREFIX = "        └─ "
+COLOR_COMPLETE = QColor("#70AD47")
+COLOR_INCOMPLETE = QColor("#FF5050")
+COLOR_IM_COMPONENT = QColor("#F0B840")
+COLOR_PURCHASED_COMPONENT = QColor("#E04040")
+COLOR_TAKEOVER_COMPONENT = QColor("#B0B0B0")
+BRUSH_STEP_SEPARATOR_TEXT = QBrush(QColor("#808080"))
+BRUSH_STEP_SEPARATOR_BACKGROUND = QBrush(QColor("#4a4a4a"))
+BRUSH_STEP_TEXT = QBrush(QColor("#1a1a1a"))
+BRUSH_STEP_BACKGROUND = QBrush(QColor("#90C890"))
+
+
+def next_sub_position(parent: int, highest=None) -> float:
+    """Return the position after `highest` among the components grouped under IM position `parent`.
+
+    Sub-positions are counted in whole hundredths (parent.1, parent.11, ...),
+    so repeated steps never accumulate float drift.
+    """
+    if highest is None or highest <= parent:
+        slot = 10  # First component under the IM part: parent.1
+    else:
+        slot = round((highest - parent) * 100) + 1
+    if slot >= 100:
+        # Out of hundredths: halve the gap so it stays below the next IM part
+        return (highest + parent + 1) / 2
+    return round(parent + slot / 100, 2)
+
+
+@lru_cache(maxsize=None)
+def _process_step_dialog_class():
+    """Import ProcessStepDialog on first use and keep the class for later clicks."""
+    from ui.dialogs.process_step_dialog import ProcessStepDialog
+    return ProcessStepDialog
+
+
+# Ctrl+<key> clipboard shortcuts -> name of the tree method handling them
+CLIPBOARD_SHORTCUTS = {
+    Qt.Key.Key_C: "_handle_copy_shortcut",
+    Qt.Key.Key_X: "_handle_cut_shortcut",
+    Qt.Key.Key_V: "_handle_paste_shortcut",
+}
 
 
 class DraggableIMPartsTable(QTableWidget):
@@ -61,35 +115,18 @@ class DroppableAssemblyBOMTree(QTreeWidget):
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts: Ctrl+C (copy), Ctrl+X (cut), Ctrl+V (paste)."""
-        if not self.rfq_window:
+        # Plain keys (the common case) go straight to the default behavior
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier or not self.rfq_window:
             super().keyPressEvent(event)
             return
 
-        # Check if Ctrl is held (bitwise AND with ControlModifier flag)
-        ctrl_held = event.modifiers() & Qt.KeyboardModifier.ControlModifier
-
-        if not ctrl_held:
+        handler_name = CLIPBOARD_SHORTCUTS.get(event.key())
+        if handler_name is None:
             super().keyPressEvent(event)
             return
 
-        # Handle Ctrl+C (copy), Ctrl+X (cut), Ctrl+V (paste)
-        key = event.key()
-
-        if key == Qt.Key.Key_C:
-            self._handle_copy_shortcut()
-            event.accept()
-            return
-        elif key == Qt.Key.Key_X:
-            self._handle_cut_shortcut()
-            event.accept()
-            return
-        elif key == Qt.Key.Key_V:
-            self._handle_paste_shortcut()
-            event.accept()
-            return
-
-        # For any other key, use default behavior
-        super().keyPressEvent(event)
+        getattr(self, handler_name)()
+        event.accept()
 
     def _handle_copy_shortcut(self):
         """Handle Ctrl+C to copy component."""
@@ -163,35 +200,18 @@ class DroppableAssemblyLinesTree(QTreeWidget):
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts: Ctrl+C (copy), Ctrl+X (cut), Ctrl+V (paste)."""
-        if not self.rfq_window:
+        # Plain keys (the common case) go straight to the default behavior
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier or not self.rfq_window:
             super().keyPressEvent(event)
             return
 
-        # Check if Ctrl is held (bitwise AND with ControlModifier flag)
-        ctrl_held = event.modifiers() & Qt.KeyboardModifier.ControlModifier
-
-        if not ctrl_held:
+        handler_name = CLIPBOARD_SHORTCUTS.get(event.key())
+        if handler_name is None:
             super().keyPressEvent(event)
             return
 
-        # Handle Ctrl+C (copy), Ctrl+X (cut), Ctrl+V (paste)
-        key = event.key()
-
-        if key == Qt.Key.Key_C:
-            self._handle_copy_shortcut()
-            event.accept()
-            return
-        elif key == Qt.Key.Key_X:
-            self._handle_cut_shortcut()
-            event.accept()
-            return
-        elif key == Qt.Key.Key_V:
-            self._handle_paste_shortcut()
-            event.accept()
-            return
-
-        # For any other key, use default behavior
-        super().keyPressEvent(event)
+        getattr(self, handler_name)()
+        event.accept()
 
     def _handle_copy_shortcut(self):
         """Handle Ctrl+C to copy component."""
@@ -301,6 +321,161 @@ class DroppableAssemblyLinesTree(QTreeWidget):
             parent_window._on_drop_part_on_assembly(assembly_id, part_id)
 
 
+class ToolTreeNode:
+    """Row in the tools tree: a tool, or a part configuration under a tool."""
+
+    def __init__(self, item_id: int, item_type: str, texts: list, parent: "ToolTreeNode" = None):
+        self.item_id = item_id
+        self.item_type = item_type  # "tool" or "part_config"
+        self.texts = texts  # Display text per column
+        self.icon = None
+        self.tooltip = ""
+        self.bold = False
+        self.parent = parent
+        self.children = []
+        self.row = 0
+        if parent is not None:
+            self.row = len(parent.children)
+            parent.children.append(self)
+
+
+class ToolsTreeModel(QAbstractItemModel):
+    """Item model for the Tools tab, backed by a list of ToolTreeNode.
+
+    Nodes are built once per refresh and merged into the existing rows; the view
+    only asks for the cells it paints.
+    UserRole / UserRole + 1 on column 0 return the node ID and type, matching
+    the item data layout of the BOM trees.
+    """
+
+    def __init__(self, headers: list, parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._roots = []
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+    def update_tools(self, roots: list):
+        """Update the rows in place from freshly built top-level tool nodes.
+
+        Nodes are matched by ID: only removed rows are removed, only new rows are
+        inserted and matched rows get their values copied and a dataChanged. The
+        existing nodes (and so the view's expansion and selection) are kept.
+        """
+        self._sync_nodes(QModelIndex(), None, self._roots, roots)
+
+    def _sync_nodes(self, parent_index: QModelIndex, parent_node, nodes: list, new_nodes: list):
+        """Bring the sibling list `nodes` in line with `new_nodes`."""
+        new_ids = {node.item_id for node in new_nodes}
+        for row in reversed(range(len(nodes))):
+            if nodes[row].item_id not in new_ids:
+                self.beginRemoveRows(parent_index, row, row)
+                del nodes[row]
+                self._renumber(nodes)
+                self.endRemoveRows()
+
+        for row, new_node in enumerate(new_nodes):
+            if row < len(nodes) and nodes[row].item_id == new_node.item_id:
+                node = nodes[row]
+                node.texts = new_node.texts
+                node.icon = new_node.icon
+                node.tooltip = new_node.tooltip
+                node.bold = new_node.bold
+                self.dataChanged.emit(self.createIndex(row, 0, node),
+                                      self.createIndex(row, len(self._headers) - 1, node))
+                self._sync_nodes(self.createIndex(row, 0, node), node, node.children, new_node.children)
+                continue
+
+            # Moved rows are removed here and inserted again at their new position
+            for old_row in range(row, len(nodes)):
+                if nodes[old_row].item_id == new_node.item_id:
+                    self.beginRemoveRows(parent_index, old_row, old_row)
+                    del nodes[old_row]
+                    self._renumber(nodes)
+                    self.endRemoveRows()
+                    break
+
+            self.beginInsertRows(parent_index, row, row)
+            new_node.parent = parent_node
+            nodes.insert(row, new_node)
+            self._renumber(nodes)
+            self.endInsertRows()
+
+    @staticmethod
+    def _renumber(nodes: list):
+        """Update the cached row numbers of sibling nodes."""
+        for row, node in enumerate(nodes):
+            node.row = row
+
+    def find_node(self, item_type: str, item_id: int):
+        """Find a tool or part configuration node by type and ID."""
+        for tool_node in self._roots:
+            if item_type == "tool" and tool_node.item_id == item_id:
+                return tool_node
+            for child in tool_node.children:
+                if child.item_type == item_type and child.item_id == item_id:
+                    return child
+        return None
+
+    def set_node_icon(self, node: ToolTreeNode, icon: QIcon):
+        """Set the icon of a node and repaint its row."""
+        node.icon = icon
+        index = self.createIndex(node.row, 0, node)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def node(self, index: QModelIndex):
+        """Get the node for an index, or None for the invisible root."""
+        return index.internalPointer() if index.isValid() else None
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        siblings = parent.internalPointer().children if parent.isValid() else self._roots
+        return self.createIndex(row, column, siblings[row])
+
+    def parent(self, index):
+        node = self.node(index)
+        if node is None or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.node(parent)
+        return len(node.children) if node else len(self._roots)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        node = self.node(index)
+        if node is None:
+            return None
+
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.texts[column] if column < len(node.texts) else None
+        if column != 0:
+            return None
+        if role == Qt.ItemDataRole.DecorationRole:
+            return node.icon
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return node.tooltip or None
+        if role == Qt.ItemDataRole.FontRole:
+            return self._bold_font if node.bold else None
+        if role == Qt.ItemDataRole.UserRole:
+            return node.item_id
+        if role == Qt.ItemDataRole.UserRole + 1:
+            return node.item_type
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return None
+
+
 class RFQDetailWindow(QMainWindow):
     """Dedicated window for editing a single RFQ with parts and tools."""
 
@@ -310,16 +485,69 @@ class RFQDetailWindow(QMainWindow):
         self.rfq = None
         self.copied_component = None  # For copy/paste functionality
         self.cut_component = None  # For cut/paste functionality (components can be moved)
+        self._parts_with_images = set()  # IDs of RFQ parts that have an image (set on refresh)
+        self._steps_by_assembly = {}  # assembly_id -> process steps (set on refresh)
+        self._step_components = {}  # component_id -> AssemblyComponent of the RFQ (set on refresh)
+        self._im_part_index: dict[int, QTreeWidgetItem] = {}  # part_id -> its first Master BOM item (set on refresh)
+        self._pending_tool_icons = {}  # part_id -> tools tree part config IDs waiting for a decoded thumbnail
+        self._add_part_msg = None  # "Add to BOM" choice dialog, built on first use
+        self._process_step_menu = None  # Static BOM tree context menus, built on first use
+        self._im_part_menu = None
+
+        # BOM tree dispatch by item type: context menu builders and double-click handlers
+        self._parts_menu_builders = {
+            "assembly": self._build_assembly_menu,
+            "process_step": self._build_process_step_menu,
+            "im_part": self._build_im_part_menu,
+            "component_im": self._build_component_menu,
+            "component_purchased": self._build_component_menu,
+            "component_takeover": self._build_component_menu,
+        }
+        self._parts_double_click_handlers = {
+            "assembly": self._on_edit_assembly,
+            "im_part": self._on_edit_part,
+            "component_im": self._on_edit_component,
+            "component_purchased": self._on_edit_component,
+            "component_takeover": self._on_edit_component,
+            "process_step": self._on_edit_process_step,
+        }
+
+        # Assembly Lines tree dispatch by item type
+        self._assembly_menu_builders = {
+            "assembly": self._build_assembly_menu,
+            "process_step": self._build_process_step_menu,
+            "component_im": self._build_assembly_component_menu,
+            "component_purchased": self._build_assembly_component_menu,
+            "component_takeover": self._build_assembly_component_menu,
+        }
+        self._assembly_double_click_handlers = {
+            "assembly": self._on_edit_assembly,
+            "component_im": self._on_edit_component,
+            "component_purchased": self._on_edit_component,
+            "component_takeover": self._on_edit_component,
+            "process_step": self._on_edit_process_step,
+        }
+        self._bold_font = QFont()  # Shared by all assembly rows
+        self._bold_font.setBold(True)
+        self._italic_font = QFont()  # Shared by all process step separator rows
+        self._italic_font.setItalic(True)
+
+        # Coalesces refresh requests from consecutive edits into one rebuild
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(30)
+        self._refresh_timer.timeout.connect(self._refresh_data_now)
 
         self.setMinimumSize(1200, 800)
+        get_thumbnail_decoder().thumbnail_ready.connect(self._on_tool_thumbnail_ready)
         self._load_rfq()
         self._setup_ui()
-        self._refresh_data()
+        self._refresh_data_now()
 
     def _load_rfq(self):
         """Load RFQ from database."""
         with session_scope() as session:
-            self.rfq = session.query(RFQ).get(self.rfq_id)
+            self.rfq = session.get(RFQ, self.rfq_id)
             if self.rfq:
                 session.expunge(self.rfq)
 
@@ -422,7 +650,8 @@ class RFQDetailWindow(QMainWindow):
         self.parts_tree.setColumnWidth(7, 80)
         self.parts_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.parts_tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.parts_tree.setUniformRowHeights(False)  # Allow variable row heights for process steps
+        # Every row (process steps included) is 35px via the stylesheet, so skip per-row height measuring
+        self.parts_tree.setUniformRowHeights(True)
         # Balanced row height with larger font for better space usage
         self.parts_tree.setStyleSheet("QTreeWidget::item { height: 35px; font-size: 11pt; }")
         self.parts_tree.setFont(self.parts_tree.font())
@@ -474,6 +703,7 @@ class RFQDetailWindow(QMainWindow):
         self.assembly_tree.setColumnWidth(7, 80)
         self.assembly_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.assembly_tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.assembly_tree.setUniformRowHeights(True)
         # Balanced row height with larger font for better space usage
         self.assembly_tree.setStyleSheet("QTreeWidget::item { height: 35px; font-size: 11pt; }")
         self.assembly_tree.setFont(self.assembly_tree.font())
@@ -541,20 +771,23 @@ class RFQDetailWindow(QMainWindow):
         layout.addWidget(info_label)
 
         # Tools tree view (father-child)
-        self.tools_tree = QTreeWidget()
-        self.tools_tree.setColumnCount(9)
-        self.tools_tree.setHeaderLabels([
+        self.tools_model = ToolsTreeModel([
             "Tool / Part", "Qty\n(Cav)", "Lifters", "Sliders", "Injection\nPoints",
             "Clamping\n(kN)", "Machine", "Notes"
-        ])
+        ], self)
+        self.tools_tree = QTreeView()
+        self.tools_tree.setModel(self.tools_model)
         self.tools_tree.setColumnWidth(0, 250)
         self.tools_tree.setColumnWidth(1, 60)
         self.tools_tree.setColumnWidth(2, 70)
         self.tools_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.tools_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.tools_tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.tools_tree.itemSelectionChanged.connect(self._on_tool_selected)
-        self.tools_tree.clicked.connect(self._on_tree_item_clicked)  # Click handler for images
+        # All part thumbnails are scaled to 30px, so rows share one height
+        self.tools_tree.setUniformRowHeights(True)
+        self.tools_tree.setIconSize(QSize(30, 30))
+        self.tools_tree.selectionModel().selectionChanged.connect(self._on_tool_selected)
+        self.tools_tree.clicked.connect(self._on_tools_tree_clicked)  # Click handler for images
         layout.addWidget(self.tools_tree)
 
         return tab
@@ -575,37 +808,197 @@ class RFQDetailWindow(QMainWindow):
         return tab
 
     def _refresh_data(self):
-        """Refresh all data displays."""
+        """Schedule a refresh of all data displays.
+
+        Calls within the debounce interval (e.g. a chain of pastes) are merged
+        into a single _refresh_data_now(). A pending refresh is not pushed back,
+        so a steady stream of edits (key auto-repeat) cannot starve it.
+        """
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _refresh_data_now(self):
+        """Refresh all data displays.
+
+        Opens a single session and loads the RFQ (with parts, materials and
+        assembly components eager-loaded) once; every view is rendered from it.
+        """
         # Save expanded state before refreshing (only in manual mode)
         expanded_state = None
+        expanded_state_asm = None
         if not self.tree_auto_expanded:
             expanded_state = self._save_tree_expanded_state(self.parts_tree)
+            expanded_state_asm = self._save_tree_expanded_state(self.assembly_tree)
 
-        self._load_parts_tree()
+        trees = (self.parts_tree, self.assembly_tree, self.tools_tree)
+        with self._suspend_tree_updates(*trees), session_scope() as session:
+            rfq = session.get(RFQ, self.rfq_id, options=[
+                selectinload(RFQ.parts).joinedload(Part.material),
+                selectinload(RFQ.parts).selectinload(Part.assembly_components)
+                    .joinedload(AssemblyComponent.component_part),
+            ])
 
-        # Restore or auto-expand based on mode
-        if self.tree_auto_expanded:
-            self._expand_all_items(self.parts_tree)
-        elif expanded_state:
-            self._restore_tree_expanded_state(self.parts_tree, expanded_state)
+            if rfq:
+                self._parts_with_images = self._preload_part_images(
+                    session, [p.id for p in rfq.parts], heights=(30, 45)
+                )
+                self._prefetch_process_steps(session, rfq)
 
-        self._load_im_parts_table()
-        self._load_parts_summary_table()
+            self._load_parts_tree(rfq, session)
 
-        # Save and restore Assembly Lines tree state (also respects auto-expand mode)
-        expanded_state_asm = None
-        if not self.tree_auto_expanded:
-            expanded_state_asm = self._save_tree_expanded_state(self.assembly_tree)
+            # Restore or auto-expand based on mode
+            if self.tree_auto_expanded:
+                self._expand_all_items(self.parts_tree)
+            elif expanded_state:
+                self._restore_tree_expanded_state(self.parts_tree, expanded_state)
 
-        self._load_assembly_tree()
+            self._load_im_parts_table(rfq, session)
+            self._load_parts_summary_table(rfq, session)
 
-        if self.tree_auto_expanded:
-            self._expand_all_items(self.assembly_tree)
-        elif expanded_state_asm:
-            self._restore_tree_expanded_state(self.assembly_tree, expanded_state_asm)
+            # Assembly Lines tree also respects auto-expand mode
+            self._load_assembly_tree(rfq, session)
+
+            if self.tree_auto_expanded:
+                self._expand_all_items(self.assembly_tree)
+            elif expanded_state_asm:
+                self._restore_tree_expanded_state(self.assembly_tree, expanded_state_asm)
+
+            self._load_tools_table(session)
+            self._update_calculations(rfq)
 
-        self._load_tools_table()
-        self._update_calculations()
+    def _refresh_assemblies(self, *assembly_ids: int):
+        """Rebuild only the given assemblies' rows after their components changed.
+
+        The other tree rows, the tools tree and the part images are left as
+        they are; the usage tables are reloaded since quantities may change.
+        Falls back to a full refresh if an assembly row is missing.
+        """
+        if self._refresh_timer.isActive():
+            return  # A full refresh is already pending
+
+        assembly_ids = set(assembly_ids)
+        trees = (self.parts_tree, self.assembly_tree)
+        items_by_tree = {tree: self._find_assembly_items(tree, assembly_ids) for tree in trees}
+        if any(len(items) != len(assembly_ids) for items in items_by_tree.values()):
+            self._refresh_data()
+            return
+
+        with self._suspend_tree_updates(*trees), session_scope() as session:
+            for assembly_id in assembly_ids:
+                self._normalize_component_positions(assembly_id, session)
+
+            rfq = session.get(RFQ, self.rfq_id, options=[
+                selectinload(RFQ.parts).joinedload(Part.material),
+                selectinload(RFQ.parts).selectinload(Part.assembly_components)
+                    .joinedload(AssemblyComponent.component_part),
+            ])
+            if not rfq:
+                return
+            self._prefetch_process_steps(session, rfq)
+            parts_by_id = {part.id: part for part in rfq.parts}
+
+            for tree, asm_items in items_by_tree.items():
+                expanded_state = None if self.tree_auto_expanded else self._save_tree_expanded_state(tree)
+                for assembly_id, asm_item in asm_items.items():
+                    asm_item.takeChildren()
+                    self._add_component_items(asm_item, parts_by_id[assembly_id], session,
+                                              apply_colors=tree is self.assembly_tree)
+                    self._add_process_steps_to_tree(tree, asm_item, parts_by_id[assembly_id])
+
+                if self.tree_auto_expanded:
+                    self._expand_all_items(tree)
+                elif expanded_state:
+                    self._restore_tree_expanded_state(tree, expanded_state)
+
+            self._index_im_part_items()
+            self._load_im_parts_table(rfq, session)
+            self._load_parts_summary_table(rfq, session)
+
+    def _find_assembly_items(self, tree, assembly_ids: set) -> dict:
+        """Return the top-level items of the given assemblies as {assembly_id: item}."""
+        items = {}
+        for i in range(tree.topLevelItemCount()):
+            item = tree.topLevelItem(i)
+            item_id = item.data(0, Qt.ItemDataRole.UserRole)
+            if item.data(0, Qt.ItemDataRole.UserRole + 1) == "assembly" and item_id in assembly_ids:
+                items[item_id] = item
+        return items
+
+    def _prefetch_process_steps(self, session, rfq: RFQ):
+        """Load the process steps of all assemblies in the RFQ with one query.
+
+        Steps are cached per assembly for _add_process_steps_to_tree. The
+        components they reference are taken from the already loaded
+        assembly_components, so no per-assembly or per-component queries remain.
+        """
+        assembly_ids = [part.id for part in rfq.parts if part.part_type == "assembly"]
+
+        self._steps_by_assembly = defaultdict(list)
+        if assembly_ids:
+            steps = session.query(AssemblyProcessStep).filter(
+                AssemblyProcessStep.assembly_id.in_(assembly_ids)
+            ).order_by(AssemblyProcessStep.assembly_id, AssemblyProcessStep.step_number).all()
+            for step in steps:
+                self._steps_by_assembly[step.assembly_id].append(step)
+
+        self._step_components = {
+            comp.id: comp for part in rfq.parts for comp in part.assembly_components
+        }
+
+    @contextmanager
+    def _suspend_tree_updates(self, *trees):
+        """Suspend repaints and signals on trees while they are rebuilt.
+
+        Restores each tree's previous state (so nested use is safe) and
+        repaints once at the end, even if loading raises.
+        """
+        previous = [(tree, tree.updatesEnabled(), tree.signalsBlocked()) for tree in trees]
+        for tree in trees:
+            tree.setUpdatesEnabled(False)
+            tree.blockSignals(True)
+        try:
+            yield
+        finally:
+            for tree, updates_enabled, signals_blocked in previous:
+                tree.blockSignals(signals_blocked)
+                tree.setUpdatesEnabled(updates_enabled)
+                if updates_enabled:
+                    tree.viewport().update()
+
+    def _preload_part_images(self, session, part_ids: list, heights: tuple) -> set:
+        """Find which parts have an image and load thumbnails only where not cached.
+
+        Part images are deferred, so this keeps icon rendering to a few small
+        queries instead of loading every image (or one query per part). The full
+        image is only loaded for parts that have no stored thumbnail yet.
+
+        Returns:
+            Set of part IDs that have an image
+        """
+        if not part_ids:
+            return set()
+
+        rows = session.query(Part.id, Part.image_updated_date).filter(
+            Part.id.in_(part_ids),
+            Part.image_binary.isnot(None)
+        ).all()
+
+        uncached_ids = [
+            part_id for part_id, updated in rows
+            if not all(is_part_thumbnail_cached(part_id, updated, h) for h in heights)
+        ]
+        if uncached_ids:
+            # Populates image_thumbnail on the Part objects already in the session
+            parts = session.query(Part).options(undefer(Part.image_thumbnail)).filter(
+                Part.id.in_(uncached_ids)
+            ).all()
+            missing_thumbnail_ids = [part.id for part in parts if part.image_thumbnail is None]
+            if missing_thumbnail_ids:
+                session.query(Part).options(undefer(Part.image_binary)).filter(
+                    Part.id.in_(missing_thumbnail_ids)
+                ).all()
+
+        return {part_id for part_id, _ in rows}
 
     def _save_tree_expanded_state(self, tree):
         """Save which items are expanded in the tree."""
@@ -641,37 +1034,21 @@ class RFQDetailWindow(QMainWindow):
             self._restore_expanded_items(item.child(i), expanded_set)
 
     def _expand_all_items(self, tree):
-        """Recursively expand all items in tree."""
+        """Expand all items in tree (one layout pass instead of one per item)."""
         self.programmatically_changing = True
         try:
-            for i in range(tree.topLevelItemCount()):
-                item = tree.topLevelItem(i)
-                self._expand_item_recursive(item)
+            tree.expandAll()
         finally:
             self.programmatically_changing = False
 
-    def _expand_item_recursive(self, item):
-        """Recursively expand an item and all children."""
-        item.setExpanded(True)
-        for i in range(item.childCount()):
-            self._expand_item_recursive(item.child(i))
-
     def _collapse_all_items(self, tree):
-        """Recursively collapse all items in tree."""
+        """Collapse all items in tree (one layout pass instead of one per item)."""
         self.programmatically_changing = True
         try:
-            for i in range(tree.topLevelItemCount()):
-                item = tree.topLevelItem(i)
-                self._collapse_item_recursive(item)
+            tree.collapseAll()
         finally:
             self.programmatically_changing = False
 
-    def _collapse_item_recursive(self, item):
-        """Recursively collapse an item and all children."""
-        item.setExpanded(False)
-        for i in range(item.childCount()):
-            self._collapse_item_recursive(item.child(i))
-
     def _on_item_manually_expanded(self):
         """Handle manual expansion of an item."""
         # Ignore if this is a programmatic change
@@ -764,155 +1141,161 @@ class RFQDetailWindow(QMainWindow):
                 # Assign under the last IM component
                 last_im_pos = max(int(c.position) for c in im_comps if c.position)
                 existing_decimals = [c.position for c in all_comps if c.position and int(c.position) == last_im_pos]
-                next_decimal = max(existing_decimals) + 0.01 if existing_decimals else float(last_im_pos) + 0.1
+                highest = max(existing_decimals) if existing_decimals else None
 
                 for comp in other_without_pos:
-                    comp.position = next_decimal
-                    next_decimal += 0.01
+                    comp.position = highest = next_sub_position(last_im_pos, highest)
             else:
                 # No IM components, assign to 0.1, 0.2, etc.
                 for j, comp in enumerate(other_without_pos, start=1):
                     comp.position = 0.0 + (0.1 * j)
 
-    def _load_parts_tree(self):
+    def _load_parts_tree(self, rfq: RFQ, session):
         """Load parts into BOM tree with assemblies and components."""
-        from ui.color_coding import get_missing_fields
-
         self.parts_tree.clear()
+        self._im_part_index = {}
 
-        with session_scope() as session:
-            rfq = session.query(RFQ).get(self.rfq_id)
-            if not rfq:
-                return
+        if not rfq:
+            return
 
-            parts = rfq.parts
-
-            # Normalize positions for all assemblies (in case they have NULL or bad values)
-            for part in parts:
-                if part.part_type == "assembly":
-                    self._normalize_component_positions(part.id, session)
-
-            # Get IDs of all IM parts that are used as assembly components
-            assembly_ids = [p.id for p in parts if p.part_type == "assembly"]
-            assembly_part_ids = set()
-            if assembly_ids:
-                assembly_part_ids = set(
-                    comp.component_part_id
-                    for comp in session.query(AssemblyComponent)
-                        .filter(AssemblyComponent.component_part_id.isnot(None))
-                        .filter(AssemblyComponent.assembly_id.in_(assembly_ids))
-                        .all()
-                )
+        parts = rfq.parts
+
+        # Normalize positions for all assemblies (in case they have NULL or bad values)
+        for part in parts:
+            if part.part_type == "assembly":
+                self._normalize_component_positions(part.id, session)
+
+        # Get IDs of all IM parts that are used as assembly components
+        assembly_ids = [p.id for p in parts if p.part_type == "assembly"]
+        assembly_part_ids = set()
+        if assembly_ids:
+            assembly_part_ids = set(
+                comp.component_part_id
+                for comp in session.query(AssemblyComponent)
+                    .filter(AssemblyComponent.component_part_id.isnot(None))
+                    .filter(AssemblyComponent.assembly_id.in_(assembly_ids))
+                    .all()
+            )
+
+        for part in parts:
+            if part.part_type == "assembly":
+                # Create assembly item (top-level, no background color, bold, no indent)
+                asm_item = QTreeWidgetItem()
+                asm_item.setText(0, f"🗂 {part.name}")  # Assembly icon
+
+                # Add image if available (column 1) - scale to match row height
+                if part.id in self._parts_with_images:
+                    asm_item.setIcon(1, QIcon(get_part_thumbnail(part, 30)))
+
+                asm_item.setText(2, part.part_number or "-")
+                asm_item.setText(3, "Assembly")
+                asm_item.setText(4, "-")
+                # Quantity field for assembly
+                asm_item.setText(5, str(part.demand_peak or 1))  # Use demand_peak as assembly quantity
+                asm_item.setText(6, "-")
+                asm_item.setText(7, "")
+
+                # Set user data for identification
+                asm_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
+                asm_item.setData(0, Qt.ItemDataRole.UserRole + 1, "assembly")
+
+                # Apply styling: bold only, no background color
+                for col in range(8):
+                    asm_item.setFont(col, self._bold_font)
+
+                # Add component children (indented), grouped under IM parts
+                self._add_component_items(asm_item, part, session, apply_colors=False)
+
+                self.parts_tree.addTopLevelItem(asm_item)
+                # Process steps MUST be added after asm_item is in the tree
+                self._add_process_steps_to_tree(self.parts_tree, asm_item, part)
+
+            elif part.id not in assembly_part_ids:
+                # Only show as standalone if NOT used in any assembly
+                part_item = QTreeWidgetItem()
+                part_item.setText(0, f"📦 {part.name}")  # IM part icon, NO indentation - top level like assembly
+
+                # Add image if available (column 1) - scale to match row height
+                if part.id in self._parts_with_images:
+                    part_item.setIcon(1, QIcon(get_part_thumbnail(part, 30)))
+
+                part_item.setText(2, part.part_number or "-")
+                part_item.setText(3, "Standalone IM")  # Clearly mark as standalone
+                mat_name = part.material.short_name if part.material else "-"
+                part_item.setText(4, mat_name)
+                # Quantity for standalone part (use demand_peak)
+                part_item.setText(5, str(part.demand_peak or 1))
+                part_item.setText(6, "-")
+
+                # Check completeness for status
+                missing = get_missing_fields(part)
+                if len(missing) == 0:
+                    part_item.setText(7, "✓ Complete")
+                    part_item.setForeground(7, COLOR_COMPLETE)
+                else:
+                    part_item.setText(7, "⚠ Incomplete")
+                    part_item.setForeground(7, COLOR_INCOMPLETE)
 
-            for part in parts:
-                if part.part_type == "assembly":
-                    # Create assembly item (top-level, no background color, bold, no indent)
-                    asm_item = QTreeWidgetItem()
-                    asm_item.setText(0, f"🗂 {part.name}")  # Assembly icon
-
-                    # Add image if available (column 1) - scale to match row height
-                    if part.image_binary:
-                        pixmap = QPixmap()
-                        pixmap.loadFromData(part.image_binary)
-                        scaled = pixmap.scaledToHeight(30, Qt.TransformationMode.SmoothTransformation)
-                        asm_item.setIcon(1, QIcon(scaled))
-
-                    asm_item.setText(2, part.part_number or "-")
-                    asm_item.setText(3, "Assembly")
-                    asm_item.setText(4, "-")
-                    # Quantity field for assembly
-                    asm_item.setText(5, str(part.demand_peak or 1))  # Use demand_peak as assembly quantity
-                    asm_item.setText(6, "-")
-                    asm_item.setText(7, "")
-
-                    # Set user data for identification
-                    asm_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
-                    asm_item.setData(0, Qt.ItemDataRole.UserRole + 1, "assembly")
-
-                    # Apply styling: bold only, no background color
-                    font = asm_item.font(0)
-                    font.setBold(True)
-                    for col in range(8):
-                        asm_item.setFont(col, font)
-
-                    # Add component children (indented), grouped under IM parts
-                    if part.assembly_components:
-                        # Sort by position to maintain order
-                        sorted_comps = sorted(part.assembly_components, key=lambda c: c.position if c.position else 0)
-
-                        # Build a mapping of integer positions to IM component tree items
-                        im_position_to_item = {}
-
-                        # First pass: add all IM components
-                        for comp in sorted_comps:
-                            if comp.component_type == "injection_molded":
-                                child_item = QTreeWidgetItem(asm_item)
-                                self._style_component_item(child_item, comp, session, apply_colors=False)
-                                # Store the item by its integer position
-                                if comp.position is not None:
-                                    im_pos = int(comp.position)
-                                    im_position_to_item[im_pos] = child_item
-
-                        # Second pass: add purchased/takeover components under correct IM part
-                        for comp in sorted_comps:
-                            if comp.component_type != "injection_molded":
-                                # Find which IM part this should be grouped under
-                                # Components with position between X.0 and X.99... belong under IM part at position X
-                                parent_item = None
-                                if comp.position is not None:
-                                    comp_pos = comp.position
-                                    target_im_pos = int(comp_pos)
-                                    parent_item = im_position_to_item.get(target_im_pos)
-
-                                # Add as child of the correct IM part, or to assembly as fallback
-                                if parent_item:
-                                    child_item = QTreeWidgetItem(parent_item)
-                                else:
-                                    child_item = QTreeWidgetItem(asm_item)
-                                self._style_component_item(child_item, comp, session, apply_colors=False)
-
-                    self.parts_tree.addTopLevelItem(asm_item)
-                    # Process steps MUST be added after asm_item is in the tree
-                    self._add_process_steps_to_tree(self.parts_tree, asm_item, part, session)
-
-                elif part.id not in assembly_part_ids:
-                    # Only show as standalone if NOT used in any assembly
-                    part_item = QTreeWidgetItem()
-                    part_item.setText(0, f"📦 {part.name}")  # IM part icon, NO indentation - top level like assembly
-
-                    # Add image if available (column 1) - scale to match row height
-                    if part.image_binary:
-                        pixmap = QPixmap()
-                        pixmap.loadFromData(part.image_binary)
-                        scaled = pixmap.scaledToHeight(30, Qt.TransformationMode.SmoothTransformation)
-                        part_item.setIcon(1, QIcon(scaled))
-
-                    part_item.setText(2, part.part_number or "-")
-                    part_item.setText(3, "Standalone IM")  # Clearly mark as standalone
-                    mat_name = part.material.short_name if part.material else "-"
-                    part_item.setText(4, mat_name)
-                    # Quantity for standalone part (use demand_peak)
-                    part_item.setText(5, str(part.demand_peak or 1))
-                    part_item.setText(6, "-")
-
-                    # Check completeness for status
-                    missing = get_missing_fields(part)
-                    if len(missing) == 0:
-                        part_item.setText(7, "✓ Complete")
-                        part_item.setForeground(7, QColor("#70AD47"))
-                    else:
-                        part_item.setText(7, "⚠ Incomplete")
-                        part_item.setForeground(7, QColor("#FF5050"))
-
-                    # Set user data for identification
-                    part_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
-                    part_item.setData(0, Qt.ItemDataRole.UserRole + 1, "im_part")
-
-                    # Apply red text if incomplete
-                    if len(missing) > 0:
-                        part_item.setForeground(0, QColor("#FF5050"))
-
-                    self.parts_tree.addTopLevelItem(part_item)
+                # Set user data for identification
+                part_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
+                part_item.setData(0, Qt.ItemDataRole.UserRole + 1, "im_part")
+
+                # Apply red text if incomplete
+                if len(missing) > 0:
+                    part_item.setForeground(0, COLOR_INCOMPLETE)
+
+                self.parts_tree.addTopLevelItem(part_item)
+
+        self._index_im_part_items()
+
+    def _add_component_items(self, asm_item: QTreeWidgetItem, part: Part, session, apply_colors: bool):
+        """Add an assembly's components under its tree item, grouped under their IM parts."""
+        if not part.assembly_components:
+            return
+
+        # Sort by position to maintain order
+        sorted_comps = sorted(part.assembly_components, key=lambda c: c.position if c.position else 0)
+
+        # Build a mapping of integer positions to IM component tree items
+        im_position_to_item = {}
+
+        # First pass: add all IM components
+        for comp in sorted_comps:
+            if comp.component_type == "injection_molded":
+                child_item = QTreeWidgetItem(asm_item)
+                self._style_component_item(child_item, comp, session, apply_colors=apply_colors)
+                # Store the item by its integer position
+                if comp.position is not None:
+                    im_pos = int(comp.position)
+                    im_position_to_item[im_pos] = child_item
+
+        # Second pass: add purchased/takeover components under correct IM part
+        for comp in sorted_comps:
+            if comp.component_type != "injection_molded":
+                # Find which IM part this should be grouped under
+                # Components with position between X.0 and X.99... belong under IM part at position X
+                parent_item = None
+                if comp.position is not None:
+                    parent_item = im_position_to_item.get(int(comp.position))
+
+                # Add as child of the correct IM part, or to assembly as fallback
+                child_item = QTreeWidgetItem(parent_item or asm_item)
+                self._style_component_item(child_item, comp, session, apply_colors=apply_colors)
+
+    def _index_im_part_items(self):
+        """Map each IM part to its first Master BOM item (standalone row or assembly component)."""
+        self._im_part_index = {}
+        for i in range(self.parts_tree.topLevelItemCount()):
+            top_item = self.parts_tree.topLevelItem(i)
+            item_type = top_item.data(0, Qt.ItemDataRole.UserRole + 1)
+            if item_type == "im_part":
+                self._im_part_index.setdefault(top_item.data(0, Qt.ItemDataRole.UserRole), top_item)
+            elif item_type == "assembly":
+                for j in range(top_item.childCount()):
+                    child = top_item.child(j)
+                    part_id = child.data(0, Qt.ItemDataRole.UserRole + 2)
+                    if child.data(0, Qt.ItemDataRole.UserRole + 1) == "component_im" and part_id is not None:
+                        self._im_part_index.setdefault(part_id, child)
 
     def _style_component_item(self, item: QTreeWidgetItem, component: AssemblyComponent, session, apply_colors=False):
         """Style a component tree item based on type (IM, purchased, takeover).
@@ -920,18 +1303,13 @@ class RFQDetailWindow(QMainWindow):
         Args:
             apply_colors: If True, applies background colors. Set to False for Master BOM, True for Assembly tree.
         """
-        from ui.color_coding import get_missing_fields
-
         if component.component_type == "injection_molded" and component.component_part:
             # IM part component - yellow, indented under assembly
-            item.setText(0, f"    └─ {component.component_part.name}")
+            item.setText(0, IM_COMPONENT_PREFIX + component.component_part.name)
 
             # Add image if available - scale to match row height
-            if component.component_part.image_binary:
-                pixmap = QPixmap()
-                pixmap.loadFromData(component.component_part.image_binary)
-                scaled = pixmap.scaledToHeight(45, Qt.TransformationMode.SmoothTransformation)
-                item.setIcon(1, QIcon(scaled))
+            if component.component_part.id in self._parts_with_images:
+                item.setIcon(1, QIcon(get_part_thumbnail(component.component_part, 45)))
 
             item.setText(2, component.component_part.part_number or "-")
             item.setText(3, "IM")
@@ -947,21 +1325,22 @@ class RFQDetailWindow(QMainWindow):
             missing = get_missing_fields(component.component_part)
             if len(missing) == 0:
                 item.setText(7, "✓")
-                item.setForeground(7, QColor("#70AD47"))
+                item.setForeground(7, COLOR_COMPLETE)
             else:
                 item.setText(7, "⚠")
-                item.setForeground(7, QColor("#FF5050"))
-                item.setForeground(0, QColor("#FF5050"))
+                item.setForeground(7, COLOR_INCOMPLETE)
+                item.setForeground(0, COLOR_INCOMPLETE)
 
             if apply_colors:
                 for col in range(8):
-                    item.setBackground(col, QColor("#F0B840"))
+                    item.setBackground(col, COLOR_IM_COMPONENT)
             item.setData(0, Qt.ItemDataRole.UserRole, component.id)
             item.setData(0, Qt.ItemDataRole.UserRole + 1, "component_im")
+            item.setData(0, Qt.ItemDataRole.UserRole + 2, component.component_part_id)  # Part for "Edit Part"
 
         elif component.component_type == "purchased":
             # Purchased component - red, more indented
-            item.setText(0, f"        └─ {component.component_name}")
+            item.setText(0, f"{SUB_COMPONENT_PREFIX}{component.component_name}")
 
             item.setText(2, "-")
             item.setText(3, "Purchased")
@@ -975,13 +1354,13 @@ class RFQDetailWindow(QMainWindow):
 
             if apply_colors:
                 for col in range(8):
-                    item.setBackground(col, QColor("#E04040"))
+                    item.setBackground(col, COLOR_PURCHASED_COMPONENT)
             item.setData(0, Qt.ItemDataRole.UserRole, component.id)
             item.setData(0, Qt.ItemDataRole.UserRole + 1, "component_purchased")
 
         elif component.component_type == "takeover":
             # Takeover component - grey, more indented
-            item.setText(0, f"        └─ {component.component_name} (Takeover)")
+            item.setText(0, f"{SUB_COMPONENT_PREFIX}{component.component_name} (Takeover)")
 
             item.setText(2, "-")
             item.setText(3, "Takeover")
@@ -995,7 +1374,7 @@ class RFQDetailWindow(QMainWindow):
 
             if apply_colors:
                 for col in range(8):
-                    item.setBackground(col, QColor("#B0B0B0"))
+                    item.setBackground(col, COLOR_TAKEOVER_COMPONENT)
             item.setData(0, Qt.ItemDataRole.UserRole, component.id)
             item.setData(0, Qt.ItemDataRole.UserRole + 1, "component_takeover")
 
@@ -1006,254 +1385,209 @@ class RFQDetailWindow(QMainWindow):
         else:
             return comp.component_name or "Component"
 
-    def _load_im_parts_table(self):
+    def _load_im_parts_table(self, rfq: RFQ, session):
         """Load flat list of all IM parts for tooling engineer view."""
-        from ui.color_coding import get_missing_fields, apply_source_color_to_table_item
-
         self.im_parts_table.setRowCount(0)
 
-        with session_scope() as session:
-            im_parts = session.query(Part).filter(
-                Part.rfq_id == self.rfq_id,
-                Part.part_type == "injection_molded"
-            ).all()
+        if not rfq:
+            return
 
-            for row_idx, part in enumerate(im_parts):
-                self.im_parts_table.insertRow(row_idx)
+        im_parts = [p for p in rfq.parts if p.part_type == "injection_molded"]
 
-                # Calculate total usage across all assemblies
-                total_usage = 0
-                components = session.query(AssemblyComponent).filter(
-                    AssemblyComponent.component_part_id == part.id
-                ).all()
-                for comp in components:
-                    assembly = session.query(Part).get(comp.assembly_id)
-                    if assembly:
-                        asm_qty = assembly.demand_peak or 1
-                        total_usage += asm_qty * comp.quantity
+        for row_idx, part in enumerate(im_parts):
+            self.im_parts_table.insertRow(row_idx)
 
-                # If not used in any assembly, it's standalone
-                if total_usage == 0:
-                    total_usage = part.demand_peak or 0
+            # Calculate total usage across all assemblies
+            total_usage = 0
+            components = session.query(AssemblyComponent).filter(
+                AssemblyComponent.component_part_id == part.id
+            ).all()
+            for comp in components:
+                assembly = session.get(Part, comp.assembly_id)
+                if assembly:
+                    asm_qty = assembly.demand_peak or 1
+                    total_usage += asm_qty * comp.quantity
 
-                # Name
-                name_item = QTableWidgetItem(part.name)
-                name_item.setData(Qt.ItemDataRole.UserRole, part.id)
-                self.im_parts_table.setItem(row_idx, 0, name_item)
+            # If not used in any assembly, it's standalone
+            if total_usage == 0:
+                total_usage = part.demand_peak or 0
 
-                # Part#
-                self.im_parts_table.setItem(row_idx, 1, QTableWidgetItem(part.part_number or "-"))
+            # Name
+            name_item = QTableWidgetItem(part.name)
+            name_item.setData(Qt.ItemDataRole.UserRole, part.id)
+            self.im_parts_table.setItem(row_idx, 0, name_item)
 
-                # Material
-                mat_name = part.material.short_name if part.material else "-"
-                self.im_parts_table.setItem(row_idx, 2, QTableWidgetItem(mat_name))
+            # Part#
+            self.im_parts_table.setItem(row_idx, 1, QTableWidgetItem(part.part_number or "-"))
 
-                # Weight (g)
-                self.im_parts_table.setItem(row_idx, 3, QTableWidgetItem(
-                    f"{part.weight_g:.2f}" if part.weight_g else "-"
-                ))
+            # Material
+            mat_name = part.material.short_name if part.material else "-"
+            self.im_parts_table.setItem(row_idx, 2, QTableWidgetItem(mat_name))
 
-                # Volume (cm³)
-                self.im_parts_table.setItem(row_idx, 4, QTableWidgetItem(
-                    f"{part.volume_cm3:.2f}" if part.volume_cm3 else "-"
-                ))
+            # Weight (g)
+            self.im_parts_table.setItem(row_idx, 3, QTableWidgetItem(
+                f"{part.weight_g:.2f}" if part.weight_g else "-"
+            ))
 
-                # Proj.Area (cm²) - with color coding for source
-                proj_item = QTableWidgetItem(
-                    f"{part.projected_area_cm2:.2f}" if part.projected_area_cm2 else "-"
-                )
-                apply_source_color_to_table_item(proj_item, part.projected_area_source)
-                self.im_parts_table.setItem(row_idx, 5, proj_item)
+            # Volume (cm³)
+            self.im_parts_table.setItem(row_idx, 4, QTableWidgetItem(
+                f"{part.volume_cm3:.2f}" if part.volume_cm3 else "-"
+            ))
 
-                # Wall Thickness (mm) - with color coding for source
-                wall_item = QTableWidgetItem(
-                    f"{part.wall_thickness_mm:.2f}" if part.wall_thickness_mm else "-"
-                )
-                apply_source_color_to_table_item(wall_item, part.wall_thickness_source)
-                self.im_parts_table.setItem(row_idx, 6, wall_item)
+            # Proj.Area (cm²) - with color coding for source
+            proj_item = QTableWidgetItem(
+                f"{part.projected_area_cm2:.2f}" if part.projected_area_cm2 else "-"
+            )
+            apply_source_color_to_table_item(proj_item, part.projected_area_source)
+            self.im_parts_table.setItem(row_idx, 5, proj_item)
 
-                # Peak Demand
-                self.im_parts_table.setItem(row_idx, 7, QTableWidgetItem(
-                    str(part.demand_peak) if part.demand_peak else "-"
-                ))
+            # Wall Thickness (mm) - with color coding for source
+            wall_item = QTableWidgetItem(
+                f"{part.wall_thickness_mm:.2f}" if part.wall_thickness_mm else "-"
+            )
+            apply_source_color_to_table_item(wall_item, part.wall_thickness_source)
+            self.im_parts_table.setItem(row_idx, 6, wall_item)
 
-                # Total Usage
-                self.im_parts_table.setItem(row_idx, 8, QTableWidgetItem(str(total_usage)))
+            # Peak Demand
+            self.im_parts_table.setItem(row_idx, 7, QTableWidgetItem(
+                str(part.demand_peak) if part.demand_peak else "-"
+            ))
 
-                # Status
-                missing = get_missing_fields(part)
-                if len(missing) == 0:
-                    status_item = QTableWidgetItem("\u2713 Complete")
-                    status_item.setForeground(QColor("#70AD47"))
-                else:
-                    status_item = QTableWidgetItem("\u26a0 Incomplete")
-                    status_item.setForeground(QColor("#FF5050"))
-                self.im_parts_table.setItem(row_idx, 9, status_item)
+            # Total Usage
+            self.im_parts_table.setItem(row_idx, 8, QTableWidgetItem(str(total_usage)))
+
+            # Status
+            missing = get_missing_fields(part)
+            if len(missing) == 0:
+                status_item = QTableWidgetItem("\u2713 Complete")
+                status_item.setForeground(COLOR_COMPLETE)
+            else:
+                status_item = QTableWidgetItem("\u26a0 Incomplete")
+                status_item.setForeground(COLOR_INCOMPLETE)
+            self.im_parts_table.setItem(row_idx, 9, status_item)
 
-    def _load_parts_summary_table(self):
+    def _load_parts_summary_table(self, rfq: RFQ, session):
         """Load summary of all parts (excluding assemblies) with total quantities."""
         self.parts_summary_table.setRowCount(0)
 
-        with session_scope() as session:
-            rfq = session.query(RFQ).get(self.rfq_id)
-            if not rfq:
-                return
+        if not rfq:
+            return
 
-            # Get all IM parts
-            im_parts = [p for p in rfq.parts if p.part_type == "injection_molded"]
+        # Get all IM parts
+        im_parts = [p for p in rfq.parts if p.part_type == "injection_molded"]
 
-            # Collect purchased and takeover components (group by name)
-            purchased_components = {}  # {component_name: total_qty}
-            all_components = session.query(AssemblyComponent).filter(
-                AssemblyComponent.component_type.in_(["purchased", "takeover"])
+        # Collect purchased and takeover components (group by name)
+        purchased_components = {}  # {component_name: total_qty}
+        all_components = session.query(AssemblyComponent).filter(
+            AssemblyComponent.component_type.in_(["purchased", "takeover"])
+        ).all()
+        for comp in all_components:
+            assembly = session.get(Part, comp.assembly_id)
+            if assembly:
+                asm_qty = assembly.demand_peak or 1
+                comp_name = comp.component_name or f"{comp.component_type}_{comp.id}"
+                if comp_name not in purchased_components:
+                    purchased_components[comp_name] = 0
+                purchased_components[comp_name] += asm_qty * comp.quantity
+
+        row_idx = 0
+
+        # Add IM parts
+        for part in im_parts:
+            self.parts_summary_table.insertRow(row_idx)
+
+            # Calculate total quantity across all assemblies
+            total_qty = 0
+            components = session.query(AssemblyComponent).filter(
+                AssemblyComponent.component_part_id == part.id
             ).all()
-            for comp in all_components:
-                assembly = session.query(Part).get(comp.assembly_id)
+            for comp in components:
+                assembly = session.get(Part, comp.assembly_id)
                 if assembly:
                     asm_qty = assembly.demand_peak or 1
-                    comp_name = comp.component_name or f"{comp.component_type}_{comp.id}"
-                    if comp_name not in purchased_components:
-                        purchased_components[comp_name] = 0
-                    purchased_components[comp_name] += asm_qty * comp.quantity
-
-            row_idx = 0
-
-            # Add IM parts
-            for part in im_parts:
-                self.parts_summary_table.insertRow(row_idx)
-
-                # Calculate total quantity across all assemblies
-                total_qty = 0
-                components = session.query(AssemblyComponent).filter(
-                    AssemblyComponent.component_part_id == part.id
-                ).all()
-                for comp in components:
-                    assembly = session.query(Part).get(comp.assembly_id)
-                    if assembly:
-                        asm_qty = assembly.demand_peak or 1
-                        total_qty += asm_qty * comp.quantity
+                    total_qty += asm_qty * comp.quantity
 
-                # If not used in assemblies, show the part's own demand
-                if total_qty == 0:
-                    total_qty = part.demand_peak or 0
+            # If not used in assemblies, show the part's own demand
+            if total_qty == 0:
+                total_qty = part.demand_peak or 0
 
-                # Name
-                name_item = QTableWidgetItem(part.name)
-                name_item.setData(Qt.ItemDataRole.UserRole, part.id)
-                self.parts_summary_table.setItem(row_idx, 0, name_item)
+            # Name
+            name_item = QTableWidgetItem(part.name)
+            name_item.setData(Qt.ItemDataRole.UserRole, part.id)
+            self.parts_summary_table.setItem(row_idx, 0, name_item)
 
-                # Part#
-                self.parts_summary_table.setItem(row_idx, 1, QTableWidgetItem(part.part_number or "-"))
+            # Part#
+            self.parts_summary_table.setItem(row_idx, 1, QTableWidgetItem(part.part_number or "-"))
 
-                # Type
-                self.parts_summary_table.setItem(row_idx, 2, QTableWidgetItem("IM"))
+            # Type
+            self.parts_summary_table.setItem(row_idx, 2, QTableWidgetItem("IM"))
 
-                # Total Quantity
-                self.parts_summary_table.setItem(row_idx, 3, QTableWidgetItem(str(total_qty)))
+            # Total Quantity
+            self.parts_summary_table.setItem(row_idx, 3, QTableWidgetItem(str(total_qty)))
 
-                row_idx += 1
+            row_idx += 1
 
-            # Add purchased/takeover components
-            for comp_name, total_qty in sorted(purchased_components.items()):
-                self.parts_summary_table.insertRow(row_idx)
+        # Add purchased/takeover components
+        for comp_name, total_qty in sorted(purchased_components.items()):
+            self.parts_summary_table.insertRow(row_idx)
 
-                # Name
-                self.parts_summary_table.setItem(row_idx, 0, QTableWidgetItem(comp_name))
+            # Name
+            self.parts_summary_table.setItem(row_idx, 0, QTableWidgetItem(comp_name))
 
-                # Part# (not applicable for purchased)
-                self.parts_summary_table.setItem(row_idx, 1, QTableWidgetItem("-"))
+            # Part# (not applicable for purchased)
+            self.parts_summary_table.setItem(row_idx, 1, QTableWidgetItem("-"))
 
-                # Type (Purchased or Takeover)
-                type_item = QTableWidgetItem("Purchased")
-                self.parts_summary_table.setItem(row_idx, 2, type_item)
+            # Type (Purchased or Takeover)
+            type_item = QTableWidgetItem("Purchased")
+            self.parts_summary_table.setItem(row_idx, 2, type_item)
 
-                # Total Quantity
-                self.parts_summary_table.setItem(row_idx, 3, QTableWidgetItem(str(total_qty)))
+            # Total Quantity
+            self.parts_summary_table.setItem(row_idx, 3, QTableWidgetItem(str(total_qty)))
 
-                row_idx += 1
+            row_idx += 1
 
-    def _load_assembly_tree(self):
+    def _load_assembly_tree(self, rfq: RFQ, session):
         """Load assembly-only tree view for manufacturing engineer."""
         self.assembly_tree.clear()
 
-        with session_scope() as session:
-            rfq = session.query(RFQ).get(self.rfq_id)
-            if not rfq:
-                return
+        if not rfq:
+            return
 
-            assemblies = [p for p in rfq.parts if p.part_type == "assembly"]
+        assemblies = [p for p in rfq.parts if p.part_type == "assembly"]
 
-            if not assemblies:
-                self.asm_no_data_label.setVisible(True)
-                self.assembly_tree.setVisible(False)
-                return
+        if not assemblies:
+            self.asm_no_data_label.setVisible(True)
+            self.assembly_tree.setVisible(False)
+            return
 
-            self.asm_no_data_label.setVisible(False)
-            self.assembly_tree.setVisible(True)
+        self.asm_no_data_label.setVisible(False)
+        self.assembly_tree.setVisible(True)
 
-            for part in assemblies:
-                asm_item = QTreeWidgetItem()
-                asm_item.setText(0, f"\U0001f5c2 {part.name}")
+        for part in assemblies:
+            asm_item = QTreeWidgetItem()
+            asm_item.setText(0, f"\U0001f5c2 {part.name}")
 
-                if part.image_binary:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(part.image_binary)
-                    scaled = pixmap.scaledToHeight(30, Qt.TransformationMode.SmoothTransformation)
-                    asm_item.setIcon(1, QIcon(scaled))
+            if part.id in self._parts_with_images:
+                asm_item.setIcon(1, QIcon(get_part_thumbnail(part, 30)))
 
-                asm_item.setText(2, part.part_number or "-")
-                asm_item.setText(3, "Assembly")
-                asm_item.setText(4, "-")
-                asm_item.setText(5, str(part.demand_peak or 1))
-                asm_item.setText(6, "-")
-                asm_item.setText(7, "")
+            asm_item.setText(2, part.part_number or "-")
+            asm_item.setText(3, "Assembly")
+            asm_item.setText(4, "-")
+            asm_item.setText(5, str(part.demand_peak or 1))
+            asm_item.setText(6, "-")
+            asm_item.setText(7, "")
 
-                asm_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
-                asm_item.setData(0, Qt.ItemDataRole.UserRole + 1, "assembly")
+            asm_item.setData(0, Qt.ItemDataRole.UserRole, part.id)
+            asm_item.setData(0, Qt.ItemDataRole.UserRole + 1, "assembly")
 
-                font = asm_item.font(0)
-                font.setBold(True)
-                for col in range(8):
-                    asm_item.setFont(col, font)
-
-                if part.assembly_components:
-                    # Sort by position to maintain order
-                    sorted_comps = sorted(part.assembly_components, key=lambda c: c.position if c.position else 0)
-
-                    # Build a mapping of integer positions to IM component tree items
-                    im_position_to_item = {}
-
-                    # First pass: add all IM components
-                    for comp in sorted_comps:
-                        if comp.component_type == "injection_molded":
-                            child_item = QTreeWidgetItem(asm_item)
-                            self._style_component_item(child_item, comp, session, apply_colors=True)
-                            # Store the item by its integer position
-                            if comp.position is not None:
-                                im_pos = int(comp.position)
-                                im_position_to_item[im_pos] = child_item
-
-                    # Second pass: add purchased/takeover components under correct IM part
-                    for comp in sorted_comps:
-                        if comp.component_type != "injection_molded":
-                            # Find which IM part this should be grouped under
-                            # Components with position between X.0 and X.99... belong under IM part at position X
-                            parent_item = None
-                            if comp.position is not None:
-                                comp_pos = comp.position
-                                target_im_pos = int(comp_pos)
-                                parent_item = im_position_to_item.get(target_im_pos)
-
-                            # Add as child of the correct IM part, or to assembly as fallback
-                            if parent_item:
-                                child_item = QTreeWidgetItem(parent_item)
-                            else:
-                                child_item = QTreeWidgetItem(asm_item)
-                            self._style_component_item(child_item, comp, session, apply_colors=True)
-
-                self.assembly_tree.addTopLevelItem(asm_item)
-                # Process steps MUST be added after asm_item is in the tree
-                self._add_process_steps_to_tree(self.assembly_tree, asm_item, part, session)
+            for col in range(8):
+                asm_item.setFont(col, self._bold_font)
+
+            self._add_component_items(asm_item, part, session, apply_colors=True)
+
+            self.assembly_tree.addTopLevelItem(asm_item)
+            # Process steps MUST be added after asm_item is in the tree
+            self._add_process_steps_to_tree(self.assembly_tree, asm_item, part)
 
     def _format_cavities_display(self, tool: Tool) -> str:
         """Format cavities display as 'cav1/cav2/...' and check for imbalance."""
@@ -1279,181 +1613,192 @@ class RFQDetailWindow(QMainWindow):
             return False
 
         # Get part demand data
-        with session_scope() as session:
-            demands = []
-            for pc in tool.part_configurations:
-                part = session.query(Part).get(pc.part_id)
-                if part and part.parts_over_runtime:
-                    annual_demand = part.parts_over_runtime
-                    cavities = pc.cavities
-                    # Shots per cavity per year
-                    shots_per_cavity = annual_demand / cavities
-                    demands.append(shots_per_cavity)
-
-            if len(demands) < 2:
-                return False
+        demands = []
+        for pc in tool.part_configurations:
+            part = pc.part
+            if part and part.parts_over_runtime:
+                annual_demand = part.parts_over_runtime
+                cavities = pc.cavities
+                # Shots per cavity per year
+                shots_per_cavity = annual_demand / cavities
+                demands.append(shots_per_cavity)
+
+        if len(demands) < 2:
+            return False
 
-            # Calculate imbalance: difference between min and max as percentage
-            min_demand = min(demands)
-            max_demand = max(demands)
+        # Calculate imbalance: difference between min and max as percentage
+        min_demand = min(demands)
+        max_demand = max(demands)
 
-            if min_demand == 0:
-                return False
+        if min_demand == 0:
+            return False
 
-            imbalance_percent = ((max_demand - min_demand) / min_demand) * 100
+        imbalance_percent = ((max_demand - min_demand) / min_demand) * 100
 
-            return imbalance_percent > 1.0
+        return imbalance_percent > 1.0
 
     def _get_imbalance_message(self, tool: Tool) -> str:
         """Get tooltip message with imbalance details."""
         if not tool.part_configurations or len(tool.part_configurations) < 2:
             return ""
 
-        with session_scope() as session:
-            demands = {}  # part_name: shots_per_cavity
-            for pc in tool.part_configurations:
-                part = session.query(Part).get(pc.part_id)
-                if part and part.parts_over_runtime:
-                    annual_demand = part.parts_over_runtime
-                    cavities = pc.cavities
-                    shots_per_cavity = annual_demand / cavities
-                    demands[part.name] = shots_per_cavity
+        demands = {}  # part_name: shots_per_cavity
+        for pc in tool.part_configurations:
+            part = pc.part
+            if part and part.parts_over_runtime:
+                annual_demand = part.parts_over_runtime
+                cavities = pc.cavities
+                shots_per_cavity = annual_demand / cavities
+                demands[part.name] = shots_per_cavity
 
-            if len(demands) < 2:
-                return ""
+        if len(demands) < 2:
+            return ""
 
-            min_demand = min(demands.values())
-            max_demand = max(demands.values())
+        min_demand = min(demands.values())
+        max_demand = max(demands.values())
 
-            if min_demand == 0:
-                return ""
+        if min_demand == 0:
+            return ""
 
-            imbalance_percent = ((max_demand - min_demand) / min_demand) * 100
+        imbalance_percent = ((max_demand - min_demand) / min_demand) * 100
 
-            if imbalance_percent > 1.0:
-                msg = f"⚠️ CAVITY IMBALANCE DETECTED ({imbalance_percent:.1f}%)\n"
-                msg += "This tool needs cavity shutoff capability\n\n"
-                msg += "Shots per cavity per year:\n"
-                for part_name in sorted(demands.keys()):
-                    msg += f"  {part_name}: {demands[part_name]:.0f}\n"
-                return msg
+        if imbalance_percent > 1.0:
+            msg = f"⚠️ CAVITY IMBALANCE DETECTED ({imbalance_percent:.1f}%)\n"
+            msg += "This tool needs cavity shutoff capability\n\n"
+            msg += "Shots per cavity per year:\n"
+            for part_name in sorted(demands.keys()):
+                msg += f"  {part_name}: {demands[part_name]:.0f}\n"
+            return msg
 
-            return ""
+        return ""
 
-    def _load_tools_table(self):
+    def _load_tools_table(self, session):
         """Load tools into tree view with father-child structure."""
-        self.tools_tree.clear()
+        # Get all tools for this RFQ, with part configurations and their parts in one pass
+        tools = session.query(Tool).options(
+            selectinload(Tool.part_configurations).joinedload(ToolPartConfiguration.part),
+            joinedload(Tool.machine),
+        ).all()
 
-        with session_scope() as session:
-            tools = session.query(Tool).all()  # Get all tools for this RFQ
-
-            for tool in tools:
-                # Create parent item for tool (father)
-                parts_count = len(tool.part_configurations) if tool.part_configurations else 0
-                total_cav = tool.get_total_cavities()
-
-                # Format cavities as "cav1/cav2/..." for parts
-                cav_display = self._format_cavities_display(tool)
-
-                tool_item = QTreeWidgetItem()
-                tool_item.setText(0, f"🔧 {tool.name}")
-                tool_item.setText(1, cav_display)  # Cavities display format
-                tool_item.setText(2, str(tool.get_total_lifters()))  # Total lifters
-                tool_item.setText(3, str(tool.get_total_sliders()))  # Total sliders
-                tool_item.setText(4, str(tool.injection_points) if tool.injection_points else "-")  # Injection points
-                tool_item.setText(5, f"{tool.estimated_clamping_force_kn:.0f}" if tool.estimated_clamping_force_kn else "-")
-                tool_item.setText(6, tool.machine.name if tool.machine else "-")
-                tool_item.setText(7, (tool.notes or "")[:40])
-
-                # Set tool ID as user data for selection handling
-                tool_item.setData(0, Qt.ItemDataRole.UserRole, tool.id)
-
-                # Add tooltip with cavity imbalance info if needed
-                imbalance_msg = self._get_imbalance_message(tool)
-                if imbalance_msg:
-                    tool_item.setToolTip(0, imbalance_msg)
-
-                # Bold font for tool (parent) items
-                font = tool_item.font(0)
-                font.setBold(True)
-                tool_item.setFont(0, font)
-
-                # Add child items (parts assigned to this tool)
-                if tool.part_configurations:
-                    for pc in tool.part_configurations:
-                        if pc.part:
-                            part_item = QTreeWidgetItem(tool_item)
-                            part_name = f"├─ {pc.part.name}"
-                            part_item.setText(0, part_name)
-                            part_item.setText(1, str(pc.cavities))  # Cavities for this part (Qty)
-                            part_item.setText(2, str(pc.lifters_count))  # Lifters for this part
-                            part_item.setText(3, str(pc.sliders_count))  # Sliders for this part
-                            part_item.setText(4, "-")  # Injection points (per tool, not per part)
-
-                            # Add part image as icon if available
-                            if pc.part.image_binary:
-                                pixmap = QPixmap()
-                                pixmap.loadFromData(pc.part.image_binary)
-                                scaled_pixmap = pixmap.scaledToHeight(30, Qt.TransformationMode.SmoothTransformation)
-                                part_item.setIcon(0, QIcon(scaled_pixmap))
-
-                            # Set part ID and config ID as user data
-                            part_item.setData(0, Qt.ItemDataRole.UserRole, pc.id)
-                            part_item.setData(0, Qt.ItemDataRole.UserRole + 1, "part_config")
-
-                self.tools_tree.addTopLevelItem(tool_item)
-
-    def _update_calculations(self):
+        tool_part_ids = {pc.part_id for tool in tools for pc in tool.part_configurations}
+        tool_parts_with_images = self._preload_part_images(session, list(tool_part_ids), heights=(30,))
+
+        self._pending_tool_icons = {}
+        decoder = get_thumbnail_decoder()
+
+        tool_nodes = []
+        for tool in tools:
+            # Format cavities as "cav1/cav2/..." for parts
+            cav_display = self._format_cavities_display(tool)
+
+            # Create parent node for tool (father)
+            tool_node = ToolTreeNode(tool.id, "tool", [
+                f"🔧 {tool.name}",
+                cav_display,  # Cavities display format
+                str(tool.get_total_lifters()),  # Total lifters
+                str(tool.get_total_sliders()),  # Total sliders
+                str(tool.injection_points) if tool.injection_points else "-",  # Injection points
+                f"{tool.estimated_clamping_force_kn:.0f}" if tool.estimated_clamping_force_kn else "-",
+                tool.machine.name if tool.machine else "-",
+                (tool.notes or "")[:40],
+            ])
+
+            # Add tooltip with cavity imbalance info if needed
+            tool_node.tooltip = self._get_imbalance_message(tool)
+
+            # Bold font for tool (parent) items
+            tool_node.bold = True
+
+            # Add child nodes (parts assigned to this tool)
+            for pc in tool.part_configurations:
+                if pc.part:
+                    part_node = ToolTreeNode(pc.id, "part_config", [
+                        TOOL_PART_PREFIX + pc.part.name,
+                        str(pc.cavities),  # Cavities for this part (Qty)
+                        str(pc.lifters_count),  # Lifters for this part
+                        str(pc.sliders_count),  # Sliders for this part
+                        "-",  # Injection points (per tool, not per part)
+                    ], parent=tool_node)
+
+                    # Add part image as icon if available; uncached images are decoded
+                    # in the background and set in _on_tool_thumbnail_ready
+                    if pc.part.id in tool_parts_with_images:
+                        if is_part_thumbnail_cached(pc.part.id, pc.part.image_updated_date, 30):
+                            part_node.icon = QIcon(get_part_thumbnail(pc.part, 30))
+                        else:
+                            self._pending_tool_icons.setdefault(pc.part.id, []).append(pc.id)
+                            decoder.request(pc.part, 30)
+
+            tool_nodes.append(tool_node)
+
+        self.tools_model.update_tools(tool_nodes)
+
+    def _on_tool_thumbnail_ready(self, part_id: int, height: int, pixmap: QPixmap):
+        """Set a background-decoded part thumbnail on the waiting tools tree rows."""
+        if height != 30:
+            return
+        part_config_ids = self._pending_tool_icons.pop(part_id, [])
+        if part_config_ids:
+            icon = QIcon(pixmap)
+            for part_config_id in part_config_ids:
+                node = self.tools_model.find_node("part_config", part_config_id)
+                if node:
+                    self.tools_model.set_node_icon(node, icon)
+
+    def _update_calculations(self, rfq: RFQ):
         """Update calculations summary."""
         summary = "<b>Calculation Summary</b><br>"
         summary += f"RFQ: {self.rfq.name}<br>"
 
-        with session_scope() as session:
-            rfq = session.query(RFQ).get(self.rfq_id)
-            if rfq:
-                summary += f"Parts: {len(rfq.parts)}<br>"
-                summary += f"SOP Demand: {rfq.demand_sop or 'Not set'} pcs/year<br>"
-                summary += f"EAOP Demand: {rfq.demand_eaop or 'Not set'} pcs/year<br>"
+        if rfq:
+            summary += f"Parts: {len(rfq.parts)}<br>"
+            summary += f"SOP Demand: {rfq.demand_sop or 'Not set'} pcs/year<br>"
+            summary += f"EAOP Demand: {rfq.demand_eaop or 'Not set'} pcs/year<br>"
 
         self.calc_info.setText(summary)
 
     def _on_add_part(self):
         """Show choice dialog: Create Assembly or Add Standalone IM Part."""
-        from ui.dialogs.assembly_dialog import AssemblyDialog
-
-        # Show choice dialog with custom buttons - larger size
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Add to BOM")
-        msg.setText("What would you like to add to this RFQ?\n\n")
-        msg.setInformativeText("Choose 'Create Assembly' to add a new assembly container,\nor 'Add Standalone Part' to add a shoot-and-ship IM part.")
-
-        btn_assembly = msg.addButton("Create Assembly", QMessageBox.ButtonRole.AcceptRole)
-        btn_part = msg.addButton("Add Standalone Part", QMessageBox.ButtonRole.AcceptRole)
-        msg.addButton(QMessageBox.StandardButton.Cancel)
-
-        # Make buttons larger
-        for button in msg.findChildren(QPushButton):
-            button.setMinimumHeight(40)
-            button.setMinimumWidth(140)
-
-        msg.setMinimumWidth(550)
-        msg.setMinimumHeight(280)
-
+        msg = self._get_add_part_message_box()
         msg.exec()
 
-        if msg.clickedButton() == btn_assembly:
+        if msg.clickedButton() == self._btn_add_assembly:
             # Create Assembly
+            from ui.dialogs.assembly_dialog import AssemblyDialog
             dialog = AssemblyDialog(self, rfq_id=self.rfq_id)
             if dialog.exec():
                 self._refresh_data()
                 self.statusBar().showMessage("Assembly created successfully")
-        elif msg.clickedButton() == btn_part:
+        elif msg.clickedButton() == self._btn_add_standalone:
             # Add Standalone IM Part (shoot and ship)
             dialog = PartDialog(self, rfq_id=self.rfq_id)
             if dialog.exec():
                 self._refresh_data()
                 self.statusBar().showMessage("Standalone part added successfully")
 
+    def _get_add_part_message_box(self) -> QMessageBox:
+        """Get the "Add to BOM" choice dialog, building it on first use."""
+        if self._add_part_msg is None:
+            # Choice dialog with custom buttons - larger size
+            msg = QMessageBox(self)
+            msg.setWindowTitle("Add to BOM")
+            msg.setText("What would you like to add to this RFQ?\n\n")
+            msg.setInformativeText("Choose 'Create Assembly' to add a new assembly container,\nor 'Add Standalone Part' to add a shoot-and-ship IM part.")
+
+            self._btn_add_assembly = msg.addButton("Create Assembly", QMessageBox.ButtonRole.AcceptRole)
+            self._btn_add_standalone = msg.addButton("Add Standalone Part", QMessageBox.ButtonRole.AcceptRole)
+            btn_cancel = msg.addButton(QMessageBox.StandardButton.Cancel)
+
+            # Make buttons larger
+            for button in (self._btn_add_assembly, self._btn_add_standalone, btn_cancel):
+                button.setMinimumHeight(40)
+                button.setMinimumWidth(140)
+
+            msg.setMinimumWidth(550)
+            msg.setMinimumHeight(280)
+            self._add_part_msg = msg
+        return self._add_part_msg
+
     def _on_edit_part(self, part_id: int = None):
         """Edit selected part."""
         if part_id is None:
@@ -1471,8 +1816,6 @@ class RFQDetailWindow(QMainWindow):
 
     def _on_parts_context_menu(self, position):
         """Show context menu for parts tree."""
-        from PyQt6.QtWidgets import QMenu
-
         item = self.parts_tree.itemAt(position)
         if not item:
             return
@@ -1480,120 +1823,99 @@ class RFQDetailWindow(QMainWindow):
         item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
         item_id = item.data(0, Qt.ItemDataRole.UserRole)
 
-        menu = QMenu()
+        build_menu = self._parts_menu_builders.get(item_type)
+        if build_menu is None:
+            return
+
+        menu, handlers = build_menu(item)
+        action = menu.exec(self.parts_tree.mapToGlobal(position))
+        if action in handlers:
+            handlers[action](item_id)
 
-        if item_type == "assembly":
-            # Assembly context menu
-            add_im_action = menu.addAction("Add New IM Part")
-            add_existing_action = menu.addAction("Add Existing IM Part")
-            add_purchased_action = menu.addAction("Add Purchased Component")
-            add_takeover_action = menu.addAction("Add Takeover Part")
+    def _build_menu(self, entries: list, parent=None):
+        """Build a context menu from (label, handler) entries; None adds a separator.
 
-            # Show paste option if component is copied
-            paste_action = None
-            if self.copied_component:
+        Returns:
+            Tuple of (menu, dict of action -> handler taking the item ID)
+        """
+        menu = QMenu(parent)
+        handlers = {}
+        for entry in entries:
+            if entry is None:
                 menu.addSeparator()
-                paste_action = menu.addAction("Paste Component")
-
-            menu.addSeparator()
-            add_step_action = menu.addAction("Add Process Step")
-
-            menu.addSeparator()
-            edit_action = menu.addAction("Edit Assembly")
-            delete_action = menu.addAction("Delete Assembly")
-
-            action = menu.exec(self.parts_tree.mapToGlobal(position))
-
-            if action == add_im_action:
-                self._on_add_new_im_to_assembly(item_id)
-            elif action == add_existing_action:
-                self._on_add_existing_im_to_assembly(item_id)
-            elif action == add_purchased_action:
-                self._on_add_purchased_to_assembly(item_id)
-            elif action == add_takeover_action:
-                self._on_add_takeover_to_assembly(item_id)
-            elif paste_action and action == paste_action:
-                self._on_paste_component_to_assembly(item_id)
-            elif action == add_step_action:
-                self._on_add_process_step(item_id)
-            elif action == edit_action:
-                self._on_edit_assembly(item_id)
-            elif action == delete_action:
-                self._on_delete_assembly(item_id)
-
-        elif item_type == "process_step":
-            # Process step context menu
-            edit_step_action = menu.addAction("Edit Step")
-            menu.addSeparator()
-            move_up_action = menu.addAction("Move Up")
-            move_down_action = menu.addAction("Move Down")
-            menu.addSeparator()
-            delete_step_action = menu.addAction("Delete Step")
-
-            action = menu.exec(self.parts_tree.mapToGlobal(position))
-
-            if action == edit_step_action:
-                self._on_edit_process_step(item_id)
-            elif action == move_up_action:
-                self._on_move_process_step(item_id, "up")
-            elif action == move_down_action:
-                self._on_move_process_step(item_id, "down")
-            elif action == delete_step_action:
-                self._on_delete_process_step(item_id)
-
-        elif item_type == "im_part":
-            # Standalone IM part context menu
-            edit_action = menu.addAction("Edit Part")
-            delete_action = menu.addAction("Delete Part")
-
-            action = menu.exec(self.parts_tree.mapToGlobal(position))
-
-            if action == edit_action:
-                self._on_edit_part(item_id)
-            elif action == delete_action:
-                self._on_delete_part(item_id)
-
-        elif item_type.startswith("component_"):
-            # Component context menu
-            edit_action = menu.addAction("Edit Component Details")
-            if item_type == "component_im":
-                edit_part_action = menu.addAction("Edit Part")
-            menu.addSeparator()
-            cut_action = menu.addAction("Cut")
-            copy_action = menu.addAction("Copy")
-
-            # Show paste option if there's a cut or copied component AND this is an IM component
-            paste_action = None
-            if item_type == "component_im":
-                if (hasattr(self, 'cut_component') and self.cut_component) or \
-                   (hasattr(self, 'copied_component') and self.copied_component):
-                    paste_action = menu.addAction("Paste")
-
-            menu.addSeparator()
-            delete_action = menu.addAction("Delete")
-
-            action = menu.exec(self.parts_tree.mapToGlobal(position))
-
-            if action == edit_action:
-                self._on_edit_component(item_id)
-            elif item_type == "component_im" and action == edit_part_action:
-                # Get the component to find the part_id
-                with session_scope() as session:
-                    comp = session.query(AssemblyComponent).get(item_id)
-                    if comp and comp.component_part_id:
-                        self._on_edit_part(comp.component_part_id)
-            elif action == cut_action:
-                self._on_cut_component(item_id)
-            elif action == copy_action:
-                self._on_copy_component(item_id)
-            elif paste_action and action == paste_action:
-                # Paste can be cut (move) or copy (duplicate)
-                if hasattr(self, 'cut_component') and self.cut_component:
-                    self._on_paste_component_in_assembly(item_id)
-                elif hasattr(self, 'copied_component') and self.copied_component:
-                    self._on_paste_copied_component_in_assembly(item_id)
-            elif action == delete_action:
-                self._on_remove_component(item_id)
+            else:
+                label, handler = entry
+                handlers[menu.addAction(label)] = handler
+        return menu, handlers
+
+    def _build_assembly_menu(self, item):
+        """Build the BOM tree context menu for an assembly."""
+        entries = [
+            ("Add New IM Part", self._on_add_new_im_to_assembly),
+            ("Add Existing IM Part", self._on_add_existing_im_to_assembly),
+            ("Add Purchased Component", self._on_add_purchased_to_assembly),
+            ("Add Takeover Part", self._on_add_takeover_to_assembly),
+        ]
+
+        # Show paste option if component is copied
+        if self.copied_component:
+            entries += [None, ("Paste Component", self._on_paste_component_to_assembly)]
+
+        entries += [
+            None,
+            ("Add Process Step", self._on_add_process_step),
+            None,
+            ("Edit Assembly", self._on_edit_assembly),
+            ("Delete Assembly", self._on_delete_assembly),
+        ]
+        return self._build_menu(entries)
+
+    def _build_process_step_menu(self, item):
+        """Get the BOM tree context menu for a process step (the same for every step)."""
+        if self._process_step_menu is None:
+            self._process_step_menu = self._build_menu([
+                ("Edit Step", self._on_edit_process_step),
+                None,
+                ("Move Up", lambda step_id: self._on_move_process_step(step_id, "up")),
+                ("Move Down", lambda step_id: self._on_move_process_step(step_id, "down")),
+                None,
+                ("Delete Step", self._on_delete_process_step),
+            ], parent=self)
+        return self._process_step_menu
+
+    def _build_im_part_menu(self, item):
+        """Get the BOM tree context menu for a standalone IM part (the same for every part)."""
+        if self._im_part_menu is None:
+            self._im_part_menu = self._build_menu([
+                ("Edit Part", self._on_edit_part),
+                ("Delete Part", self._on_delete_part),
+            ], parent=self)
+        return self._im_part_menu
+
+    def _build_component_menu(self, item):
+        """Build the BOM tree context menu for an assembly component."""
+        is_im = item.data(0, Qt.ItemDataRole.UserRole + 1) == "component_im"
+        entries = [("Edit Component Details", self._on_edit_component)]
+
+        part_id = item.data(0, Qt.ItemDataRole.UserRole + 2)
+        if is_im and part_id:
+            entries.append(("Edit Part", lambda component_id: self._on_edit_part(part_id)))
+
+        entries += [
+            None,
+            ("Cut", self._on_cut_component),
+            ("Copy", self._on_copy_component),
+        ]
+
+        # Show paste option if there's a cut or copied component AND this is an IM component
+        # Paste can be cut (move) or copy (duplicate)
+        if is_im and self.cut_component:
+            entries.append(("Paste", self._on_paste_component_in_assembly))
+        elif is_im and self.copied_component:
+            entries.append(("Paste", self._on_paste_copied_component_in_assembly))
+
+        entries += [None, ("Delete", self._on_remove_component)]
+        return self._build_menu(entries)
 
     def _on_delete_part(self, part_id: int = None):
         """Delete selected part."""
@@ -1605,26 +1927,27 @@ class RFQDetailWindow(QMainWindow):
             item = selected[0]
             part_id = item.data(0, Qt.ItemDataRole.UserRole)
 
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            part = session.query(Part).get(part_id)
-            if not part:
-                QMessageBox.warning(self, "Error", "Part not found")
-                return
-
-            part_name = part.name
+            part_name = session.execute(select(Part.name).where(Part.id == part_id)).scalar()
+        if part_name is None:
+            QMessageBox.warning(self, "Error", "Part not found")
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Delete",
             f"Delete part '{part_name}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            with session_scope() as session:
-                part = session.query(Part).get(part_id)
-                if part:
-                    session.delete(part)
-            self._refresh_data()
+        with session_scope() as session:
+            part = session.get(Part, part_id)
+            if part:
+                session.delete(part)
+
+        self._refresh_data()
 
     def _on_add_tool(self):
         """Add tool to RFQ."""
@@ -1635,28 +1958,28 @@ class RFQDetailWindow(QMainWindow):
 
     def _on_tool_selected(self):
         """Handle tool/part selection in tree."""
-        selected = self.tools_tree.selectedItems()
+        selected = self.tools_tree.selectionModel().selectedRows()
         if selected:
             self._selected_tool_item = selected[0]
 
-    def _on_tree_item_clicked(self, index):
-        """Handle click on tree items (to show image zoom for parts when clicking image icon)."""
-        item = self.tools_tree.itemFromIndex(index)
-        if not item or not item.parent():  # Only handle child items (parts)
-            return
-
+    def _on_tools_tree_clicked(self, index):
+        """Handle click on tools tree items (to show image zoom for parts when clicking image icon)."""
         # Only trigger image zoom if clicking on column 0 (image icon)
         if index.column() != 0:
             return
 
-        # Check if item has part configuration data
-        part_config_id = item.data(0, Qt.ItemDataRole.UserRole)
-        if not part_config_id:
+        node = self.tools_model.node(index)
+        if not node or not node.parent:  # Only handle child items (parts)
+            return
+
+        # Parts without an image have no icon - nothing to load
+        part_config_id = node.item_id
+        if not part_config_id or node.icon is None:
             return
 
         # Get the part image data
         with session_scope() as session:
-            part_config = session.query(ToolPartConfiguration).get(part_config_id)
+            part_config = session.get(ToolPartConfiguration, part_config_id)
             if part_config and part_config.part and part_config.part.image_binary:
                 show_image_preview(
                     self,
@@ -1666,17 +1989,17 @@ class RFQDetailWindow(QMainWindow):
 
     def _get_selected_tool_id(self) -> int:
         """Get ID of selected tool (parent item)."""
-        selected = self.tools_tree.selectedItems()
+        selected = self.tools_tree.selectionModel().selectedRows()
         if not selected:
             return None
 
-        item = selected[0]
+        node = self.tools_model.node(selected[0])
 
         # If it's a child item (part), get parent
-        if item.parent():
-            item = item.parent()
+        if node.parent:
+            node = node.parent
 
-        return item.data(0, Qt.ItemDataRole.UserRole)
+        return node.item_id
 
     def _on_edit_tool(self):
         """Edit selected tool."""
@@ -1697,30 +2020,31 @@ class RFQDetailWindow(QMainWindow):
             QMessageBox.warning(self, "No Selection", "Please select a tool to delete")
             return
 
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            tool = session.query(Tool).get(tool_id)
-            if not tool:
-                QMessageBox.warning(self, "Error", "Tool not found")
-                return
-
-            tool_name = tool.name
+            tool_name = session.execute(select(Tool.name).where(Tool.id == tool_id)).scalar()
+        if tool_name is None:
+            QMessageBox.warning(self, "Error", "Tool not found")
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Delete",
             f"Delete tool '{tool_name}'? This will also delete all part configurations.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            with session_scope() as session:
-                tool = session.query(Tool).get(tool_id)
-                if tool:
-                    session.delete(tool)
-            self._refresh_data()
-            self.statusBar().showMessage(f"Deleted tool: {tool_name}")
+        with session_scope() as session:
+            tool = session.get(Tool, tool_id)
+            if tool:
+                session.delete(tool)
+
+        self._refresh_data()
+        self.statusBar().showMessage(f"Deleted tool: {tool_name}")
 
     def _on_tree_item_clicked(self, index):
-        """Handle click on tree items (for image preview in column 1)."""
+        """Handle click on BOM tree items (for image preview in column 1)."""
         if index.column() != 1:  # Only handle column 1 (image column)
             return
 
@@ -1734,21 +2058,18 @@ class RFQDetailWindow(QMainWindow):
         # Get the part/component and show image preview
         with session_scope() as session:
             if item_type == "assembly":
-                part = session.query(Part).get(item_id)
+                part = session.get(Part, item_id)
                 if part and part.image_binary:
-                    from ui.widgets.image_preview import show_image_preview
                     show_image_preview(self, f"Assembly: {part.name}", part.image_binary)
 
             elif item_type == "im_part":
-                part = session.query(Part).get(item_id)
+                part = session.get(Part, item_id)
                 if part and part.image_binary:
-                    from ui.widgets.image_preview import show_image_preview
                     show_image_preview(self, f"Part: {part.name}", part.image_binary)
 
             elif item_type == "component_im":
-                component = session.query(AssemblyComponent).get(item_id)
+                component = session.get(AssemblyComponent, item_id)
                 if component and component.component_part and component.component_part.image_binary:
-                    from ui.widgets.image_preview import show_image_preview
                     show_image_preview(self, f"Part: {component.component_part.name}", component.component_part.image_binary)
 
     def _on_tree_item_double_clicked(self, index):
@@ -1758,19 +2079,9 @@ class RFQDetailWindow(QMainWindow):
             return
 
         item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-        item_id = item.data(0, Qt.ItemDataRole.UserRole)
-
-        if item_type == "assembly":
-            self._on_edit_assembly(item_id)
-        elif item_type == "im_part":
-            self._on_edit_part(item_id)
-        elif item_type == "component_im":
-            # Edit component details for IM components
-            self._on_edit_component(item_id)
-        elif item_type in ("component_purchased", "component_takeover"):
-            self._on_edit_component(item_id)
-        elif item_type == "process_step":
-            self._on_edit_process_step(item_id)
+        handler = self._parts_double_click_handlers.get(item_type)
+        if handler:
+            handler(item.data(0, Qt.ItemDataRole.UserRole))
 
     def _on_add_new_im_to_assembly(self, assembly_id: int):
         """Add a new IM part to assembly."""
@@ -1778,7 +2089,7 @@ class RFQDetailWindow(QMainWindow):
 
         # Verify assembly exists and get its name for confirmation
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
+            assembly = session.get(Part, assembly_id)
             if not assembly or assembly.part_type != "assembly":
                 QMessageBox.warning(self, "Error", "Invalid assembly selected")
                 return
@@ -1786,33 +2097,25 @@ class RFQDetailWindow(QMainWindow):
 
         # Open PartDialog to create new part
         dialog = PartDialog(self, rfq_id=self.rfq_id)
-        if dialog.exec():
-            # Get the created part ID
-            with session_scope() as session:
-                # Get the most recently created part (hacky but works)
-                parts = session.query(Part).filter(Part.rfq_id == self.rfq_id).order_by(Part.id.desc()).first()
-                if parts:
-                    new_part_id = parts.id
-
-                    # Now open ComponentDetailDialog
-                    comp_dialog = ComponentDetailDialog(
-                        self, assembly_id=assembly_id,
-                        component_type="injection_molded",
-                        part_id=new_part_id
-                    )
-                    comp_dialog.setWindowTitle(f"Add IM Part to '{assembly_name}'")
-                    if comp_dialog.exec():
-                        self._refresh_data()
-                        self.statusBar().showMessage(f"Component added to '{assembly_name}'")
+        if dialog.exec() and dialog.created_part_id:
+            # Now open ComponentDetailDialog for the created part
+            comp_dialog = ComponentDetailDialog(
+                self, assembly_id=assembly_id,
+                component_type="injection_molded",
+                part_id=dialog.created_part_id
+            )
+            comp_dialog.setWindowTitle(f"Add IM Part to '{assembly_name}'")
+            if comp_dialog.exec():
+                self._refresh_data()
+                self.statusBar().showMessage(f"Component added to '{assembly_name}'")
 
     def _on_add_existing_im_to_assembly(self, assembly_id: int):
         """Add existing IM part to assembly."""
         from ui.dialogs.component_dialog import ComponentDetailDialog
-        from PyQt6.QtWidgets import QInputDialog
 
         # Verify assembly exists and get its name for confirmation
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
+            assembly = session.get(Part, assembly_id)
             if not assembly or assembly.part_type != "assembly":
                 QMessageBox.warning(self, "Error", "Invalid assembly selected")
                 return
@@ -1859,7 +2162,7 @@ class RFQDetailWindow(QMainWindow):
 
         # Verify assembly exists and get its name for confirmation
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
+            assembly = session.get(Part, assembly_id)
             if not assembly or assembly.part_type != "assembly":
                 QMessageBox.warning(self, "Error", "Invalid assembly selected")
                 return
@@ -1881,7 +2184,7 @@ class RFQDetailWindow(QMainWindow):
 
         # Verify assembly exists and get its name for confirmation
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
+            assembly = session.get(Part, assembly_id)
             if not assembly or assembly.part_type != "assembly":
                 QMessageBox.warning(self, "Error", "Invalid assembly selected")
                 return
@@ -1907,27 +2210,28 @@ class RFQDetailWindow(QMainWindow):
 
     def _on_delete_assembly(self, assembly_id: int):
         """Delete assembly and its components."""
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
-            if not assembly:
-                QMessageBox.warning(self, "Error", "Assembly not found")
-                return
-
-            assembly_name = assembly.name
+            assembly_name = session.execute(select(Part.name).where(Part.id == assembly_id)).scalar()
+        if assembly_name is None:
+            QMessageBox.warning(self, "Error", "Assembly not found")
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Delete",
             f"Delete assembly '{assembly_name}' and all its components?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            with session_scope() as session:
-                assembly = session.query(Part).get(assembly_id)
-                if assembly:
-                    session.delete(assembly)
-            self._refresh_data()
-            self.statusBar().showMessage(f"Deleted assembly: {assembly_name}")
+        with session_scope() as session:
+            assembly = session.get(Part, assembly_id)
+            if assembly:
+                session.delete(assembly)
+
+        self._refresh_data()
+        self.statusBar().showMessage(f"Deleted assembly: {assembly_name}")
 
     def _on_edit_component(self, component_id: int):
         """Edit component details."""
@@ -1940,34 +2244,55 @@ class RFQDetailWindow(QMainWindow):
 
     def _on_remove_component(self, component_id: int):
         """Remove component from assembly."""
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            component = session.query(AssemblyComponent).get(component_id)
-            if not component:
-                QMessageBox.warning(self, "Error", "Component not found")
-                return
-
-            comp_name = component.component_name or (
-                component.component_part.name if component.component_part else "Component"
-            )
+            row = session.execute(
+                select(
+                    AssemblyComponent.component_name, AssemblyComponent.assembly_id,
+                    AssemblyComponent.component_part_id, Part.name.label("part_name")
+                )
+                .outerjoin(Part, Part.id == AssemblyComponent.component_part_id)
+                .where(AssemblyComponent.id == component_id)
+            ).first()
+        if not row:
+            QMessageBox.warning(self, "Error", "Component not found")
+            return
 
+        comp_name = row.component_name or row.part_name or "Component"
         reply = QMessageBox.question(
             self, "Confirm Remove",
             f"Remove '{comp_name}' from assembly?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            with session_scope() as session:
-                component = session.query(AssemblyComponent).get(component_id)
-                if component:
-                    session.delete(component)
+        assembly_id = row.assembly_id
+        with session_scope() as session:
+            # An IM part used nowhere else becomes a standalone top-level row
+            becomes_standalone = row.component_part_id is not None and session.execute(
+                select(AssemblyComponent.id).where(
+                    AssemblyComponent.component_part_id == row.component_part_id,
+                    AssemblyComponent.id != component_id
+                ).limit(1)
+            ).scalar() is None
+
+            component = session.get(AssemblyComponent, component_id)
+            if component:
+                session.delete(component)
+
+        if becomes_standalone:
             self._refresh_data()
-            self.statusBar().showMessage(f"Removed component from assembly")
+        else:
+            self._refresh_assemblies(assembly_id)
+        self.statusBar().showMessage(f"Removed component from assembly")
 
     def _on_cut_component(self, component_id: int):
         """Cut a component for moving within assembly (change which IM part it's grouped under)."""
         with session_scope() as session:
-            component = session.query(AssemblyComponent).get(component_id)
+            component = session.get(AssemblyComponent, component_id, options=[
+                joinedload(AssemblyComponent.component_part)
+            ])
             if not component:
                 QMessageBox.warning(self, "Error", "Component not found")
                 return
@@ -1990,7 +2315,7 @@ class RFQDetailWindow(QMainWindow):
     def _on_copy_component(self, component_id: int):
         """Copy a component for pasting."""
         with session_scope() as session:
-            component = session.query(AssemblyComponent).get(component_id)
+            component = session.get(AssemblyComponent, component_id)
             if not component:
                 QMessageBox.warning(self, "Error", "Component not found")
                 return
@@ -2021,19 +2346,14 @@ class RFQDetailWindow(QMainWindow):
             return
 
         with session_scope() as session:
-            # Get the last IM component in the assembly to attach to
-            last_im_component = session.query(AssemblyComponent).filter(
+            # Get the position of the last IM component in the assembly to attach to
+            last_im_position = session.query(func.max(AssemblyComponent.position)).filter(
                 AssemblyComponent.assembly_id == assembly_id,
                 AssemblyComponent.component_type == "injection_molded"
-            ).order_by(AssemblyComponent.position.desc()).first()
+            ).scalar()
 
-            # Determine position for new component
-            if last_im_component and last_im_component.position is not None:
-                # Attach under the last IM component
-                new_position = last_im_component.position + 0.1
-            else:
-                # Fallback: if no IM components, use position 0.1
-                new_position = 0.1
+            # Attach after the components under the last IM component (0.1 if there are no IM components)
+            new_position = self._next_decimal_position(session, assembly_id, int(last_im_position or 0))
 
             # Create new component with copied data
             new_component = AssemblyComponent(
@@ -2051,10 +2371,41 @@ class RFQDetailWindow(QMainWindow):
             )
             session.add(new_component)
 
-        self._refresh_data()
+        self._refresh_assemblies(assembly_id)
         comp_name = self.copied_component["component_name"] or "Component"
         self.statusBar().showMessage(f"Pasted '{comp_name}' to assembly")
 
+    def _next_position_under(self, session, target_component: AssemblyComponent) -> float:
+        """Return the next free decimal position for a component grouped under an IM component."""
+        assembly_id = target_component.assembly_id
+        if target_component.position is None:
+            # Give the target the next integer position in the assembly
+            highest_position = session.query(func.max(AssemblyComponent.position)).filter(
+                AssemblyComponent.assembly_id == assembly_id
+            ).scalar()
+            target_component.position = (highest_position or 0) + 1
+
+        target_position = int(target_component.position)  # Force to integer
+        return self._next_decimal_position(session, assembly_id, target_position)
+
+    def _next_decimal_position(self, session, assembly_id: int, target_position_int: int) -> float:
+        """Return the next decimal position under an integer position, remembered for the session."""
+        positions = session.info.setdefault("_next_pos", {})
+        key = (assembly_id, target_position_int)
+        if key in positions:
+            highest_under_target = positions[key]
+        else:
+            # Get highest decimal position under this IM part (to avoid conflicts)
+            highest_under_target = session.query(func.max(AssemblyComponent.position)).filter(
+                AssemblyComponent.assembly_id == assembly_id,
+                AssemblyComponent.position > target_position_int,
+                AssemblyComponent.position < (target_position_int + 1)
+            ).scalar()
+
+        new_position = next_sub_position(target_position_int, highest_under_target)
+        positions[key] = new_position
+        return new_position
+
     def _on_paste_component_in_assembly(self, target_im_component_id: int):
         """Paste a cut component to be grouped under a different IM part within the same assembly."""
         if not self.cut_component:
@@ -2066,13 +2417,21 @@ class RFQDetailWindow(QMainWindow):
 
         with session_scope() as session:
             # Get the target IM component (the IM part we're pasting after)
-            target_component = session.query(AssemblyComponent).get(target_im_component_id)
+            target_component = session.get(AssemblyComponent, target_im_component_id, options=[
+                load_only(AssemblyComponent.assembly_id, AssemblyComponent.component_type,
+                          AssemblyComponent.component_part_id, AssemblyComponent.position),
+                joinedload(AssemblyComponent.component_part).load_only(Part.name),
+            ])
             if not target_component or target_component.component_type != "injection_molded":
                 QMessageBox.warning(self, "Error", "Can only paste after IM parts")
                 return
 
             # Get the component being moved
-            component = session.query(AssemblyComponent).get(component_id)
+            component = session.get(AssemblyComponent, component_id, options=[
+                load_only(AssemblyComponent.assembly_id, AssemblyComponent.component_name,
+                          AssemblyComponent.component_part_id, AssemblyComponent.position),
+                joinedload(AssemblyComponent.component_part).load_only(Part.name),
+            ])
             if not component:
                 QMessageBox.warning(self, "Error", "Component to move not found")
                 return
@@ -2085,32 +2444,11 @@ class RFQDetailWindow(QMainWindow):
             target_part_name = target_component.component_part.name if target_component.component_part else "part"
             comp_name = component.component_name or (component.component_part.name if component.component_part else "Component")
 
-            # Ensure target component has a proper position
-            if target_component.position is None:
-                # Find the highest position in this assembly and use next integer
-                highest = session.query(AssemblyComponent).filter(
-                    AssemblyComponent.assembly_id == target_component.assembly_id
-                ).order_by(AssemblyComponent.position.desc()).first()
-                target_component.position = (highest.position or 0) + 1 if highest else 1
-
-            target_position = int(target_component.position)  # Force to integer
-
-            # Get highest decimal position under this IM part (to avoid conflicts)
-            existing_under_target = session.query(AssemblyComponent).filter(
-                AssemblyComponent.assembly_id == component.assembly_id,
-                AssemblyComponent.position > target_position,
-                AssemblyComponent.position < (target_position + 1)
-            ).order_by(AssemblyComponent.position.desc()).first()
-
-            if existing_under_target and existing_under_target.position:
-                new_position = existing_under_target.position + 0.01
-            else:
-                new_position = float(target_position) + 0.1
-
             # Set the moved component's position
-            component.position = new_position
+            component.position = self._next_position_under(session, target_component)
+            assembly_id = component.assembly_id
 
-        self._refresh_data()
+        self._refresh_assemblies(assembly_id)
         self.cut_component = None
         self.statusBar().showMessage(f"Moved '{comp_name}' to be grouped with '{target_part_name}'")
 
@@ -2121,7 +2459,6 @@ class RFQDetailWindow(QMainWindow):
             return
 
         # Ask for quantity
-        from PyQt6.QtWidgets import QInputDialog
         qty, ok = QInputDialog.getInt(
             self,
             "Paste Component",
@@ -2136,7 +2473,11 @@ class RFQDetailWindow(QMainWindow):
 
         with session_scope() as session:
             # Get the target IM component (the IM part we're pasting after)
-            target_component = session.query(AssemblyComponent).get(target_im_component_id)
+            target_component = session.get(AssemblyComponent, target_im_component_id, options=[
+                load_only(AssemblyComponent.assembly_id, AssemblyComponent.component_type,
+                          AssemblyComponent.component_part_id, AssemblyComponent.position),
+                joinedload(AssemblyComponent.component_part).load_only(Part.name),
+            ])
             if not target_component or target_component.component_type != "injection_molded":
                 QMessageBox.warning(self, "Error", "Can only paste after IM parts")
                 return
@@ -2150,19 +2491,15 @@ class RFQDetailWindow(QMainWindow):
 
             # For purchased components, check if same name/type already exists under this IM part
             if self.copied_component["component_type"] in ["purchased", "takeover"]:
-                existing_under_target = session.query(AssemblyComponent).filter(
+                existing_under_target = select(AssemblyComponent.id).where(
                     AssemblyComponent.assembly_id == assembly_id,
                     AssemblyComponent.component_type == self.copied_component["component_type"],
-                    AssemblyComponent.component_name == self.copied_component["component_name"]
-                ).all()
-
-                # Filter to only those under the target IM part
-                existing_under_target = [
-                    c for c in existing_under_target
-                    if c.position and int(c.position) == target_position_int
-                ]
+                    AssemblyComponent.component_name == self.copied_component["component_name"],
+                    AssemblyComponent.position >= target_position_int,
+                    AssemblyComponent.position < target_position_int + 1
+                ).limit(1)
 
-                if existing_under_target:
+                if session.execute(existing_under_target).scalar() is not None:
                     QMessageBox.warning(
                         self,
                         "Duplicate Component",
@@ -2171,27 +2508,7 @@ class RFQDetailWindow(QMainWindow):
                     )
                     return
 
-            # Ensure target component has a proper position
-            if target_component.position is None:
-                # Find the highest position in this assembly and use next integer
-                highest = session.query(AssemblyComponent).filter(
-                    AssemblyComponent.assembly_id == target_component.assembly_id
-                ).order_by(AssemblyComponent.position.desc()).first()
-                target_component.position = (highest.position or 0) + 1 if highest else 1
-
-            target_position = int(target_component.position)  # Force to integer
-
-            # Get highest decimal position under this IM part
-            existing_under_target = session.query(AssemblyComponent).filter(
-                AssemblyComponent.assembly_id == target_component.assembly_id,
-                AssemblyComponent.position > target_position,
-                AssemblyComponent.position < (target_position + 1)
-            ).order_by(AssemblyComponent.position.desc()).first()
-
-            if existing_under_target and existing_under_target.position:
-                new_position = existing_under_target.position + 0.01
-            else:
-                new_position = float(target_position) + 0.1
+            new_position = self._next_position_under(session, target_component)
 
             # Create new component with copied data
             new_component = AssemblyComponent(
@@ -2209,15 +2526,13 @@ class RFQDetailWindow(QMainWindow):
             )
             session.add(new_component)
 
-        self._refresh_data()
+        self._refresh_assemblies(assembly_id)
         self.statusBar().showMessage(f"Pasted '{comp_name}' (qty: {qty}) under '{target_part_name}'")
 
     # --- IM Parts Table Handlers ---
 
     def _on_im_parts_context_menu(self, position):
         """Show context menu for IM parts table."""
-        from PyQt6.QtWidgets import QMenu
-
         item = self.im_parts_table.itemAt(position)
         if not item:
             return
@@ -2254,36 +2569,18 @@ class RFQDetailWindow(QMainWindow):
     def _switch_to_master_bom_and_highlight(self, part_id: int):
         """Switch to Master BOM tab and highlight the given part."""
         self.bom_sub_tabs.setCurrentIndex(0)
-        # Search for the part in the tree and select it
-        for i in range(self.parts_tree.topLevelItemCount()):
-            top_item = self.parts_tree.topLevelItem(i)
-            item_id = top_item.data(0, Qt.ItemDataRole.UserRole)
-            item_type = top_item.data(0, Qt.ItemDataRole.UserRole + 1)
-            if item_type == "im_part" and item_id == part_id:
-                self.parts_tree.setCurrentItem(top_item)
-                self.parts_tree.scrollToItem(top_item)
-                return
-            # Also check children (IM parts inside assemblies)
-            for j in range(top_item.childCount()):
-                child = top_item.child(j)
-                child_type = child.data(0, Qt.ItemDataRole.UserRole + 1)
-                if child_type == "component_im":
-                    child_id = child.data(0, Qt.ItemDataRole.UserRole)
-                    # component_id is stored, need to check component_part_id
-                    with session_scope() as session:
-                        comp = session.query(AssemblyComponent).get(child_id)
-                        if comp and comp.component_part_id == part_id:
-                            self.parts_tree.expandItem(top_item)
-                            self.parts_tree.setCurrentItem(child)
-                            self.parts_tree.scrollToItem(child)
-                            return
+        item = self._im_part_index.get(part_id)
+        if item is None:
+            return
+        if item.parent():
+            self.parts_tree.expandItem(item.parent())  # IM part inside an assembly
+        self.parts_tree.setCurrentItem(item)
+        self.parts_tree.scrollToItem(item)
 
     # --- Assembly Lines Tree Handlers ---
 
     def _on_assembly_tree_context_menu(self, position):
         """Show context menu for assembly lines tree."""
-        from PyQt6.QtWidgets import QMenu
-
         item = self.assembly_tree.itemAt(position)
         if not item:
             return
@@ -2291,86 +2588,29 @@ class RFQDetailWindow(QMainWindow):
         item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
         item_id = item.data(0, Qt.ItemDataRole.UserRole)
 
-        menu = QMenu()
+        build_menu = self._assembly_menu_builders.get(item_type)
+        if build_menu is None:
+            return
 
-        if item_type == "assembly":
-            add_im_action = menu.addAction("Add New IM Part")
-            add_existing_action = menu.addAction("Add Existing IM Part")
-            add_purchased_action = menu.addAction("Add Purchased Component")
-            add_takeover_action = menu.addAction("Add Takeover Part")
+        menu, handlers = build_menu(item)
+        action = menu.exec(self.assembly_tree.mapToGlobal(position))
+        if action in handlers:
+            handlers[action](item_id)
 
-            paste_action = None
-            if self.copied_component:
-                menu.addSeparator()
-                paste_action = menu.addAction("Paste Component")
-
-            menu.addSeparator()
-            add_step_action = menu.addAction("Add Process Step")
-
-            menu.addSeparator()
-            edit_action = menu.addAction("Edit Assembly")
-            delete_action = menu.addAction("Delete Assembly")
-
-            action = menu.exec(self.assembly_tree.mapToGlobal(position))
-
-            if action == add_im_action:
-                self._on_add_new_im_to_assembly(item_id)
-            elif action == add_existing_action:
-                self._on_add_existing_im_to_assembly(item_id)
-            elif action == add_purchased_action:
-                self._on_add_purchased_to_assembly(item_id)
-            elif action == add_takeover_action:
-                self._on_add_takeover_to_assembly(item_id)
-            elif paste_action and action == paste_action:
-                self._on_paste_component_to_assembly(item_id)
-            elif action == add_step_action:
-                self._on_add_process_step(item_id)
-            elif action == edit_action:
-                self._on_edit_assembly(item_id)
-            elif action == delete_action:
-                self._on_delete_assembly(item_id)
-
-        elif item_type == "process_step":
-            # Process step context menu
-            edit_step_action = menu.addAction("Edit Step")
-            menu.addSeparator()
-            move_up_action = menu.addAction("Move Up")
-            move_down_action = menu.addAction("Move Down")
-            menu.addSeparator()
-            delete_step_action = menu.addAction("Delete Step")
-
-            action = menu.exec(self.assembly_tree.mapToGlobal(position))
-
-            if action == edit_step_action:
-                self._on_edit_process_step(item_id)
-            elif action == move_up_action:
-                self._on_move_process_step(item_id, "up")
-            elif action == move_down_action:
-                self._on_move_process_step(item_id, "down")
-            elif action == delete_step_action:
-                self._on_delete_process_step(item_id)
-
-        elif item_type and item_type.startswith("component_"):
-            edit_action = menu.addAction("Edit Component Details")
-            if item_type == "component_im":
-                edit_part_action = menu.addAction("Edit Part")
-            menu.addSeparator()
-            copy_action = menu.addAction("Copy Component")
-            remove_action = menu.addAction("Remove from Assembly")
-
-            action = menu.exec(self.assembly_tree.mapToGlobal(position))
-
-            if action == edit_action:
-                self._on_edit_component(item_id)
-            elif item_type == "component_im" and action == edit_part_action:
-                with session_scope() as session:
-                    comp = session.query(AssemblyComponent).get(item_id)
-                    if comp and comp.component_part_id:
-                        self._on_edit_part(comp.component_part_id)
-            elif action == copy_action:
-                self._on_copy_component(item_id)
-            elif action == remove_action:
-                self._on_remove_component(item_id)
+    def _build_assembly_component_menu(self, item):
+        """Build the Assembly Lines tree context menu for an assembly component."""
+        entries = [("Edit Component Details", self._on_edit_component)]
+
+        part_id = item.data(0, Qt.ItemDataRole.UserRole + 2)
+        if item.data(0, Qt.ItemDataRole.UserRole + 1) == "component_im" and part_id:
+            entries.append(("Edit Part", lambda component_id: self._on_edit_part(part_id)))
+
+        entries += [
+            None,
+            ("Copy Component", self._on_copy_component),
+            ("Remove from Assembly", self._on_remove_component),
+        ]
+        return self._build_menu(entries)
 
     def _on_assembly_tree_double_clicked(self, index):
         """Handle double-click on assembly lines tree items."""
@@ -2379,19 +2619,12 @@ class RFQDetailWindow(QMainWindow):
             return
 
         item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-        item_id = item.data(0, Qt.ItemDataRole.UserRole)
-
-        if item_type == "assembly":
-            self._on_edit_assembly(item_id)
-        elif item_type == "component_im":
-            self._on_edit_component(item_id)
-        elif item_type in ("component_purchased", "component_takeover"):
-            self._on_edit_component(item_id)
-        elif item_type == "process_step":
-            self._on_edit_process_step(item_id)
+        handler = self._assembly_double_click_handlers.get(item_type)
+        if handler:
+            handler(item.data(0, Qt.ItemDataRole.UserRole))
 
     def _on_assembly_tree_clicked(self, index):
-        """Handle click on assembly lines tree items (for image preview in column 1 and process steps display)."""
+        """Handle click on assembly lines tree items (for image preview in column 1)."""
         item = self.assembly_tree.itemFromIndex(index)
         if not item:
             return
@@ -2399,10 +2632,6 @@ class RFQDetailWindow(QMainWindow):
         item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
         item_id = item.data(0, Qt.ItemDataRole.UserRole)
 
-        # Show process steps for selected assembly
-        if item_type == "assembly":
-            self._update_process_steps_display(item_id)
-
         # Handle image preview on column 1 click
         if index.column() != 1:
             return
@@ -2412,171 +2641,100 @@ class RFQDetailWindow(QMainWindow):
 
         with session_scope() as session:
             if item_type == "assembly":
-                part = session.query(Part).get(item_id)
+                part = session.get(Part, item_id)
                 if part and part.image_binary:
-                    from ui.widgets.image_preview import show_image_preview
                     show_image_preview(self, f"Assembly: {part.name}", part.image_binary)
             elif item_type == "component_im":
-                component = session.query(AssemblyComponent).get(item_id)
+                component = session.get(AssemblyComponent, item_id)
                 if component and component.component_part and component.component_part.image_binary:
-                    from ui.widgets.image_preview import show_image_preview
                     show_image_preview(self, f"Part: {component.component_part.name}", component.component_part.image_binary)
 
-    def _update_process_steps_display(self, assembly_id: int):
-        """Update process steps display for selected assembly."""
-        with session_scope() as session:
-            steps = session.query(AssemblyProcessStep).filter(
-                AssemblyProcessStep.assembly_id == assembly_id
-            ).order_by(AssemblyProcessStep.step_number).all()
-
-            if not steps:
-                self.process_steps_display.setPlainText("")
-                return
-
-            # Build text display
-            lines = []
-            for step in steps:
-                process_label = step.process_type.replace("_", " ").title()
-                comp_parts = []
-                components_dict = step.get_components()
-                if components_dict:
-                    for comp_id_str, qty in components_dict.items():
-                        try:
-                            comp_id = int(comp_id_str)
-                            comp = session.query(AssemblyComponent).get(comp_id)
-                            if comp:
-                                comp_name = self._format_component_name_short(comp)
-                                comp_parts.append(f"{comp_name} x{qty}")
-                        except:
-                            pass
-
-                comp_text = ", ".join(comp_parts) if comp_parts else ""
-                step_header = f"{step.step_number}. {process_label}:"
-
-                if comp_text:
-                    lines.append(f"{step_header} {comp_text}")
-                else:
-                    lines.append(step_header)
-
-                if step.notes:
-                    lines.append(f"   Notes: {step.notes}")
-
-            self.process_steps_display.setPlainText("\n".join(lines))
-
-    def _on_assembly_tree_selection_changed(self, selected, deselected):
-        """Update process steps display when selection changes in assembly tree."""
-        if not selected.indexes():
-            self.process_steps_display.setPlainText("")
-            return
-
-        index = selected.indexes()[0]
-        item = self.assembly_tree.itemFromIndex(index)
-        if not item:
-            return
-
-        item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-        item_id = item.data(0, Qt.ItemDataRole.UserRole)
-
-        if item_type == "assembly":
-            self._update_process_steps_display(item_id)
-        else:
-            self.process_steps_display.setPlainText("")
+    def _format_step_components(self, step: AssemblyProcessStep, comps_by_id: dict,
+                                name_cache: dict = None) -> str:
+        """Format the components of a process step as "Part1 x1, Part2 x2".
 
-    def _on_assembly_tree_selection_changed_direct(self):
-        """Update process steps display when selection changes (no parameters)."""
-        selected_items = self.assembly_tree.selectedItems()
-        if not selected_items:
-            self.process_steps_display.setPlainText("")
+        Pass the same name_cache for all steps of an assembly so each component
+        name is only formatted once.
+        """
+        if name_cache is None:
+            name_cache = {}
+        comp_parts = []
+        for comp_id, qty in step.get_component_quantities():
+            comp = comps_by_id.get(comp_id)
+            if comp:
+                name = name_cache.get(comp.id)
+                if name is None:
+                    name = name_cache[comp.id] = self._format_component_name_short(comp)
+                comp_parts.append(f"{name} x{qty}")
+        return ", ".join(comp_parts)
+
+    def _add_process_steps_to_tree(self, tree, asm_item: QTreeWidgetItem, part):
+        """Add process steps as children of assembly (so they collapse/expand together).
+
+        Reads the steps cached by _prefetch_process_steps.
+        """
+        steps = self._steps_by_assembly.get(part.id)
+        if not steps:
             return
 
-        item = selected_items[0]
-        item_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-        item_id = item.data(0, Qt.ItemDataRole.UserRole)
-
-        if item_type == "assembly":
-            self._update_process_steps_display(item_id)
-        else:
-            self.process_steps_display.setPlainText("")
+        # Batch the inserts into one layout pass (also when called outside a refresh)
+        with self._suspend_tree_updates(tree):
+            # Separator row
+            sep_item = QTreeWidgetItem()
+            sep_item.setText(0, "── Process Steps ──")
+            sep_item.setFont(0, self._italic_font)
+            sep_item.setForeground(0, BRUSH_STEP_SEPARATOR_TEXT)
+            column_count = tree.columnCount()
+            for col in range(column_count):
+                sep_item.setBackground(col, BRUSH_STEP_SEPARATOR_BACKGROUND)
+            sep_item.setFlags(sep_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
+            asm_item.addChild(sep_item)
+            # Must be called AFTER item is in the tree
+            sep_item.setFirstColumnSpanned(True)
 
-    def _add_process_steps_to_tree(self, tree, asm_item: QTreeWidgetItem, part, session):
-        """Add process steps as children of assembly (so they collapse/expand together)."""
-        steps = session.query(AssemblyProcessStep).filter(
-            AssemblyProcessStep.assembly_id == part.id
-        ).order_by(AssemblyProcessStep.step_number).all()
+            comps_by_id = self._step_components
+            name_cache = {}
 
-        if not steps:
-            return
+            # Each step — use native tree text + background (spans full width)
+            for step in steps:
+                step_item = QTreeWidgetItem()
 
-        # Separator row
-        sep_item = QTreeWidgetItem()
-        sep_item.setText(0, "── Process Steps ──")
-        font = sep_item.font(0)
-        font.setItalic(True)
-        sep_item.setFont(0, font)
-        sep_item.setForeground(0, QColor("#808080"))
-        for col in range(tree.columnCount()):
-            sep_item.setBackground(col, QColor("#4a4a4a"))
-        sep_item.setFlags(sep_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-        asm_item.addChild(sep_item)
-        # Must be called AFTER item is in the tree
-        sep_item.setFirstColumnSpanned(True)
-
-        # Each step — use native tree text + background (spans full width)
-        for step in steps:
-            step_item = QTreeWidgetItem()
-
-            # Format: "1. Assemble: Part1 x1, Part2 x2"
-            process_label = step.process_type.replace("_", " ").title()
-            comp_parts = []
-            components_dict = step.get_components()
-            if components_dict:
-                for comp_id_str, qty in components_dict.items():
-                    try:
-                        comp_id = int(comp_id_str)
-                        comp = session.query(AssemblyComponent).get(comp_id)
-                        if comp:
-                            comp_name = self._format_component_name_short(comp)
-                            comp_parts.append(f"{comp_name} x{qty}")
-                    except:
-                        pass
-
-            comp_text = ", ".join(comp_parts) if comp_parts else ""
-            if comp_text:
-                step_text = f"  {step.step_number}. {process_label}: {comp_text}"
-            else:
-                step_text = f"  {step.step_number}. {process_label}"
+                # Format: "1. Assemble: Part1 x1, Part2 x2"
+                process_label = step.process_type.replace("_", " ").title()
+                comp_text = self._format_step_components(step, comps_by_id, name_cache)
+                if comp_text:
+                    step_text = f"  {step.step_number}. {process_label}: {comp_text}"
+                else:
+                    step_text = f"  {step.step_number}. {process_label}"
 
-            step_item.setText(0, step_text)
+                step_item.setText(0, step_text)
 
-            # Green background across ALL columns so full row is green
-            green = QColor("#90C890")
-            for col in range(tree.columnCount()):
-                step_item.setBackground(col, green)
+                # Green background across ALL columns so full row is green
+                for col in range(column_count):
+                    step_item.setBackground(col, BRUSH_STEP_BACKGROUND)
 
-            step_item.setForeground(0, QColor("#1a1a1a"))
+                step_item.setForeground(0, BRUSH_STEP_TEXT)
 
-            if step.notes:
-                step_item.setToolTip(0, step.notes)
+                if step.notes:
+                    step_item.setToolTip(0, step.notes)
 
-            step_item.setData(0, Qt.ItemDataRole.UserRole, step.id)
-            step_item.setData(0, Qt.ItemDataRole.UserRole + 1, "process_step")
+                step_item.setData(0, Qt.ItemDataRole.UserRole, step.id)
+                step_item.setData(0, Qt.ItemDataRole.UserRole + 1, "process_step")
 
-            asm_item.addChild(step_item)
-            # Must be called AFTER item is in the tree
-            step_item.setFirstColumnSpanned(True)
+                asm_item.addChild(step_item)
+                # Must be called AFTER item is in the tree
+                step_item.setFirstColumnSpanned(True)
 
     def _on_move_component(self, component_id: int):
         """Show dialog to move component to another assembly."""
-        from PyQt6.QtWidgets import QInputDialog
-
         # Get current component and assembly info
         with session_scope() as session:
-            component = session.query(AssemblyComponent).get(component_id)
+            component = session.get(AssemblyComponent, component_id)
             if not component:
                 QMessageBox.warning(self, "Error", "Component not found")
                 return
 
-            current_assembly = session.query(Part).get(component.assembly_id)
+            current_assembly = session.get(Part, component.assembly_id, options=[load_only(Part.name)])
             if not current_assembly:
                 QMessageBox.warning(self, "Error", "Assembly not found")
                 return
@@ -2615,24 +2773,32 @@ class RFQDetailWindow(QMainWindow):
 
     def _on_move_component_to_assembly(self, component_id: int, target_assembly_id: int):
         """Handle moving a component from one assembly to another."""
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            component = session.query(AssemblyComponent).get(component_id)
-            if not component:
-                QMessageBox.warning(self, "Error", "Component not found")
-                return
-
-            source_assembly = session.query(Part).get(component.assembly_id)
-            target_assembly = session.query(Part).get(target_assembly_id)
+            row = session.execute(
+                select(
+                    AssemblyComponent.component_name, AssemblyComponent.assembly_id,
+                    Part.name.label("part_name")
+                )
+                .outerjoin(Part, Part.id == AssemblyComponent.component_part_id)
+                .where(AssemblyComponent.id == component_id)
+            ).first()
+            if row:
+                names = dict(session.execute(
+                    select(Part.id, Part.name).where(Part.id.in_([row.assembly_id, target_assembly_id]))
+                ).all())
+        if not row:
+            QMessageBox.warning(self, "Error", "Component not found")
+            return
 
-            if not source_assembly or not target_assembly:
-                QMessageBox.warning(self, "Error", "Assembly not found")
-                return
+        source_assembly_id = row.assembly_id
+        if source_assembly_id not in names or target_assembly_id not in names:
+            QMessageBox.warning(self, "Error", "Assembly not found")
+            return
 
-            source_name = source_assembly.name
-            target_name = target_assembly.name
-            comp_name = component.component_name or (
-                component.component_part.name if component.component_part else "Component"
-            )
+        source_name = names[source_assembly_id]
+        target_name = names[target_assembly_id]
+        comp_name = row.component_name or row.part_name or "Component"
 
         reply = QMessageBox.question(
             self,
@@ -2640,63 +2806,76 @@ class RFQDetailWindow(QMainWindow):
             f"Move '{comp_name}' from '{source_name}' to '{target_name}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
-        if reply == QMessageBox.StandardButton.Yes:
-            with session_scope() as session:
-                component = session.query(AssemblyComponent).get(component_id)
-                if component:
-                    component.assembly_id = target_assembly_id
-            self._refresh_data()
-            self.statusBar().showMessage(f"Moved '{comp_name}' to '{target_name}'")
+        with session_scope() as session:
+            # Single-column write: no need to load the component
+            session.execute(
+                update(AssemblyComponent)
+                .where(AssemblyComponent.id == component_id)
+                .values(assembly_id=target_assembly_id)
+            )
+
+        self._refresh_assemblies(source_assembly_id, target_assembly_id)
+        self.statusBar().showMessage(f"Moved '{comp_name}' to '{target_name}'")
 
     def _on_drop_part_on_assembly(self, assembly_id: int, part_id: int):
         """Handle drop of IM part onto assembly — add as component with dialog."""
         from ui.dialogs.component_dialog import ComponentDetailDialog
 
-        # Verify both assembly and part exist
+        # Verify both assembly and part exist, and check if this part is
+        # already used as a component in this assembly
         with session_scope() as session:
-            assembly = session.query(Part).get(assembly_id)
-            part = session.query(Part).get(part_id)
+            rows = session.execute(
+                select(Part.id, Part.name, Part.part_type).where(Part.id.in_([assembly_id, part_id]))
+            ).all()
+            existing_id = session.execute(
+                select(AssemblyComponent.id).where(
+                    AssemblyComponent.assembly_id == assembly_id,
+                    AssemblyComponent.component_part_id == part_id
+                ).limit(1)
+            ).scalar()
 
-            if not assembly or assembly.part_type != "assembly":
-                QMessageBox.warning(self, "Error", "Invalid assembly selected")
-                return
+        parts = {row.id: row for row in rows}
+        assembly = parts.get(assembly_id)
+        part = parts.get(part_id)
 
-            if not part or part.part_type != "injection_molded":
-                QMessageBox.warning(self, "Error", "Invalid IM part selected")
-                return
+        if not assembly or assembly.part_type != "assembly":
+            QMessageBox.warning(self, "Error", "Invalid assembly selected")
+            return
 
-            assembly_name = assembly.name
-            part_name = part.name
+        if not part or part.part_type != "injection_molded":
+            QMessageBox.warning(self, "Error", "Invalid IM part selected")
+            return
 
-        # Check if this part is already used as a component in this assembly
-        with session_scope() as session:
-            existing = session.query(AssemblyComponent).filter(
-                AssemblyComponent.assembly_id == assembly_id,
-                AssemblyComponent.component_part_id == part_id
-            ).first()
+        assembly_name = assembly.name
+        part_name = part.name
+        # A standalone part moves into the assembly, which changes the top-level rows
+        part_item = self._im_part_index.get(part_id)
+        was_standalone = part_item is not None and part_item.parent() is None
 
-            if existing:
-                reply = QMessageBox.question(
-                    self,
-                    "Part Already in Assembly",
-                    f"'{part_name}' is already a component in '{assembly_name}'.\n\n"
-                    "Would you like to edit the existing component or add another instance?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel
-                )
+        if existing_id is not None:
+            reply = QMessageBox.question(
+                self,
+                "Part Already in Assembly",
+                f"'{part_name}' is already a component in '{assembly_name}'.\n\n"
+                "Would you like to edit the existing component or add another instance?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel
+            )
 
-                if reply == QMessageBox.StandardButton.Yes:
-                    # Edit existing component
-                    comp_dialog = ComponentDetailDialog(
-                        self, component_id=existing.id
-                    )
-                    if comp_dialog.exec():
-                        self._refresh_data()
-                        self.statusBar().showMessage(f"Component updated in '{assembly_name}'")
-                    return
-                elif reply == QMessageBox.StandardButton.Cancel:
-                    return
-                # If No, continue to add another instance
+            if reply == QMessageBox.StandardButton.Yes:
+                # Edit existing component
+                comp_dialog = ComponentDetailDialog(
+                    self, component_id=existing_id
+                )
+                if comp_dialog.exec():
+                    self._refresh_assemblies(assembly_id)
+                    self.statusBar().showMessage(f"Component updated in '{assembly_name}'")
+                return
+            elif reply == QMessageBox.StandardButton.Cancel:
+                return
+            # If No, continue to add another instance
 
         # Open dialog to set component details (join method, quantity, notes)
         comp_dialog = ComponentDetailDialog(
@@ -2706,103 +2885,99 @@ class RFQDetailWindow(QMainWindow):
         )
         comp_dialog.setWindowTitle(f"Add '{part_name}' to '{assembly_name}'")
         if comp_dialog.exec():
-            self._refresh_data()
+            if was_standalone:
+                self._refresh_data()
+            else:
+                self._refresh_assemblies(assembly_id)
             self.statusBar().showMessage(f"'{part_name}' added to '{assembly_name}'")
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts: Ctrl+C (copy), Ctrl+X (cut), Ctrl+V (paste)."""
-        # Get the currently focused tree widget
-        current_tab = self.bom_sub_tabs.currentIndex()
-        tree = None
+        # Plain keys (the common case) go straight to the default behavior
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            super().keyPressEvent(event)
+            return
+
+        handler_name = CLIPBOARD_SHORTCUTS.get(event.key())
+        if handler_name is None:
+            super().keyPressEvent(event)
+            return
 
+        # Delegate to the shortcut handlers of the tree on the current tab
+        current_tab = self.bom_sub_tabs.currentIndex()
         if current_tab == 0:  # Master BOM
             tree = self.parts_tree
         elif current_tab == 2:  # Assembly Lines
             tree = self.assembly_tree
+        else:
+            tree = None
 
-        if not tree:
-            super().keyPressEvent(event)
-            return
-
-        # Check if Ctrl is held
-        ctrl_held = event.modifiers() & Qt.KeyboardModifier.ControlModifier
-
-        if not ctrl_held:
+        handler = getattr(tree, handler_name, None)
+        if handler is None:
             super().keyPressEvent(event)
             return
 
-        key = event.key()
-
-        # Delegate to tree's keyboard shortcut handlers
-        if key == Qt.Key.Key_C:
-            if hasattr(tree, '_handle_copy_shortcut'):
-                tree._handle_copy_shortcut()
-                event.accept()
-                return
-        elif key == Qt.Key.Key_X:
-            if hasattr(tree, '_handle_cut_shortcut'):
-                tree._handle_cut_shortcut()
-                event.accept()
-                return
-        elif key == Qt.Key.Key_V:
-            if hasattr(tree, '_handle_paste_shortcut'):
-                tree._handle_paste_shortcut()
-                event.accept()
-                return
-
-        super().keyPressEvent(event)
+        handler()
+        event.accept()
 
     # --- Process Step Handlers ---
 
     def _on_add_process_step(self, assembly_id: int):
         """Add a process step to an assembly."""
-        from ui.dialogs.process_step_dialog import ProcessStepDialog
-
-        dialog = ProcessStepDialog(self, assembly_id=assembly_id)
+        dialog = _process_step_dialog_class()(self, assembly_id=assembly_id)
         if dialog.exec():
             self._refresh_data()
             self.statusBar().showMessage("Process step added")
 
     def _on_edit_process_step(self, step_id: int):
         """Edit an existing process step."""
-        from ui.dialogs.process_step_dialog import ProcessStepDialog
-
-        dialog = ProcessStepDialog(self, step_id=step_id)
+        dialog = _process_step_dialog_class()(self, step_id=step_id)
         if dialog.exec():
             self._refresh_data()
             self.statusBar().showMessage("Process step updated")
 
     def _on_delete_process_step(self, step_id: int):
         """Delete a process step and renumber remaining steps."""
+        # Short read; no connection is held while the confirmation is open
         with session_scope() as session:
-            step = session.query(AssemblyProcessStep).get(step_id)
-            if not step:
-                return
-            desc = step.description
-            assembly_id = step.assembly_id
+            row = session.execute(
+                select(AssemblyProcessStep.description, AssemblyProcessStep.assembly_id)
+                .where(AssemblyProcessStep.id == step_id)
+            ).first()
+        if not row:
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Delete",
-            f"Delete step: '{desc}'?",
+            f"Delete step: '{row.description}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply != QMessageBox.StandardButton.Yes:
             return
 
         with session_scope() as session:
-            step = session.query(AssemblyProcessStep).get(step_id)
-            if not step:
-                return
-            assembly_id = step.assembly_id
-            session.delete(step)
-            session.flush()
-
-            # Renumber remaining steps
-            remaining = session.query(AssemblyProcessStep).filter(
-                AssemblyProcessStep.assembly_id == assembly_id
-            ).order_by(AssemblyProcessStep.step_number).all()
-            for i, s in enumerate(remaining, start=1):
-                s.step_number = i
+            steps = AssemblyProcessStep.__table__
+            session.execute(delete(steps).where(steps.c.id == step_id))
+
+            # Renumber remaining steps 1..N by (step_number, id). Ranks are taken from
+            # a read before any row changes; a correlated UPDATE would see its own writes
+            remaining = session.execute(
+                select(steps.c.id, steps.c.step_number)
+                .where(steps.c.assembly_id == row.assembly_id)
+                .order_by(steps.c.step_number, steps.c.id)
+            ).all()
+            renumbered = [
+                {"step_id": remaining_id, "new_number": number}
+                for number, (remaining_id, step_number) in enumerate(remaining, start=1)
+                if step_number != number
+            ]
+            if renumbered:
+                session.execute(
+                    update(steps)
+                    .where(steps.c.id == bindparam("step_id"))
+                    .values(step_number=bindparam("new_number")),
+                    renumbered,
+                )
 
         self._refresh_data()
         self.statusBar().showMessage("Process step deleted")
@@ -2810,24 +2985,26 @@ class RFQDetailWindow(QMainWindow):
     def _on_move_process_step(self, step_id: int, direction: str):
         """Move a process step up or down by swapping step_number with neighbor."""
         with session_scope() as session:
-            step = session.query(AssemblyProcessStep).get(step_id)
+            step = session.get(AssemblyProcessStep, step_id)
             if not step:
                 return
 
-            all_steps = session.query(AssemblyProcessStep).filter(
+            # Only the adjacent step is needed, not the whole list
+            neighbors = session.query(AssemblyProcessStep).filter(
                 AssemblyProcessStep.assembly_id == step.assembly_id
-            ).order_by(AssemblyProcessStep.step_number).all()
-
-            idx = next((i for i, s in enumerate(all_steps) if s.id == step_id), None)
-            if idx is None:
-                return
-
-            if direction == "up" and idx > 0:
-                neighbor = all_steps[idx - 1]
-            elif direction == "down" and idx < len(all_steps) - 1:
-                neighbor = all_steps[idx + 1]
+            )
+            if direction == "up":
+                neighbor = neighbors.filter(
+                    AssemblyProcessStep.step_number < step.step_number
+                ).order_by(AssemblyProcessStep.step_number.desc()).first()
+            elif direction == "down":
+                neighbor = neighbors.filter(
+                    AssemblyProcessStep.step_number > step.step_number
+                ).order_by(AssemblyProcessStep.step_number).first()
             else:
                 return
+            if neighbor is None:
+                return
 
             # Swap step numbers
             step.step_number, neighbor.step_number = neighbor.step_number, step.step_number
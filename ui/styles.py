@@ -1,148 +1,17 @@
 """Qt stylesheets for the application."""
 
-# Main application stylesheet
-MAIN_STYLE = """
-QMainWindow {
-    background-color: #f5f5f5;
-}
-
-QTabWidget::pane {
-    border: 1px solid #c0c0c0;
-    background-color: white;
-}
-
-QTabBar::tab {
-    background-color: #e0e0e0;
-    padding: 8px 16px;
-    margin-right: 2px;
-    border: 1px solid #c0c0c0;
-    border-bottom: none;
-    border-top-left-radius: 4px;
-    border-top-right-radius: 4px;
-}
-
-QTabBar::tab:selected {
-    background-color: white;
-    border-bottom: 1px solid white;
-}
-
-QTabBar::tab:hover:!selected {
-    background-color: #d0d0d0;
-}
-
-QPushButton {
-    background-color: #4472C4;
-    color: white;
-    border: none;
-    padding: 6px 16px;
-    border-radius: 4px;
-    min-width: 80px;
-}
-
-QPushButton:hover {
-    background-color: #3461b3;
-}
-
-QPushButton:pressed {
-    background-color: #2850a2;
-}
-
-QPushButton:disabled {
-    background-color: #a0a0a0;
-}
-
-QTableWidget {
-    background-color: white;
-    gridline-color: #e0e0e0;
-    selection-background-color: #4472C4;
-    selection-color: white;
-}
-
-QTableWidget::item {
-    padding: 4px;
-}
-
-QHeaderView::section {
-    background-color: #4472C4;
-    color: white;
-    padding: 6px;
-    border: none;
-    font-weight: bold;
-}
-
-QLineEdit {
-    padding: 6px;
-    border: 1px solid #c0c0c0;
-    border-radius: 4px;
-    background-color: white;
-}
-
-QLineEdit:focus {
-    border: 2px solid #4472C4;
-}
-
-QComboBox {
-    padding: 6px;
-    border: 1px solid #c0c0c0;
-    border-radius: 4px;
-    background-color: white;
-}
-
-QComboBox:focus {
-    border: 2px solid #4472C4;
-}
-
-QSpinBox, QDoubleSpinBox {
-    padding: 6px;
-    border: 1px solid #c0c0c0;
-    border-radius: 4px;
-    background-color: white;
-}
-
-QTextEdit {
-    border: 1px solid #c0c0c0;
-    border-radius: 4px;
-    background-color: white;
-}
-
-QFrame#DetailsPanel {
-    background-color: white;
-    border: 1px solid #c0c0c0;
-    border-radius: 4px;
-}
-
-QStatusBar {
-    background-color: #4472C4;
-    color: white;
-}
+from functools import lru_cache
+from pathlib import Path
 
-QToolBar {
-    background-color: #f0f0f0;
-    border: none;
-    spacing: 4px;
-    padding: 4px;
-}
-
-QToolBar QToolButton {
-    background-color: transparent;
-    border: 1px solid transparent;
-    padding: 4px 8px;
-    border-radius: 4px;
-}
+# Main application stylesheet, kept as a plain .qss file next to this module
+MAIN_STYLE_PATH = Path(__file__).parent / "resources" / "main.qss"
 
-QToolBar QToolButton:hover {
-    background-color: #d0d0d0;
-    border: 1px solid #c0c0c0;
-}
 
-QMessageBox {
-    background-color: white;
-}
+@lru_cache(maxsize=None)
+def main_style() -> str:
+    """Return the main application stylesheet, read from disk once."""
+    return MAIN_STYLE_PATH.read_text(encoding="utf-8")
 
-QMessageBox QPushButton {
-    min-width: 80px;
-}
-"""
 
 # Color constants for status indicators
 COLORS = {
@@ -166,6 +35,13 @@ COMPLEXITY_COLORS = {
 }
 
 
+# Status indicator stylesheets, built once per color key
+_STATUS_STYLES = {
+    key: f"background-color: {color}; color: white; padding: 4px 8px; border-radius: 4px;"
+    for key, color in COLORS.items()
+}
+
+
 def get_status_style(status: str) -> str:
     """Get stylesheet for a status indicator.
 
@@ -175,10 +51,10 @@ def get_status_style(status: str) -> str:
     Returns:
         CSS style string
     """
-    color = COLORS.get(status, COLORS['neutral'])
-    return f"background-color: {color}; color: white; padding: 4px 8px; border-radius: 4px;"
+    return _STATUS_STYLES.get(status, _STATUS_STYLES['neutral'])
 
 
+@lru_cache(maxsize=None)
 def get_complexity_style(rating: int) -> str:
     """Get stylesheet for complexity rating.
 
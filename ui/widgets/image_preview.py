@@ -1,8 +1,279 @@
-"""Shared image preview window utility."""
+"""Shared image preview window and thumbnail utilities."""
+
+import atexit
+from typing import Optional
 
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QScrollArea
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QCoreApplication, QBuffer, QByteArray, QIODevice, QSize, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QImageReader, QGuiApplication
+
+from sqlalchemy import select, update, bindparam
+
+from database.connection import session_scope
+from database.models import Part
+
+# Height of the thumbnails stored in Part.image_thumbnail (2x the 30px tree icons)
+THUMBNAIL_HEIGHT = 60
+
+# Parts whose full image is loaded at once when backfilling thumbnails
+BACKFILL_BATCH_SIZE = 50
+
+# Memory the scaled zoom-level pixmaps may take per preview window
+ZOOM_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def make_thumbnail(image_data: bytes) -> Optional[bytes]:
+    """Scale an image down to THUMBNAIL_HEIGHT and encode it as PNG.
+
+    Args:
+        image_data: Full-size image data
+
+    Returns:
+        PNG bytes, or None if the image could not be decoded
+    """
+    image = QImage.fromData(image_data)
+    if image.isNull():
+        return None
+    if image.height() > THUMBNAIL_HEIGHT:
+        image = image.scaledToHeight(THUMBNAIL_HEIGHT, Qt.TransformationMode.SmoothTransformation)
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def backfill_part_thumbnails() -> int:
+    """Create missing thumbnails for parts that have an image.
+
+    Runs once, from upgrade_schema, when the thumbnail column is added;
+    parts saved afterwards get their thumbnail on save. Images are loaded
+    BACKFILL_BATCH_SIZE parts at a time to keep memory use low.
+
+    Returns:
+        Number of thumbnails created
+    """
+    created = 0
+    with session_scope() as session:
+        part_ids = session.scalars(select(Part.id).where(
+            Part.image_binary.isnot(None),
+            Part.image_thumbnail.is_(None)
+        )).all()
+
+        for start in range(0, len(part_ids), BACKFILL_BATCH_SIZE):
+            batch = part_ids[start:start + BACKFILL_BATCH_SIZE]
+            thumbnails = []
+            for part_id, image_binary in session.execute(
+                select(Part.id, Part.image_binary).where(Part.id.in_(batch))
+            ):
+                thumbnail = make_thumbnail(image_binary)
+                if thumbnail:
+                    thumbnails.append({"part_id": part_id, "thumbnail": thumbnail})
+            if thumbnails:
+                session.execute(
+                    update(Part.__table__)
+                    .where(Part.__table__.c.id == bindparam("part_id"))
+                    .values(image_thumbnail=bindparam("thumbnail")),
+                    thumbnails
+                )
+                created += len(thumbnails)
+    return created
+
+
+def _thumbnail_source(part) -> bytes:
+    """Get the smallest stored image data to build a thumbnail from."""
+    return part.image_thumbnail or part.image_binary
+
+
+def _thumbnail_key(part_id: int, image_updated_date, height: int) -> str:
+    """Build the QPixmapCache key for a part thumbnail."""
+    return f"part_thumb_{height}_{part_id}_{image_updated_date}"
+
+
+def is_part_thumbnail_cached(part_id: int, image_updated_date, height: int) -> bool:
+    """Check if a part thumbnail is cached without touching the image data."""
+    return QPixmapCache.find(_thumbnail_key(part_id, image_updated_date, height)) is not None
+
+
+def get_part_thumbnail(part, height: int) -> QPixmap:
+    """Get a part image scaled to the given height, decoding it only once.
+
+    Scaled pixmaps are kept in QPixmapCache keyed by part ID, height and image
+    update date, so replacing a part's image invalidates its thumbnails. On a
+    cache miss the stored thumbnail is decoded, falling back to the full image
+    (image_binary) for parts that have no thumbnail yet.
+
+    Args:
+        part: Part with image_thumbnail or image_binary set
+        height: Thumbnail height in pixels
+
+    Returns:
+        Scaled QPixmap
+    """
+    key = _thumbnail_key(part.id, part.image_updated_date, height)
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        pixmap = QPixmap()
+        pixmap.loadFromData(_thumbnail_source(part))
+        pixmap = pixmap.scaledToHeight(height, Qt.TransformationMode.SmoothTransformation)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class _ThumbnailDecodeTask(QRunnable):
+    """Decode and scale one image on a QThreadPool worker."""
+
+    def __init__(self, decoder: "ThumbnailDecoder", key: str, part_id: int, height: int, data: bytes):
+        super().__init__()
+        self._decoder = decoder
+        self._key = key
+        self._part_id = part_id
+        self._height = height
+        self._data = data
+
+    def run(self):
+        # QImage (unlike QPixmap) may be used outside the GUI thread
+        image = QImage.fromData(self._data)
+        if not image.isNull():
+            image = image.scaledToHeight(self._height, Qt.TransformationMode.SmoothTransformation)
+        try:
+            self._decoder._image_decoded.emit(self._key, self._part_id, self._height, image)
+        except RuntimeError:
+            pass  # Decoder destroyed while shutting down
+
+
+class ThumbnailDecoder(QObject):
+    """Decodes part thumbnails off the GUI thread.
+
+    Decoding and scaling run on QThreadPool workers. The finished image is
+    converted to a QPixmap on the GUI thread, added to the same QPixmapCache
+    entry get_part_thumbnail() uses, and announced via thumbnail_ready.
+    """
+
+    thumbnail_ready = pyqtSignal(int, int, QPixmap)  # part_id, height, pixmap
+    _image_decoded = pyqtSignal(str, int, int, QImage)  # Worker -> GUI thread (queued)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = set()  # Cache keys currently being decoded
+        self._image_decoded.connect(self._on_image_decoded)
+
+    def request(self, part, height: int):
+        """Queue a part thumbnail for decoding unless it is cached or already queued.
+
+        Args:
+            part: Part with image_thumbnail or image_binary loaded
+            height: Thumbnail height in pixels
+        """
+        key = _thumbnail_key(part.id, part.image_updated_date, height)
+        if key in self._pending or QPixmapCache.find(key) is not None:
+            return
+        self._pending.add(key)
+        _start_decode(_ThumbnailDecodeTask(self, key, part.id, height, _thumbnail_source(part)))
+
+    def _on_image_decoded(self, key: str, part_id: int, height: int, image: QImage):
+        """Cache the decoded thumbnail and notify listeners (GUI thread)."""
+        self._pending.discard(key)
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        self.thumbnail_ready.emit(part_id, height, pixmap)
+
+
+_thumbnail_decoder = None
+_decodes_started = False
+_quit_wait_app = None  # QApplication whose aboutToQuit waits for running decodes
+
+
+def _wait_for_thumbnail_decodes():
+    """Let running decodes finish before the objects they signal go away."""
+    if not (_thumbnail_decoder is not None or _decodes_started):
+        return
+    pool = QThreadPool.globalInstance()  # None once the QApplication is gone
+    if pool is not None:
+        pool.waitForDone()
+
+
+def _start_decode(task: QRunnable):
+    """Run a decode task on the global pool; quitting the app waits for it."""
+    global _decodes_started, _quit_wait_app
+    _decodes_started = True
+    app = QCoreApplication.instance()
+    if app is not None and app is not _quit_wait_app:
+        app.aboutToQuit.connect(_wait_for_thumbnail_decodes)
+        _quit_wait_app = app
+    QThreadPool.globalInstance().start(task)
+
+
+# Fallback for scripts that never run (and so never quit) the event loop
+atexit.register(_wait_for_thumbnail_decodes)
+
+
+def _on_thumbnail_decoder_destroyed():
+    """Forget the shared decoder (destroyed together with the QApplication)."""
+    global _thumbnail_decoder
+    _wait_for_thumbnail_decodes()
+    _thumbnail_decoder = None
+
+
+def get_thumbnail_decoder() -> ThumbnailDecoder:
+    """Get the shared thumbnail decoder, creating it on first use."""
+    global _thumbnail_decoder
+    if _thumbnail_decoder is None:
+        _thumbnail_decoder = ThumbnailDecoder()
+        _thumbnail_decoder.destroyed.connect(_on_thumbnail_decoder_destroyed)
+    return _thumbnail_decoder
+
+
+class _PreviewDecodeTask(QRunnable):
+    """Decode a preview image on a QThreadPool worker, optionally bounded in size."""
+
+    def __init__(self, loader: "_PreviewImageLoader", data: bytes, max_size: Optional[QSize]):
+        super().__init__()
+        self._loader = loader
+        self._data = data
+        self._max_size = max_size
+
+    def run(self):
+        buffer = QBuffer()
+        buffer.setData(self._data)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+
+        # Decode straight to the bounded size instead of loading every source pixel
+        size = reader.size()
+        downscaled = False
+        if self._max_size is not None and size.isValid() and (
+            size.width() > self._max_size.width() or size.height() > self._max_size.height()
+        ):
+            reader.setScaledSize(size.scaled(self._max_size, Qt.AspectRatioMode.KeepAspectRatio))
+            downscaled = True
+
+        image = reader.read()
+        try:
+            self._loader._image_decoded.emit(image, downscaled)
+        except RuntimeError:
+            pass  # Preview window closed and deleted meanwhile
+
+
+class _PreviewImageLoader(QObject):
+    """Decodes a preview image off the GUI thread and hands it back as a QPixmap."""
+
+    pixmap_ready = pyqtSignal(QPixmap, bool)  # pixmap (null if undecodable), downscaled
+    _image_decoded = pyqtSignal(QImage, bool)  # Worker -> GUI thread (queued)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image_decoded.connect(self._on_image_decoded)
+
+    def load(self, data: bytes, max_size: Optional[QSize] = None):
+        """Start decoding the image data, scaled down to fit max_size if it is larger."""
+        _start_decode(_PreviewDecodeTask(self, data, max_size))
+
+    def _on_image_decoded(self, image: QImage, downscaled: bool):
+        self.pixmap_ready.emit(QPixmap.fromImage(image), downscaled)
 
 
 def show_image_preview(parent, title: str, image_data: bytes):
@@ -39,44 +310,86 @@ def show_image_preview(parent, title: str, image_data: bytes):
     scroll = QScrollArea()
     scroll.setWidgetResizable(True)
 
-    # Image label
-    img_label = QLabel()
+    # Image label; the image is decoded in the background (large drawings take a while)
+    img_label = QLabel("Loading…")
     pixmap = QPixmap()
-    pixmap.loadFromData(image_data)
-    img_label.setPixmap(pixmap)
     img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
     img_label.setScaledContents(False)
 
     scroll.setWidget(img_label)
     layout.addWidget(scroll)
 
-    # Zoom controls
+    # Zoom controls. Huge images are first decoded bounded to twice the screen
+    # size; the full resolution is only decoded once zooming in needs it.
     zoom_factor = 1.0
+    base_width = 0  # Width shown at zoom 1.0
+    source = pixmap  # Best available pixmap to scale zoom levels from
+    full_resolution = False
+    full_resolution_requested = False
+    scaled_cache = {}  # target width -> scaled pixmap, so revisited zoom levels are not resampled
+    scaled_cache_bytes = 0
+
+    screen = QGuiApplication.primaryScreen()
+    max_size = screen.size() * 2 if screen else None
+    loader = _PreviewImageLoader(zoom_window)
+
+    def on_pixmap_ready(decoded: QPixmap, downscaled: bool):
+        nonlocal pixmap, source, base_width, full_resolution, scaled_cache_bytes
+        if decoded.isNull():
+            if pixmap.isNull():
+                img_label.setText("Image could not be loaded")
+            return
+        if pixmap.isNull():
+            pixmap = decoded
+            base_width = pixmap.width()
+        full_resolution = not downscaled
+        source = decoded
+        scaled_cache.clear()
+        scaled_cache_bytes = 0
+        if zoom_factor == 1.0:
+            img_label.setPixmap(pixmap)
+        else:
+            show_zoomed()
+
+    def show_zoomed():
+        nonlocal full_resolution_requested, scaled_cache_bytes
+        if pixmap.isNull():
+            return  # Still loading
+        target_width = int(base_width * zoom_factor)
+        if target_width > source.width() and not full_resolution and not full_resolution_requested:
+            full_resolution_requested = True
+            loader.load(image_data)
+        pixmap_scaled = scaled_cache.get(target_width)
+        if pixmap_scaled is None:
+            pixmap_scaled = source.scaledToWidth(target_width, Qt.TransformationMode.SmoothTransformation)
+            size = pixmap_scaled.width() * pixmap_scaled.height() * pixmap_scaled.depth() // 8
+            if size <= ZOOM_CACHE_BYTES:  # Deep zoom levels are too big to keep at all
+                while scaled_cache and scaled_cache_bytes + size > ZOOM_CACHE_BYTES:
+                    dropped = scaled_cache.pop(next(iter(scaled_cache)))  # Drop the oldest zoom level
+                    scaled_cache_bytes -= dropped.width() * dropped.height() * dropped.depth() // 8
+                scaled_cache[target_width] = pixmap_scaled
+                scaled_cache_bytes += size
+        img_label.setUpdatesEnabled(False)
+        img_label.setPixmap(pixmap_scaled)
+        img_label.setUpdatesEnabled(True)
 
     def zoom_in():
         nonlocal zoom_factor
         zoom_factor *= 1.2
-        pixmap_scaled = pixmap.scaledToWidth(
-            int(pixmap.width() * zoom_factor),
-            Qt.TransformationMode.SmoothTransformation
-        )
-        img_label.setPixmap(pixmap_scaled)
+        show_zoomed()
 
     def zoom_out():
         nonlocal zoom_factor
         zoom_factor /= 1.2
         if zoom_factor < 0.1:
             zoom_factor = 0.1
-        pixmap_scaled = pixmap.scaledToWidth(
-            int(pixmap.width() * zoom_factor),
-            Qt.TransformationMode.SmoothTransformation
-        )
-        img_label.setPixmap(pixmap_scaled)
+        show_zoomed()
 
     def fit_window():
         nonlocal zoom_factor
         zoom_factor = 1.0
-        img_label.setPixmap(pixmap)
+        if not pixmap.isNull():
+            img_label.setPixmap(pixmap)
 
     btn_zoom_in.clicked.connect(zoom_in)
     btn_zoom_out.clicked.connect(zoom_out)
@@ -85,3 +398,6 @@ def show_image_preview(parent, title: str, image_data: bytes):
 
     zoom_window.setCentralWidget(central)
     zoom_window.show()
+
+    loader.pixmap_ready.connect(on_pixmap_ready)
+    loader.load(image_data, max_size)
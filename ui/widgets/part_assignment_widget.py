@@ -2,17 +2,69 @@
 
 from typing import List, Dict, Optional
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QSpinBox, QHeaderView, QMessageBox,
-    QAbstractItemView
+    QAbstractItemView, QFrame
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
 from database import ToolPartConfiguration
 from database.connection import session_scope
 from database.models import Part
 from ..dialogs.part_selection_dialog import PartSelectionDialog
 
+# Config keys shown in the assignments table, in column order
+ASSIGNMENT_COLUMNS = ('part_name', 'cavities', 'lifters_count', 'sliders_count')
+ASSIGNMENT_HEADERS = ["Part", "Cavities", "Lifters", "Sliders", ""]
+
+
+class PartConfigModel(QAbstractTableModel):
+    """Table model over a list of part configuration dicts.
+
+    The view reads cells straight from the dicts; rows are inserted and removed
+    one at a time instead of rebuilding the table.
+    """
+
+    def __init__(self, configs: List[Dict], parent=None):
+        super().__init__(parent)
+        self._configs = configs
+
+    def set_configs(self, configs: List[Dict]):
+        """Show a new configuration list."""
+        self.beginResetModel()
+        self._configs = configs
+        self.endResetModel()
+
+    def append_config(self, config: Dict):
+        """Append one configuration row."""
+        row = len(self._configs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._configs.append(config)
+        self.endInsertRows()
+
+    def remove_config(self, row: int) -> Dict:
+        """Remove and return the configuration at a row."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        config = self._configs.pop(row)
+        self.endRemoveRows()
+        return config
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._configs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ASSIGNMENT_HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or index.column() >= len(ASSIGNMENT_COLUMNS):
+            return None
+        return str(self._configs[index.row()][ASSIGNMENT_COLUMNS[index.column()]])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return ASSIGNMENT_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
 
 class PartAssignmentWidget(QWidget):
     """Widget for managing tool-part assignments with per-part cavities, lifters, sliders."""
@@ -22,6 +74,9 @@ class PartAssignmentWidget(QWidget):
         self.rfq_id = rfq_id
         self.part_configs = []  # List of ToolPartConfiguration-like dicts
         self.on_config_changed = on_config_changed  # Callback when parts change
+        self._tot_cav = self._tot_lif = self._tot_sld = 0  # Running totals over part_configs
+        self._all_parts = None  # BOM rows for the selection dialog, loaded on first use
+        self._assigned_ids = set()  # part_id of every entry in part_configs
 
         self._setup_ui()
 
@@ -68,7 +123,9 @@ class PartAssignmentWidget(QWidget):
         layout.addSpacing(15)
 
         # Separator
-        separator = QLabel("─" * 60)
+        separator = QFrame()
+        separator.setFrameShape(QFrame.Shape.HLine)
+        separator.setFrameShadow(QFrame.Shadow.Sunken)
         separator.setStyleSheet("color: #cccccc;")
         layout.addWidget(separator)
 
@@ -79,9 +136,9 @@ class PartAssignmentWidget(QWidget):
         assigned_label.setStyleSheet("font-weight: bold;")
         layout.addWidget(assigned_label)
 
-        self.assignments_table = QTableWidget()
-        self.assignments_table.setColumnCount(5)
-        self.assignments_table.setHorizontalHeaderLabels(["Part", "Cavities", "Lifters", "Sliders", ""])
+        self.assignments_model = PartConfigModel(self.part_configs, self)
+        self.assignments_table = QTableView()
+        self.assignments_table.setModel(self.assignments_model)
         self.assignments_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.assignments_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.assignments_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -102,22 +159,23 @@ class PartAssignmentWidget(QWidget):
 
     def _on_select_part_clicked(self):
         """Open part selection dialog and add selected part to assignments."""
-        # Get currently assigned part IDs
-        assigned_ids = [c['part_id'] for c in self.part_configs]
-
-        # Open part selection dialog
-        dialog = PartSelectionDialog(self.rfq_id, assigned_ids, self)
+        # Open part selection dialog; the BOM does not change while this widget is open
+        if self._all_parts is None:
+            self._all_parts = PartSelectionDialog.load_parts(self.rfq_id)
+        dialog = PartSelectionDialog(self.rfq_id, self._assigned_ids, self, parts=self._all_parts)
         if dialog.exec() == PartSelectionDialog.DialogCode.Accepted:
-            selected_part_id = dialog.get_selected_part_id()
-            if selected_part_id:
-                # Load part details from database
-                with session_scope() as session:
-                    part = session.query(Part).get(selected_part_id)
-                    if part:
-                        part_name = part.name
-                    else:
-                        QMessageBox.warning(self, "Error", "Could not load part details")
-                        return
+            selected = dialog.get_selected_part()
+            if selected:
+                selected_part_id, part_name = selected
+                if not part_name:
+                    # The dialog shows the name; only look it up if it is missing
+                    with session_scope() as session:
+                        part = session.get(Part, selected_part_id)
+                        if part:
+                            part_name = part.name
+                        else:
+                            QMessageBox.warning(self, "Error", "Could not load part details")
+                            return
 
                 # Get configuration from spinboxes
                 cavities = self.cavities_spin.value()
@@ -125,22 +183,22 @@ class PartAssignmentWidget(QWidget):
                 sliders = self.sliders_spin.value()
 
                 # Check for duplicates
-                for config in self.part_configs:
-                    if config['part_id'] == selected_part_id:
-                        QMessageBox.warning(self, "Duplicate", f"'{part_name}' is already assigned")
-                        return
+                if selected_part_id in self._assigned_ids:
+                    QMessageBox.warning(self, "Duplicate", f"'{part_name}' is already assigned")
+                    return
 
                 # Add to configuration list
-                self.part_configs.append({
+                config = {
                     'part_id': selected_part_id,
                     'part_name': part_name,
                     'cavities': cavities,
                     'lifters_count': lifters,
                     'sliders_count': sliders,
                     'config_group_id': None  # Reserved for future alternative configurations
-                })
-
-                self._refresh_assignments_table()
+                }
+                self.assignments_model.append_config(config)
+                self._assigned_ids.add(selected_part_id)
+                self._adjust_totals(config, 1)
 
                 # Trigger callback if set
                 if self.on_config_changed:
@@ -148,40 +206,32 @@ class PartAssignmentWidget(QWidget):
 
     def _on_remove_part(self):
         """Remove selected part from assignments."""
-        selected = self.assignments_table.selectedItems()
+        selected = self.assignments_table.selectionModel().selectedRows()
         if not selected:
             QMessageBox.warning(self, "No Selection", "Please select a part to remove")
             return
 
         row = selected[0].row()
         if 0 <= row < len(self.part_configs):
-            self.part_configs.pop(row)
-            self._refresh_assignments_table()
+            config = self.assignments_model.remove_config(row)
+            self._assigned_ids.discard(config['part_id'])
+            self._adjust_totals(config, -1)
 
             # Trigger callback if set
             if self.on_config_changed:
                 self.on_config_changed()
 
-    def _refresh_assignments_table(self):
-        """Refresh the assignments table display."""
-        self.assignments_table.setRowCount(len(self.part_configs))
-
-        total_cavities = 0
-        total_lifters = 0
-        total_sliders = 0
-
-        for row, config in enumerate(self.part_configs):
-            self.assignments_table.setItem(row, 0, QTableWidgetItem(config['part_name']))
-            self.assignments_table.setItem(row, 1, QTableWidgetItem(str(config['cavities'])))
-            self.assignments_table.setItem(row, 2, QTableWidgetItem(str(config['lifters_count'])))
-            self.assignments_table.setItem(row, 3, QTableWidgetItem(str(config['sliders_count'])))
-
-            total_cavities += config['cavities']
-            total_lifters += config['lifters_count']
-            total_sliders += config['sliders_count']
+    def _adjust_totals(self, config: Dict, sign: int):
+        """Add (sign=1) or subtract (sign=-1) one configuration from the running totals."""
+        self._tot_cav += sign * config['cavities']
+        self._tot_lif += sign * config['lifters_count']
+        self._tot_sld += sign * config['sliders_count']
+        self._update_totals_label()
 
+    def _update_totals_label(self):
+        """Show the running totals."""
         self.totals_label.setText(
-            f"Totals: {total_cavities} cavities, {total_lifters} lifters, {total_sliders} sliders"
+            f"Totals: {self._tot_cav} cavities, {self._tot_lif} lifters, {self._tot_sld} sliders"
         )
 
     def get_part_configurations(self) -> List[Dict]:
@@ -191,4 +241,9 @@ class PartAssignmentWidget(QWidget):
     def set_part_configurations(self, configs: List[Dict]):
         """Load existing configurations."""
         self.part_configs = configs
-        self._refresh_assignments_table()
+        self._assigned_ids = {config['part_id'] for config in configs}
+        self.assignments_model.set_configs(configs)
+        self._tot_cav = sum(config['cavities'] for config in configs)
+        self._tot_lif = sum(config['lifters_count'] for config in configs)
+        self._tot_sld = sum(config['sliders_count'] for config in configs)
+        self._update_totals_label()
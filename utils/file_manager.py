@@ -1,19 +1,55 @@
 """File management utilities for project files."""
 
+import itertools
+import os
 import shutil
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
 
 from config import PROJECTS_PATH
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Subfolder of a part folder per file type; anything else goes to 'other'
+SUBFOLDERS = {'image': 'images', 'cad': 'cad'}
+
+# Files up to this size are copied with a single read and write
+SMALL_COPY_SIZE = 128 * 1024
+
+# Linux ioctl that makes a file share another file's extents (reflink on Btrfs/XFS)
+FICLONE = 0x40049409
+
+# Supported file extensions
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'})
+CAD_EXTENSIONS = frozenset({'.step', '.stp', '.iges', '.igs', '.stl', '.obj', '.3mf', '.x_t', '.x_b'})
+# Lowercase extension -> file type
+FILE_TYPES = {**dict.fromkeys(IMAGE_EXTENSIONS, 'image'), **dict.fromkeys(CAD_EXTENSIONS, 'cad')}
+
 
 class FileManager:
     """Manages project files (images, CAD files, etc.)."""
 
-    # Supported file extensions
-    IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
-    CAD_EXTENSIONS = {'.step', '.stp', '.iges', '.igs', '.stl', '.obj', '.3mf', '.x_t', '.x_b'}
+    # Supported file extensions (module constants, kept here for existing callers)
+    IMAGE_EXTENSIONS = IMAGE_EXTENSIONS
+    CAD_EXTENSIONS = CAD_EXTENSIONS
+
+    # Parallel copies in copy_files_to_project
+    COPY_WORKERS = 4
+
+    # Windows folder deletes with at least this many files unlink them in parallel
+    PARALLEL_DELETE_MIN_FILES = 100
+    DELETE_WORKERS = 16
+
+    # How long (seconds) file_exists trusts a previous miss, and how many misses it keeps
+    MISSING_TTL = 2.0
+    MISSING_CACHE_SIZE = 1024
 
     def __init__(self, base_path: Optional[Path] = None):
         """Initialize file manager.
@@ -21,8 +57,35 @@ class FileManager:
         Args:
             base_path: Base path for project storage. Defaults to PROJECTS_PATH.
         """
-        self.base_path = Path(base_path) if base_path else PROJECTS_PATH
+        # Resolved so paths built under it always start with str(base_path),
+        # even for a relative or non-normalized base such as Path('.')
+        self.base_path = (Path(base_path) if base_path else PROJECTS_PATH).resolve()
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Length of the base path plus separator, to cut it off paths built under it
+        self._base_prefix_len = len(os.path.join(str(self.base_path), ''))
+        # Folders this instance already created, so repeat lookups skip the mkdir
+        self._known_folders: set[Path] = set()
+        self._known_folders_lock = threading.Lock()
+        # Folder paths by rfq_id / (rfq_id, part_id), built once
+        self._rfq_folders: dict[int, Path] = {}
+        self._part_folders: dict[tuple[int, int], Path] = {}
+        self._subfolders: dict[tuple[Path, str], Path] = {}
+        # Sequence number in copied file names; keeps names unique within a second
+        self._copy_seq = itertools.count(1)
+        self._copy_pool: Optional[ThreadPoolExecutor] = None  # Created on first parallel copy
+        self._copy_pool_lock = threading.Lock()
+        # Relative path -> monotonic time file_exists last found it missing
+        self._missing: dict[str, float] = {}
+        # Guards _missing; copy workers drop entries from their own threads
+        self._missing_lock = threading.Lock()
+
+    def _ensure_folder(self, folder: Path) -> Path:
+        """Create a folder (and parents) unless this instance already did."""
+        if folder not in self._known_folders:
+            folder.mkdir(parents=True, exist_ok=True)
+            with self._known_folders_lock:
+                self._known_folders.add(folder)
+        return folder
 
     def get_rfq_folder(self, rfq_id: int) -> Path:
         """Get or create folder for an RFQ.
@@ -33,8 +96,13 @@ class FileManager:
         Returns:
             Path to RFQ folder
         """
-        folder = self.base_path / f"rfq_{rfq_id:05d}"
-        folder.mkdir(parents=True, exist_ok=True)
+        return self._ensure_folder(self._rfq_folder_path(rfq_id))
+
+    def _rfq_folder_path(self, rfq_id: int) -> Path:
+        """Path of an RFQ folder, formatted once per ID."""
+        folder = self._rfq_folders.get(rfq_id)
+        if folder is None:
+            folder = self._rfq_folders[rfq_id] = self.base_path / f"rfq_{rfq_id:05d}"
         return folder
 
     def get_part_folder(self, rfq_id: int, part_id: int) -> Path:
@@ -47,9 +115,11 @@ class FileManager:
         Returns:
             Path to part folder
         """
-        folder = self.get_rfq_folder(rfq_id) / f"part_{part_id:05d}"
-        folder.mkdir(parents=True, exist_ok=True)
-        return folder
+        folder = self._part_folders.get((rfq_id, part_id))
+        if folder is None:
+            folder = self.get_rfq_folder(rfq_id) / f"part_{part_id:05d}"
+            self._part_folders[(rfq_id, part_id)] = folder
+        return self._ensure_folder(folder)
 
     def copy_file_to_project(
         self,
@@ -69,35 +139,156 @@ class FileManager:
         Returns:
             Relative path to copied file (relative to PROJECTS_PATH), or None on failure
         """
+        return self._copy_to(self._prepare_copy(source_path, rfq_id, part_id, file_type))
+
+    def copy_files_to_project(
+        self,
+        items: List[Tuple[str | Path, int, int, str]]
+    ) -> List[Optional[str]]:
+        """Copy several files to the project folders.
+
+        Destination folders are created up front; the copies then run on the
+        shared copy pool, since the kernel-side copy releases the GIL.
+
+        Args:
+            items: (source_path, rfq_id, part_id, file_type) tuples
+
+        Returns:
+            Relative path per item in the same order, or None where that copy failed
+        """
+        copies = [self._prepare_copy(*item) for item in items]
+        if len(copies) <= 1:
+            return [self._copy_to(copy) for copy in copies]
+        return list(self._get_copy_pool().map(self._copy_to, copies))
+
+    def submit_copy_to_project(
+        self,
+        source_path: str | Path,
+        rfq_id: int,
+        part_id: int,
+        file_type: str = 'image'
+    ) -> Future:
+        """Copy a file to the project folder in the background.
+
+        The destination is reserved right away; the copy runs on the shared
+        copy pool so the calling (GUI) thread is not blocked by large files.
+
+        Returns:
+            Future resolving to the relative path, or None on failure. Its
+            done-callbacks run on the worker thread, so Qt code should hand the
+            result over with a queued signal.
+        """
+        copy = self._prepare_copy(source_path, rfq_id, part_id, file_type)
+        return self._get_copy_pool().submit(self._copy_to, copy)
+
+    def _get_copy_pool(self) -> ThreadPoolExecutor:
+        """Get the shared thread pool for file copies."""
+        if self._copy_pool is None:
+            with self._copy_pool_lock:
+                if self._copy_pool is None:
+                    self._copy_pool = ThreadPoolExecutor(
+                        max_workers=self.COPY_WORKERS, thread_name_prefix="file-copy"
+                    )
+        return self._copy_pool
+
+    def _prepare_copy(
+        self,
+        source_path: str | Path,
+        rfq_id: int,
+        part_id: int,
+        file_type: str
+    ) -> Tuple[Path, Path]:
+        """Create the destination folder and pick the destination path.
+
+        Returns:
+            (source, destination) paths
+        """
         source = Path(source_path)
-        if not source.exists():
-            return None
+        dest_folder = self._subfolder(self.get_part_folder(rfq_id, part_id), file_type)
 
-        part_folder = self.get_part_folder(rfq_id, part_id)
+        # Generate unique filename with timestamp and sequence number
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        dest_name = f"{timestamp}_{next(self._copy_seq):06d}_{source.name}"
+        return source, dest_folder / dest_name
 
-        # Create subfolder based on type
-        if file_type == 'image':
-            dest_folder = part_folder / 'images'
-        elif file_type == 'cad':
-            dest_folder = part_folder / 'cad'
-        else:
-            dest_folder = part_folder / 'other'
+    def _subfolder(self, part_folder: Path, file_type: str) -> Path:
+        """Get or create the per-type subfolder of a part folder."""
+        key = (part_folder, file_type)
+        folder = self._subfolders.get(key)
+        if folder is None:
+            folder = self._subfolders[key] = part_folder / SUBFOLDERS.get(file_type, 'other')
+        return self._ensure_folder(folder)
 
-        dest_folder.mkdir(parents=True, exist_ok=True)
+    def _copy_to(self, copy: Tuple[Path, Path]) -> Optional[str]:
+        """Copy a prepared (source, destination) pair.
 
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        dest_name = f"{timestamp}_{source.name}"
-        dest_path = dest_folder / dest_name
+        A missing source is reported by the copy itself failing to open it,
+        rather than by checking beforehand.
 
-        # Copy file
+        Returns:
+            Destination path relative to the base path, or None on failure
+        """
+        source, dest_path = copy
         try:
-            shutil.copy2(source, dest_path)
-            # Return path relative to base
-            return str(dest_path.relative_to(self.base_path))
+            try:
+                self._fast_copy(source, dest_path)
+            except FileNotFoundError:
+                # The folder may have been removed outside this instance since it
+                # was cached; create it again and retry once. A missing source
+                # fails the same way on the retry.
+                folder = dest_path.parent
+                with self._known_folders_lock:
+                    self._known_folders.difference_update((folder, *folder.parents))
+                self._ensure_folder(folder)
+                self._fast_copy(source, dest_path)
+            # Return path relative to base; dest_path was built under it, so slice
+            relative_path = str(dest_path)[self._base_prefix_len:]
+            with self._missing_lock:
+                self._missing.pop(relative_path, None)
+            return relative_path
         except Exception:
             return None
 
+    @staticmethod
+    def _fast_copy(source: Path, dest: Path):
+        """Copy a file with its metadata, like shutil.copy2.
+
+        Small files are copied with one read and one write, which beats the
+        setup cost of the kernel copy paths. Larger files on Linux are first
+        cloned with the FICLONE ioctl, which on CoW filesystems (Btrfs, XFS)
+        shares the source's blocks instead of copying them; otherwise the data
+        goes through os.copy_file_range, which lets the kernel copy in place
+        (server-side on NFS).
+        shutil.copy2 already uses sendfile/fcopyfile/CopyFile2 where available
+        and handles large files elsewhere, and is the fallback whenever
+        copy_file_range refuses.
+        """
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        try:
+            with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                if remaining <= SMALL_COPY_SIZE:
+                    fdst.write(fsrc.read())
+                    remaining = 0
+                elif copy_file_range is not None:
+                    if fcntl is not None:
+                        try:
+                            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                            remaining = 0
+                        except OSError:
+                            pass  # No reflink support or different filesystems
+                    while remaining > 0:
+                        copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+            if remaining == 0:
+                shutil.copystat(source, dest)
+                return
+        except OSError:
+            pass  # e.g. EXDEV on older kernels or unsupported filesystem
+        shutil.copy2(source, dest)
+
     def get_absolute_path(self, relative_path: str) -> Path:
         """Convert relative path to absolute path.
 
@@ -118,7 +309,52 @@ class FileManager:
         Returns:
             True if file exists
         """
-        return self.get_absolute_path(relative_path).exists()
+        # The stat runs under the lock too: a copy that finishes meanwhile
+        # drops its entry only after this miss is recorded, never before
+        with self._missing_lock:
+            now = time.monotonic()
+            missed_at = self._missing.get(relative_path)
+            if missed_at is not None and now - missed_at < self.MISSING_TTL:
+                return False
+
+            if self.get_absolute_path(relative_path).exists():
+                self._missing.pop(relative_path, None)
+                return True
+
+            # Remember the miss; drop the oldest entries once the cache is full
+            self._missing.pop(relative_path, None)
+            self._missing[relative_path] = now
+            while len(self._missing) > self.MISSING_CACHE_SIZE:
+                del self._missing[next(iter(self._missing))]
+            return False
+
+    def existing_files(self, relative_paths: Iterable[str]) -> set[str]:
+        """Check many files at once.
+
+        Each distinct folder is listed once with os.scandir instead of one stat
+        per file.
+
+        Args:
+            relative_paths: Paths relative to PROJECTS_PATH
+
+        Returns:
+            The given paths that exist as files
+        """
+        by_folder: dict[str, dict[str, str]] = {}
+        for relative_path in relative_paths:
+            folder, name = os.path.split(relative_path)
+            by_folder.setdefault(folder, {})[name] = relative_path
+
+        existing = set()
+        for folder, wanted in by_folder.items():
+            try:
+                with os.scandir(self.base_path / folder) as entries:
+                    for entry in entries:
+                        if entry.name in wanted and entry.is_file():
+                            existing.add(wanted[entry.name])
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return existing
 
     def delete_file(self, relative_path: str) -> bool:
         """Delete a file.
@@ -129,6 +365,8 @@ class FileManager:
         Returns:
             True if file was deleted
         """
+        with self._missing_lock:
+            self._missing.pop(relative_path, None)
         path = self.get_absolute_path(relative_path)
         try:
             if path.exists():
@@ -147,15 +385,44 @@ class FileManager:
         Returns:
             True if folder was deleted
         """
-        folder = self.base_path / f"rfq_{rfq_id:05d}"
+        folder = self._rfq_folder_path(rfq_id)
+        with self._missing_lock:
+            self._missing.clear()
+        with self._known_folders_lock:
+            self._known_folders = {
+                known for known in self._known_folders
+                if known != folder and folder not in known.parents
+            }
         try:
             if folder.exists():
-                shutil.rmtree(folder)
+                self._remove_tree(folder)
                 return True
         except Exception:
             pass
         return False
 
+    def _remove_tree(self, root: Path):
+        """Delete a folder tree.
+
+        On Windows every delete is a slow synchronous round-trip, so larger trees
+        get their files unlinked in parallel before the emptied folders are
+        removed bottom-up. shutil.rmtree handles everything else, and finishes
+        the job if the parallel pass fails part way.
+        """
+        if sys.platform == 'win32':
+            walked = list(os.walk(root, topdown=False))
+            files = [os.path.join(folder, name) for folder, _, names in walked for name in names]
+            if len(files) >= self.PARALLEL_DELETE_MIN_FILES:
+                try:
+                    with ThreadPoolExecutor(max_workers=self.DELETE_WORKERS) as pool:
+                        list(pool.map(os.unlink, files))
+                    for folder, _, _ in walked:
+                        os.rmdir(folder)
+                    return
+                except OSError:
+                    pass
+        shutil.rmtree(root)
+
     def is_image(self, file_path: str | Path) -> bool:
         """Check if file is an image based on extension.
 
@@ -165,7 +432,7 @@ class FileManager:
         Returns:
             True if file has image extension
         """
-        return Path(file_path).suffix.lower() in self.IMAGE_EXTENSIONS
+        return self.get_file_type(file_path) == 'image'
 
     def is_cad(self, file_path: str | Path) -> bool:
         """Check if file is a CAD file based on extension.
@@ -176,7 +443,7 @@ class FileManager:
         Returns:
             True if file has CAD extension
         """
-        return Path(file_path).suffix.lower() in self.CAD_EXTENSIONS
+        return self.get_file_type(file_path) == 'cad'
 
     def get_file_type(self, file_path: str | Path) -> str:
         """Determine file type based on extension.
@@ -187,20 +454,21 @@ class FileManager:
         Returns:
             'image', 'cad', or 'other'
         """
-        if self.is_image(file_path):
-            return 'image'
-        elif self.is_cad(file_path):
-            return 'cad'
-        return 'other'
+        # String splitext instead of building a Path just to read its suffix
+        extension = os.path.splitext(os.fspath(file_path))[1].lower()
+        return FILE_TYPES.get(extension, 'other')
 
 
 # Singleton instance
 _file_manager: Optional[FileManager] = None
+_file_manager_lock = threading.Lock()
 
 
 def get_file_manager() -> FileManager:
-    """Get the singleton FileManager instance."""
+    """Get the singleton FileManager instance (safe to call from worker threads)."""
     global _file_manager
     if _file_manager is None:
-        _file_manager = FileManager()
+        with _file_manager_lock:
+            if _file_manager is None:
+                _file_manager = FileManager()
     return _file_manager